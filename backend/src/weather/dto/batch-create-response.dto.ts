@@ -0,0 +1,23 @@
+import { ApiProperty, ApiPropertyOptional } from '@nestjs/swagger';
+
+export class BatchItemResultDto {
+  @ApiProperty({ description: 'Posição do item no lote recebido', example: 0 })
+  index: number;
+
+  @ApiProperty({ description: 'Indica se o item foi gravado', example: true })
+  success: boolean;
+
+  @ApiPropertyOptional({ description: 'Mensagem de erro, quando o item não foi gravado' })
+  error?: string;
+}
+
+export class BatchCreateResponseDto {
+  @ApiProperty({ description: 'Total de itens gravados', example: 27 })
+  inserted: number;
+
+  @ApiProperty({ description: 'Total de itens rejeitados', example: 0 })
+  failed: number;
+
+  @ApiProperty({ description: 'Resultado de cada item, na ordem recebida', type: [BatchItemResultDto] })
+  results: BatchItemResultDto[];
+}
@@ -33,5 +33,13 @@ export class CreateWeatherLogDto {
   @IsString()
   @IsOptional()
   city?: string;
+
+  @ApiPropertyOptional({
+    description: 'Provedor que forneceu a leitura (opcional)',
+    example: 'open-meteo',
+  })
+  @IsString()
+  @IsOptional()
+  provider?: string;
 }
 
@@ -9,6 +9,7 @@ export interface IWeatherLog {
   temperature: number;
   humidity: number;
   city?: string;
+  provider?: string;
 }
 
 export type WeatherLogDocument = WeatherLog & Document;
@@ -26,6 +27,9 @@ export class WeatherLog implements IWeatherLog {
 
   @Prop({ required: false, type: String })
   city?: string;
+
+  @Prop({ required: false, type: String })
+  provider?: string;
 }
 
 export const WeatherLogSchema = SchemaFactory.createForClass(WeatherLog);
@@ -9,6 +9,7 @@ describe('WeatherController', () => {
 
   const mockWeatherService = {
     create: jest.fn(),
+    createMany: jest.fn(),
     findAll: jest.fn(),
     findAllPaginated: jest.fn(),
     exportCsv: jest.fn(),
@@ -119,6 +120,30 @@ describe('WeatherController', () => {
     });
   });
 
+  describe('POST /weather/logs/batch', () => {
+    it('should call weatherService.createMany with all items', async () => {
+      const dtos: CreateWeatherLogDto[] = [
+        { timestamp: '2025-01-24T10:00:00Z', temperature: 25.5, humidity: 70, city: 'São Paulo' },
+        { timestamp: '2025-01-24T10:00:00Z', temperature: 30.1, humidity: 80, city: 'Recife' },
+      ];
+      const expectedResult = {
+        inserted: 2,
+        failed: 0,
+        results: [
+          { index: 0, success: true },
+          { index: 1, success: true },
+        ],
+      };
+
+      mockWeatherService.createMany.mockResolvedValue(expectedResult);
+
+      const result = await controller.createBatch(dtos);
+
+      expect(result).toEqual(expectedResult);
+      expect(service.createMany).toHaveBeenCalledWith(dtos);
+    });
+  });
+
   describe('GET /weather/logs', () => {
     it('should return paginated weather logs', async () => {
       const mockQuery = { page: 1, limit: 10 };
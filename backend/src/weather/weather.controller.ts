@@ -1,4 +1,4 @@
-import { Controller, Get, Post, Body, Query, HttpCode, HttpStatus, Res, Header, UseGuards } from '@nestjs/common';
+import { Controller, Get, Post, Body, Query, HttpCode, HttpStatus, Res, Header, UseGuards, ParseArrayPipe } from '@nestjs/common';
 import { Response } from 'express';
 import { ApiTags, ApiOperation, ApiResponse, ApiBearerAuth, ApiQuery } from '@nestjs/swagger';
 import { SkipThrottle } from '@nestjs/throttler';
@@ -6,6 +6,7 @@ import { WeatherService } from './weather.service';
 import { CreateWeatherLogDto } from './dto/create-weather-log.dto';
 import { PaginationQueryDto } from './dto/pagination-query.dto';
 import { PaginatedResponseDto } from './dto/paginated-response.dto';
+import { BatchCreateResponseDto } from './dto/batch-create-response.dto';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { WeatherLog } from './schemas/weather-log.schema';
 
@@ -29,6 +30,20 @@ export class WeatherController {
     return this.weatherService.create(createWeatherLogDto);
   }
 
+  @Post('logs/batch')
+  @SkipThrottle() // Excluir do rate limiting - endpoint interno usado pelo collector
+  @HttpCode(HttpStatus.CREATED)
+  @ApiOperation({ summary: 'Criar vários logs climáticos em lote (JSON array, aceita gzip)' })
+  @ApiResponse({ status: 201, description: 'Lote processado', type: BatchCreateResponseDto })
+  @ApiResponse({ status: 400, description: 'Dados inválidos' })
+  async createBatch(
+    @Body(new ParseArrayPipe({ items: CreateWeatherLogDto, whitelist: true, forbidNonWhitelisted: true }))
+    createWeatherLogDtos: CreateWeatherLogDto[],
+  ) {
+    console.log(`[backend][weather] POST /weather/logs/batch - Received ${createWeatherLogDtos.length} items`);
+    return this.weatherService.createMany(createWeatherLogDtos);
+  }
+
   @Get('logs')
   @UseGuards(JwtAuthGuard)
   @ApiBearerAuth('JWT-auth')
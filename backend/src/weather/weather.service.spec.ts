@@ -32,6 +32,7 @@ describe('WeatherService', () => {
   MockWeatherLogModel.findOne = jest.fn();
   MockWeatherLogModel.findOneAndUpdate = jest.fn();
   MockWeatherLogModel.create = jest.fn();
+  MockWeatherLogModel.insertMany = jest.fn();
   MockWeatherLogModel.countDocuments = jest.fn();
 
   const mockWeatherLogModel = MockWeatherLogModel;
@@ -134,6 +135,45 @@ describe('WeatherService', () => {
     });
   });
 
+  describe('createMany', () => {
+    const dtos: CreateWeatherLogDto[] = [
+      { timestamp: '2025-01-24T10:00:00Z', temperature: 25.5, humidity: 70, city: 'São Paulo' },
+      { timestamp: '2025-01-24T10:00:00Z', temperature: 30.1, humidity: 80, city: 'Recife' },
+    ];
+
+    it('should insert all logs in a single unordered insertMany', async () => {
+      MockWeatherLogModel.insertMany.mockResolvedValue(dtos);
+
+      const result = await service.createMany(dtos);
+
+      expect(MockWeatherLogModel.insertMany).toHaveBeenCalledWith(dtos, { ordered: false });
+      expect(result.inserted).toBe(2);
+      expect(result.failed).toBe(0);
+      expect(result.results).toEqual([
+        { index: 0, success: true },
+        { index: 1, success: true },
+      ]);
+    });
+
+    it('should report per-item failures from a bulk write error', async () => {
+      MockWeatherLogModel.insertMany.mockRejectedValue({
+        writeErrors: [{ index: 1, errmsg: 'duplicate key' }],
+      });
+
+      const result = await service.createMany(dtos);
+
+      expect(result.inserted).toBe(1);
+      expect(result.failed).toBe(1);
+      expect(result.results[1]).toEqual({ index: 1, success: false, error: 'duplicate key' });
+    });
+
+    it('should rethrow errors that are not bulk write errors', async () => {
+      MockWeatherLogModel.insertMany.mockRejectedValue(new Error('connection lost'));
+
+      await expect(service.createMany(dtos)).rejects.toThrow('connection lost');
+    });
+  });
+
   describe('findAllPaginated', () => {
     it('should return paginated results', async () => {
       const query = { page: 1, limit: 10 };
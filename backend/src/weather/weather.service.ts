@@ -5,6 +5,7 @@ import { InjectConnection } from '@nestjs/mongoose';
 import { WeatherLog, WeatherLogDocument } from './schemas/weather-log.schema';
 import { CreateWeatherLogDto } from './dto/create-weather-log.dto';
 import { PaginatedResponseDto } from './dto/paginated-response.dto';
+import { BatchCreateResponseDto } from './dto/batch-create-response.dto';
 import { LoggerService } from '../common/logger/logger.service';
 import { sanitizeForLogging } from '../common/utils/log-sanitizer';
 import { WeatherStatisticsService } from './services/weather-statistics.service';
@@ -58,6 +59,57 @@ export class WeatherService {
     return saved;
   }
 
+  /**
+   * Cria vários logs climáticos em uma única operação (ingestão em lote)
+   *
+   * Usa insertMany não ordenado: um item inválido não impede a gravação dos
+   * demais, e o resultado informa o status de cada item.
+   *
+   * @param createWeatherLogDtos - Lista de logs a serem criados
+   * @returns Resumo da gravação com o resultado de cada item
+   */
+  async createMany(createWeatherLogDtos: CreateWeatherLogDto[]): Promise<BatchCreateResponseDto> {
+    this.logger.log('Creating weather logs in batch', {
+      service: 'backend',
+      module: 'weather',
+      operation: 'createMany',
+      count: createWeatherLogDtos.length,
+    });
+
+    const failures = new Map<number, string>();
+    try {
+      await this.weatherLogModel.insertMany(createWeatherLogDtos, { ordered: false });
+    } catch (error) {
+      const writeErrors = error?.writeErrors;
+      if (!Array.isArray(writeErrors)) {
+        throw error;
+      }
+      for (const writeError of writeErrors) {
+        failures.set(writeError.index, writeError.errmsg || writeError.err?.errmsg || 'write error');
+      }
+    }
+
+    const results = createWeatherLogDtos.map((_, index) =>
+      failures.has(index)
+        ? { index, success: false, error: failures.get(index) }
+        : { index, success: true },
+    );
+    const response = {
+      inserted: createWeatherLogDtos.length - failures.size,
+      failed: failures.size,
+      results,
+    };
+
+    this.logger.log('Weather logs batch processed', {
+      service: 'backend',
+      module: 'weather',
+      operation: 'createMany',
+      inserted: response.inserted,
+      failed: response.failed,
+    });
+    return response;
+  }
+
   /**
    * Busca todos os logs climáticos com limite opcional
    *
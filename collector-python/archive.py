@@ -0,0 +1,375 @@
+"""
+Arquivo local das leituras em formato colunar.
+
+As leituras normalizadas ficam em lotes colunares na memória (`array`
+tipado por coluna, como no registro de localizações, em vez de listas de
+dicionários) e são gravadas em arquivos particionados por dia:
+
+    ARCHIVE_DIR/date=AAAA-MM-DD/part-<epoch_ms>-<seq>.wcol
+
+Formato de cada arquivo (little-endian):
+
+    b'WCOL1\\n' | tamanho do cabeçalho (uint32) | cabeçalho JSON | colunas
+
+O cabeçalho traz o número de linhas, o offset/tamanho/tipo de cada coluna e
+os dicionários das colunas de texto. As colunas ficam alinhadas em 8 bytes:
+`ts` (int64, microssegundos desde a época, em ordem crescente no arquivo),
+`temperature` e `humidity` (float64) e `city`/`provider` (uint32, índices nos
+dicionários). Na leitura, o arquivo é mapeado em memória (mmap) e cada coluna
+é um memoryview sem cópia; a janela de tempo é localizada por busca binária
+na coluna `ts`, então só as linhas da janela são materializadas.
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta, UTC
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WCOL1\n'
+SUFFIX = '.wcol'
+# (nome, typecode do array) das colunas de cada arquivo
+COLUMNS = (('ts', 'q'), ('temperature', 'd'), ('humidity', 'd'), ('city', 'I'), ('provider', 'I'))
+# Índice de `provider` para leituras sem provedor informado
+NO_PROVIDER = 0xFFFFFFFF
+
+
+def parse_time_window(spec: str) -> Tuple[datetime, datetime]:
+    """
+    Interpreta uma janela "INICIO/FIM" (início inclusivo, fim exclusivo).
+
+    Cada extremo é uma data (AAAA-MM-DD) ou data e hora ISO 8601 (sem fuso =
+    UTC); uma data sem hora no fim inclui o dia inteiro.
+
+    Raises:
+        ValueError: Se o formato for inválido ou a janela for vazia
+    """
+    try:
+        start_text, end_text = (part.strip() for part in spec.split('/'))
+        start = datetime.fromisoformat(start_text.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(end_text.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"janela inválida: {spec!r} (use INICIO/FIM, ex.: 2025-01-01/2025-01-02T12:00)") from None
+    if 'T' not in end_text and ' ' not in end_text:
+        end += timedelta(days=1)
+    start = start if start.tzinfo else start.replace(tzinfo=UTC)
+    end = end if end.tzinfo else end.replace(tzinfo=UTC)
+    if start >= end:
+        raise ValueError(f"janela inválida: {spec!r} (início não anterior ao fim)")
+    return start, end
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Converte para UTC (sem fuso = UTC), o fuso das partições diárias."""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _to_micros(timestamp: str) -> int:
+    """Converte um timestamp ISO 8601 (com 'Z' ou offset; sem fuso = UTC) em microssegundos."""
+    parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    delta = parsed - datetime(1970, 1, 1, tzinfo=UTC)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> str:
+    value = datetime(1970, 1, 1, tzinfo=UTC) + timedelta(microseconds=micros)
+    return value.isoformat().replace('+00:00', 'Z')
+
+
+def _day_of(micros: int) -> date:
+    return (datetime(1970, 1, 1, tzinfo=UTC) + timedelta(microseconds=micros)).date()
+
+
+class _ColumnBatch:
+    """Lote colunar de um dia, com dicionários para as colunas de texto."""
+
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in COLUMNS}
+        self.cities: Dict[str, int] = {}
+        self.providers: Dict[str, int] = {}
+        self.created = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.columns['ts'])
+
+    def append(self, micros: int, record: Dict) -> None:
+        columns = self.columns
+        columns['ts'].append(micros)
+        columns['temperature'].append(float(record.get('temperature', 0)))
+        columns['humidity'].append(float(record.get('humidity', 0)))
+        columns['city'].append(self.cities.setdefault(record.get('city') or '', len(self.cities)))
+        provider = record.get('provider')
+        columns['provider'].append(self.providers.setdefault(provider, len(self.providers)) if provider else NO_PROVIDER)
+
+    def encode(self) -> bytes:
+        """Serializa o lote (linhas ordenadas por `ts`) no formato do arquivo."""
+        order = sorted(range(len(self)), key=self.columns['ts'].__getitem__)
+        columns = {name: array(code, (self.columns[name][idx] for idx in order)) for name, code in COLUMNS}
+        if sys.byteorder != 'little':
+            for column in columns.values():
+                column.byteswap()
+
+        layout = []
+        offset = 0
+        for name, code in COLUMNS:
+            size = len(columns[name]) * columns[name].itemsize
+            layout.append({'name': name, 'type': code, 'offset': offset, 'length': size})
+            offset += (size + 7) // 8 * 8
+        header = json.dumps({
+            'rows': len(self),
+            'columns': layout,
+            'cities': list(self.cities),
+            'providers': list(self.providers),
+        }, separators=(',', ':')).encode('utf-8')
+        # Início das colunas alinhado em 8 bytes
+        prefix = len(MAGIC) + 4 + len(header)
+        header += b' ' * ((-prefix) % 8)
+
+        parts = [MAGIC, struct.pack('<I', len(header)), header]
+        for name, _ in COLUMNS:
+            data = columns[name].tobytes()
+            parts.append(data)
+            parts.append(b'\0' * ((-len(data)) % 8))
+        return b''.join(parts)
+
+
+class ArchiveWriter:
+    """
+    Acumula leituras normalizadas em lotes colunares por dia e grava os lotes
+    em arquivos (escrita atômica: arquivo temporário + rename).
+
+    Um lote é gravado ao atingir `max_rows` linhas, quando o mais antigo
+    passa de `max_age` segundos (verificado em append_many() e flush_due())
+    e em close().
+
+    Args:
+        directory: Diretório raiz do arquivo
+        max_rows: Linhas por lote antes da gravação
+        max_age: Segundos máximos de um lote na memória
+    """
+
+    def __init__(self, directory: str, max_rows: int = 10000, max_age: float = 300.0):
+        self.directory = Path(directory)
+        self.max_rows = max(1, max_rows)
+        self.max_age = max_age
+        self.rows_written = 0
+        self.files_written = 0
+        self.rejected = 0
+        self._batches: Dict[date, _ColumnBatch] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Linhas ainda na memória."""
+        with self._lock:
+            return sum(len(batch) for batch in self._batches.values())
+
+    def append_many(self, records: Iterable[Dict]) -> None:
+        """Adiciona registros normalizados ({timestamp, temperature, humidity, city[, provider]})."""
+        full = []
+        with self._lock:
+            for record in records:
+                try:
+                    micros = _to_micros(record['timestamp'])
+                except (KeyError, TypeError, ValueError):
+                    self.rejected += 1
+                    continue
+                day = _day_of(micros)
+                batch = self._batches.get(day)
+                if batch is None:
+                    batch = self._batches[day] = _ColumnBatch()
+                batch.append(micros, record)
+                if len(batch) >= self.max_rows:
+                    full.append((day, self._batches.pop(day)))
+        for day, batch in full:
+            self._write(day, batch)
+        self.flush_due()
+
+    def flush_due(self) -> int:
+        """Grava os lotes mais antigos que `max_age`. Retorna quantas linhas foram gravadas."""
+        now = time.monotonic()
+        with self._lock:
+            due = [day for day, batch in self._batches.items() if now - batch.created >= self.max_age]
+            batches = [(day, self._batches.pop(day)) for day in due]
+        return sum(self._write(day, batch) for day, batch in batches)
+
+    def flush(self) -> int:
+        """Grava todos os lotes. Retorna quantas linhas foram gravadas."""
+        with self._lock:
+            batches, self._batches = list(self._batches.items()), {}
+        return sum(self._write(day, batch) for day, batch in batches)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write(self, day: date, batch: _ColumnBatch) -> int:
+        if not len(batch):
+            return 0
+        with self._lock:
+            self._seq += 1
+            name = f"part-{int(time.time() * 1000)}-{self._seq:04d}{SUFFIX}"
+        partition = self.directory / f"date={day.isoformat()}"
+        path = partition / name
+        try:
+            partition.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(SUFFIX + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(batch.encode())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[collector] Não foi possível gravar {len(batch)} leituras no arquivo local: {e}")
+            return 0
+        self.rows_written += len(batch)
+        self.files_written += 1
+        return len(batch)
+
+
+class ArchiveSegment:
+    """
+    Um arquivo do arquivo local, mapeado em memória.
+
+    As colunas são memoryviews sobre o mmap (sem cópia); close() as libera.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"arquivo vazio: {path}")
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        view = memoryview(self._mmap)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            view.release()
+            raise ValueError(f"formato desconhecido: {self.path}")
+        (header_size,) = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_size]))
+        base = start + header_size
+        self.rows: int = header['rows']
+        self.cities: List[str] = header['cities']
+        self.providers: List[str] = header['providers']
+        self._views = [view]
+        self.columns: Dict[str, memoryview] = {}
+        for column in header['columns']:
+            raw = view[base + column['offset']:base + column['offset'] + column['length']]
+            if sys.byteorder != 'little':
+                # Colunas gravadas em little-endian: em máquinas big-endian, uma cópia convertida
+                converted = array(column['type'], bytes(raw))
+                converted.byteswap()
+                raw.release()
+                self.columns[column['name']] = memoryview(converted)
+            else:
+                self.columns[column['name']] = raw.cast(column['type'])
+                self._views.append(raw)
+            self._views.append(self.columns[column['name']])
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def window(self, start: int, end: int) -> Tuple[int, int]:
+        """Linhas [i, j) com start <= ts < end (microssegundos), por busca binária."""
+        ts = self.columns['ts']
+        return bisect.bisect_left(ts, start), bisect.bisect_left(ts, end)
+
+    def records(self, start: int, end: int, cities: Optional[set] = None) -> Iterator[Tuple[int, Dict]]:
+        """Registros normalizados da janela, em ordem de `ts`, como tuplas (ts, registro)."""
+        first, last = self.window(start, end)
+        columns = self.columns
+        ts, temperature, humidity = columns['ts'], columns['temperature'], columns['humidity']
+        city_codes, provider_codes = columns['city'], columns['provider']
+        wanted = None
+        if cities is not None:
+            wanted = {code for code, name in enumerate(self.cities) if name in cities}
+        for idx in range(first, last):
+            city = city_codes[idx]
+            if wanted is not None and city not in wanted:
+                continue
+            record = {
+                "timestamp": _from_micros(ts[idx]),
+                "temperature": temperature[idx],
+                "humidity": humidity[idx],
+                "city": self.cities[city],
+            }
+            if provider_codes[idx] != NO_PROVIDER:
+                record["provider"] = self.providers[provider_codes[idx]]
+            yield ts[idx], record
+
+    def close(self) -> None:
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        self.columns = {}
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+class ArchiveReader:
+    """
+    Leitura de uma janela de tempo do arquivo local.
+
+    Args:
+        directory: Diretório raiz do arquivo (o mesmo do ArchiveWriter)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def segments(self, start: datetime, end: datetime) -> List[Path]:
+        """Arquivos das partições diárias (dias em UTC) que cobrem [start, end)."""
+        paths = []
+        day = _as_utc(start).date()
+        last = _as_utc(end).date()
+        while day <= last:
+            partition = self.directory / f"date={day.isoformat()}"
+            if partition.is_dir():
+                paths.extend(sorted(partition.glob(f"*{SUFFIX}")))
+            day += timedelta(days=1)
+        return paths
+
+    def read(self, start: datetime, end: datetime, cities: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Registros normalizados com start <= timestamp < end, em ordem cronológica.
+
+        Os arquivos da janela são lidos juntos (merge por `ts`); arquivos
+        ilegíveis são ignorados com um aviso.
+        """
+        start_us = _to_micros(start.isoformat())
+        end_us = _to_micros(end.isoformat())
+        wanted = set(cities) if cities is not None else None
+        segments = []
+        try:
+            for path in self.segments(start, end):
+                try:
+                    segments.append(ArchiveSegment(path))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"[collector] Arquivo local ignorado ({path}): {e}")
+            streams = [segment.records(start_us, end_us, wanted) for segment in segments]
+            for _, record in heapq.merge(*streams, key=lambda item: item[0]):
+                yield record
+        finally:
+            for segment in segments:
+                segment.close()
@@ -0,0 +1,358 @@
+"""
+Backfill de leituras históricas (preenchimento de lacunas).
+
+O loop normal só coleta as condições atuais, então períodos com o collector
+fora do ar (ou anteriores ao cadastro de uma localização) ficam sem dados.
+O backfill consulta a API de arquivo da Open-Meteo, que devolve séries
+horárias por intervalo de datas, e envia as leituras pelo mesmo caminho do
+loop (RabbitMQ ou backend direto).
+
+O trabalho é dividido em unidades (localização, intervalo de até
+`chunk_days` dias). Cada requisição cobre um intervalo para um grupo de
+localizações, as requisições são feitas em paralelo e as leituras seguem
+por um Pipeline (filas limitadas: a coleta pausa se o envio ficar para
+trás). Uma unidade só é marcada no checkpoint depois que todas as suas
+leituras foram aceitas pelo destino, então um backfill interrompido pode
+ser retomado sem reenviar o que já foi entregue.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pipeline import Pipeline
+from providers import Getter, Location, ProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillTask(NamedTuple):
+    """Uma requisição: um grupo de localizações em um intervalo de datas (inclusivo)."""
+    locations: Tuple[Location, ...]
+    start: date
+    end: date
+
+
+def unit_key(city: str, start: date, end: date) -> str:
+    """Chave de uma unidade (localização + intervalo) no checkpoint."""
+    return f"{city}|{start.isoformat()}|{end.isoformat()}"
+
+
+def parse_date_range(spec: str) -> Tuple[date, date]:
+    """
+    Interpreta um intervalo no formato "AAAA-MM-DD:AAAA-MM-DD" (inclusivo).
+
+    Raises:
+        ValueError: Se o formato for inválido ou o início for posterior ao fim
+    """
+    try:
+        start_text, end_text = spec.split(':')
+        start, end = date.fromisoformat(start_text.strip()), date.fromisoformat(end_text.strip())
+    except ValueError:
+        raise ValueError(f"intervalo inválido: {spec!r} (use AAAA-MM-DD:AAAA-MM-DD)") from None
+    if start > end:
+        raise ValueError(f"intervalo inválido: {spec!r} (início posterior ao fim)")
+    return start, end
+
+
+def date_chunks(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """Divide [start, end] em intervalos consecutivos de até `days` dias."""
+    days = max(1, days)
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=days - 1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def plan_tasks(locations: Sequence[Location], start: date, end: date, chunk_days: int, batch_size: int,
+               checkpoint: Optional['BackfillCheckpoint'] = None) -> List[BackfillTask]:
+    """
+    Monta as requisições do backfill, do intervalo mais antigo ao mais recente.
+
+    Unidades já concluídas no checkpoint são omitidas; as restantes de cada
+    intervalo são agrupadas em requisições de até `batch_size` localizações.
+    """
+    tasks = []
+    for chunk_start, chunk_end in date_chunks(start, end, chunk_days):
+        pending = [location for location in locations
+                   if checkpoint is None or not checkpoint.done(unit_key(location[0], chunk_start, chunk_end))]
+        for i in range(0, len(pending), max(1, batch_size)):
+            tasks.append(BackfillTask(tuple(pending[i:i + batch_size]), chunk_start, chunk_end))
+    return tasks
+
+
+def hourly_readings(city: str, result: Any, provider: str) -> List[Dict[str, Any]]:
+    """
+    Converte as séries horárias de uma localização em leituras.
+
+    A série `time` define as horas; valores ausentes em `temperature_2m` ou
+    `relative_humidity_2m` (série faltando, mais curta ou com null) contam
+    como None. Horas sem temperatura (ainda não publicadas no arquivo) são
+    ignoradas; horas sem umidade seguem com umidade 0 e marcadas com
+    `incomplete`, para que a unidade não entre no checkpoint. Os horários vêm
+    em UTC (timezone=GMT na requisição) no formato "AAAA-MM-DDTHH:MM".
+
+    Returns:
+        Lista de payloads no formato do loop de coleta, com o horário da
+        observação como timestamp
+    """
+    hourly = result.get('hourly') if isinstance(result, dict) else None
+    if not hourly:
+        return []
+    temperatures = hourly.get('temperature_2m') or ()
+    humidities = hourly.get('relative_humidity_2m') or ()
+    readings = []
+    for idx, observed_at in enumerate(hourly.get('time') or ()):
+        temperature = temperatures[idx] if idx < len(temperatures) else None
+        if temperature is None:
+            continue
+        humidity = humidities[idx] if idx < len(humidities) else None
+        reading = {
+            "timestamp": f"{observed_at}:00Z",
+            "temperature": temperature,
+            "humidity": humidity if humidity is not None else 0,
+            "city": city,
+            "observed_at": observed_at,
+            "provider": provider,
+        }
+        if humidity is None:
+            reading["incomplete"] = True
+        readings.append(reading)
+    return readings
+
+
+def unit_hours(start: date, end: date) -> int:
+    """Horas de uma unidade [start, end] (datas inclusivas, em UTC)."""
+    return ((end - start).days + 1) * 24
+
+
+class OpenMeteoArchive:
+    """
+    API de arquivo da Open-Meteo (dados horários por intervalo de datas).
+
+    Assim como o endpoint de previsão, aceita listas de coordenadas separadas
+    por vírgula e responde com um resultado por localização, na mesma ordem.
+
+    Args:
+        url: Endpoint de arquivo (ou o de previsão, que também aceita start_date/end_date para os últimos meses)
+        hourly: Variáveis horárias solicitadas
+    """
+
+    name = 'open-meteo-archive'
+
+    def __init__(self, url: str, hourly: str = "temperature_2m,relative_humidity_2m"):
+        self.url = url
+        self.hourly = hourly
+
+    def build_request(self, task: BackfillTask) -> Tuple[str, Dict[str, Any]]:
+        return self.url, {
+            "latitude": ",".join(str(lat) for _, lat, _ in task.locations),
+            "longitude": ",".join(str(lon) for _, _, lon in task.locations),
+            "start_date": task.start.isoformat(),
+            "end_date": task.end.isoformat(),
+            "hourly": self.hourly,
+            "timezone": "GMT",
+        }
+
+    def fetch(self, task: BackfillTask, get: Getter) -> List[List[Dict[str, Any]]]:
+        """
+        Busca as leituras horárias de uma requisição.
+
+        Returns:
+            Uma lista de leituras por localização, na ordem de task.locations
+
+        Raises:
+            ProviderError: Se a resposta não tiver um resultado por localização
+            Exception: Erros da requisição (HTTP, timeout, circuito aberto)
+        """
+        url, params = self.build_request(task)
+        response = get(url, params)
+        response.raise_for_status()
+        data = response.json()
+        results = data if isinstance(data, list) else [data]
+        if len(results) != len(task.locations):
+            raise ProviderError(f"{self.name}: resposta com {len(results)} resultados para {len(task.locations)} localizações")
+        return [hourly_readings(city, result, self.name) for (city, _, _), result in zip(task.locations, results)]
+
+
+class BackfillCheckpoint:
+    """
+    Unidades concluídas do backfill, persistidas em JSON para retomada.
+
+    O arquivo é regravado de forma atômica (arquivo temporário + rename) a
+    cada `flush_every` unidades marcadas e em save().
+
+    Args:
+        path: Arquivo do checkpoint (None = somente memória)
+        flush_every: Unidades marcadas entre gravações
+    """
+
+    def __init__(self, path: Optional[str], flush_every: int = 50):
+        self.path = Path(path) if path else None
+        self.flush_every = max(1, flush_every)
+        self._done: set = set()
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def load(self) -> int:
+        """Carrega as unidades concluídas do arquivo, se existir. Retorna quantas."""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[collector] Checkpoint do backfill ilegível ({e}); recomeçando do início")
+            return 0
+        with self._lock:
+            self._done.update(stored.get('done', []))
+            return len(self._done)
+
+    def done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark(self, keys: Iterable[str]) -> None:
+        """Marca unidades como concluídas, gravando o arquivo a cada `flush_every`."""
+        with self._lock:
+            for key in keys:
+                if key not in self._done:
+                    self._done.add(key)
+                    self._unsaved += 1
+            flush = self._unsaved >= self.flush_every
+        if flush:
+            self.save()
+
+    def save(self) -> None:
+        """Grava as unidades concluídas (se houver mudanças)."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            stored = {'done': sorted(self._done)}
+            self._unsaved = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"[collector] Não foi possível salvar o checkpoint do backfill: {e}")
+
+
+class Backfill:
+    """
+    Executa as requisições do backfill em paralelo e envia as leituras em lotes.
+
+    Args:
+        archive: Fonte das séries horárias (ex.: OpenMeteoArchive)
+        get: Função de requisição (rate limit e circuit breaker do collector)
+        send: Envia registros normalizados e retorna o resultado de cada um
+        normalize: Converte um payload no registro enviado
+        checkpoint: Unidades concluídas (marcadas após o envio)
+        concurrency: Requisições simultâneas
+        queue_size: Capacidade (em unidades) de cada fila do pipeline
+        batch_records: Registros aproximados por envio (lotes de unidades inteiras)
+        batch_wait: Segundos aguardando mais unidades antes de um envio incompleto
+    """
+
+    def __init__(self, archive: OpenMeteoArchive, get: Getter, send: Callable[[List[Dict]], List[bool]],
+                 normalize: Callable[[Dict], Dict], checkpoint: BackfillCheckpoint, concurrency: int = 4,
+                 queue_size: int = 64, batch_records: int = 500, batch_wait: float = 0.5):
+        self.archive = archive
+        self.get = get
+        self.send = send
+        self.normalize = normalize
+        self.checkpoint = checkpoint
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.batch_records = max(1, batch_records)
+        self.batch_wait = batch_wait
+        self.stats = {'units': 0, 'units_failed': 0, 'units_empty': 0, 'units_partial': 0, 'records': 0, 'records_failed': 0, 'requests_failed': 0}
+
+    def _fetch_all(self, tasks: List[BackfillTask], emit: Callable[[Tuple[str, List[Dict], bool]], bool]) -> None:
+        stopped = threading.Event()
+
+        def fetch_and_emit(task: BackfillTask) -> None:
+            if stopped.is_set():
+                return
+            hours = unit_hours(task.start, task.end)
+            for (city, _, _), readings in zip(task.locations, self.archive.fetch(task, self.get)):
+                # Completa só com todas as horas do intervalo, cada uma com temperatura e umidade
+                complete = len(readings) >= hours and not any(reading.get('incomplete') for reading in readings)
+                if not emit((unit_key(city, task.start, task.end), readings, complete)):
+                    stopped.set()
+                    return
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(tasks)), thread_name_prefix='collector-backfill') as executor:
+            futures = {executor.submit(fetch_and_emit, task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    task = futures[future]
+                    self.stats['requests_failed'] += 1
+                    logger.error(f"[collector] Backfill de {task.start}..{task.end} falhou para {len(task.locations)} localizações: {e}")
+
+    def _send_units(self, units: List[Tuple[str, List[Dict], bool]]) -> None:
+        records = [record for _, unit_records, _ in units for record in unit_records]
+        results = self.send(records) if records else []
+        completed = []
+        offset = 0
+        for key, unit_records, complete in units:
+            unit_results = results[offset:offset + len(unit_records)]
+            offset += len(unit_records)
+            if not unit_records:
+                # Intervalo ainda sem dados no arquivo: fica para a próxima execução
+                self.stats['units_empty'] += 1
+            elif not all(unit_results):
+                self.stats['units_failed'] += 1
+            elif not complete:
+                # Horas ainda não publicadas: as enviadas seguem, e a unidade é refeita na próxima execução
+                self.stats['units_partial'] += 1
+            else:
+                completed.append(key)
+        self.checkpoint.mark(completed)
+        sent = sum(1 for success in results if success)
+        self.stats['units'] += len(completed)
+        self.stats['records'] += sent
+        self.stats['records_failed'] += len(records) - sent
+
+    def run(self, tasks: List[BackfillTask]) -> Dict[str, int]:
+        """
+        Busca e envia todas as requisições.
+
+        Unidades com alguma leitura recusada, sem leituras, com horas faltando
+        (parciais) ou cuja requisição falhou não entram no checkpoint e são
+        refeitas na próxima execução.
+
+        Returns:
+            Estatísticas: unidades concluídas/falhas/vazias/parciais, registros enviados/falhos e requisições falhas
+        """
+        if not tasks:
+            return self.stats
+        # Lotes de unidades inteiras com aproximadamente batch_records registros
+        hours = max(1, unit_hours(tasks[0].start, tasks[0].end))
+        try:
+            Pipeline(
+                lambda emit: self._fetch_all(tasks, emit),
+                lambda unit: [(unit[0], [self.normalize(reading) for reading in unit[1]], unit[2])],
+                self._send_units,
+                queue_size=self.queue_size,
+                batch_size=max(1, self.batch_records // hours),
+                batch_wait=self.batch_wait,
+            ).run()
+        finally:
+            self.checkpoint.save()
+        return self.stats
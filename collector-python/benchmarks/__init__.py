@@ -0,0 +1 @@
+"""Benchmarks do collector contra uma API, um backend e um broker locais."""
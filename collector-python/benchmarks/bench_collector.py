@@ -0,0 +1,218 @@
+"""
+Benchmark do caminho crítico do collector.
+
+Executa fetch_all_capitals, normalize_payload, post_direct,
+RabbitMQConnection.publish e um ciclo completo (coleta + envio, em sequência
+e em pipeline) contra os serviços locais de benchmarks/stubs.py, para 27,
+1.000 e 10.000 localizações (configurável), e reporta vazão e percentis de
+latência por etapa.
+
+Uso (a partir de collector-python/):
+
+    python -m benchmarks.bench_collector
+    python -m benchmarks.bench_collector --sizes 27,1000 --latency 0.05 --error-rate 0.01
+    python -m benchmarks.bench_collector --json resultados.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import collector
+from benchmarks.stubs import FakeAmqpBroker, StubBackendServer, StubOpenMeteoServer
+from location_registry import LocationRegistry
+
+DEFAULT_SIZES = (27, 1000, 10000)
+
+# Caixa envolvente aproximada do Brasil, para gerar localizações sintéticas
+BRAZIL_BOUNDS = ((-33.7, 5.2), (-73.9, -34.8))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank (amostras em qualquer ordem)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def make_locations(count: int, seed: int = 7) -> Dict[str, Dict[str, float]]:
+    """
+    Gera `count` localizações: as capitais primeiro, depois pontos sintéticos.
+
+    Returns:
+        Dicionário no formato de CAPITAL_COORDINATES
+    """
+    locations = dict(list(collector.CAPITAL_COORDINATES.items())[:count])
+    rng = random.Random(seed)
+    (lat_min, lat_max), (lon_min, lon_max) = BRAZIL_BOUNDS
+    while len(locations) < count:
+        name = f"estacao-{len(locations):06d}"
+        locations[name] = {'lat': round(rng.uniform(lat_min, lat_max), 4), 'lon': round(rng.uniform(lon_min, lon_max), 4)}
+    return locations
+
+
+def _stage(name: str, size: int, ops: int, total: float, samples: List[float]) -> Dict[str, float]:
+    return {
+        'stage': name,
+        'locations': size,
+        'ops': ops,
+        'total_s': round(total, 4),
+        'throughput_per_s': round(ops / total, 1) if total > 0 else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def _timed_calls(func: Callable, items: List) -> List[float]:
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_size(size: int, upstream: StubOpenMeteoServer, backend: StubBackendServer, broker: FakeAmqpBroker,
+             cycles: int = 3, sample: int = 500) -> List[Dict[str, float]]:
+    """
+    Mede as etapas do collector para uma quantidade de localizações.
+
+    Args:
+        size: Quantidade de localizações
+        upstream/backend/broker: Serviços locais já iniciados
+        cycles: Ciclos de coleta medidos (latência por ciclo)
+        sample: Máximo de envios individuais medidos em post_direct/publish
+
+    Returns:
+        Lista de resultados, um por etapa
+    """
+    locations = make_locations(size)
+    results = []
+
+    with ExitStack() as stack:
+        # Isolar o benchmark do estado do processo: sem cache, dedup, outbox e rate limit
+        for name, value in {
+            'CAPITAL_COORDINATES': locations,
+            '_locations': LocationRegistry.from_mapping(locations),
+            'OPEN_METEO_URL': upstream.forecast_url,
+            'BACKEND_URL': backend.url,
+            '_response_cache': None,
+            '_change_detector': None,
+            '_outbox': None,
+            '_fetch_rate_limiter': collector.TokenBucket(0, 1),
+            '_rabbitmq_connection': None,
+            '_direct_bulk_available': True,
+        }.items():
+            stack.enter_context(patch.object(collector, name, value))
+        # Provedor criado após o patch de OPEN_METEO_URL
+        stack.enter_context(patch.object(collector, '_providers', collector.build_providers(['open-meteo'])))
+        stack.enter_context(patch.object(collector.pika, 'BlockingConnection', broker.connection_factory))
+
+        # Coleta (fetch_all_capitals percorre CAPITAL_COORDINATES)
+        cycle_samples, payloads = [], []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            payloads = collector.fetch_all_capitals()
+            cycle_samples.append(time.perf_counter() - start)
+        results.append(_stage('fetch_all_capitals', size, size * cycles, sum(cycle_samples), cycle_samples))
+
+        # Normalização (por registro)
+        normalize_samples = _timed_calls(collector.normalize_payload, payloads)
+        normalized = [collector.normalize_payload(p) for p in payloads]
+        results.append(_stage('normalize_payload', size, len(payloads), sum(normalize_samples), normalize_samples))
+
+        # Envio direto individual (amostra)
+        subset = normalized[:sample]
+        post_samples = _timed_calls(collector.post_direct, subset)
+        results.append(_stage('post_direct', size, len(subset), sum(post_samples), post_samples))
+
+        # Publicação individual no RabbitMQ (amostra)
+        connection = collector.RabbitMQConnection('amqp://benchmark')
+        connection.connect()
+        publish_samples = _timed_calls(connection.publish, subset)
+        results.append(_stage('rabbitmq_publish', size, len(subset), sum(publish_samples), publish_samples))
+
+        # Ciclo completo: coleta + envio em lote (direct e rabbit)
+        for mode in ('direct', 'rabbit'):
+            stack.enter_context(patch.object(collector, 'COLLECTOR_MODE', mode))
+            collector._rabbitmq_connection = connection if mode == 'rabbit' else None
+            full_samples = []
+            for _ in range(cycles):
+                start = time.perf_counter()
+                collector.send_cycle(collector.fetch_all_capitals())
+                full_samples.append(time.perf_counter() - start)
+            results.append(_stage(f'cycle_{mode}', size, size * cycles, sum(full_samples), full_samples))
+
+            # Mesmo ciclo em pipeline (envio sobreposto à coleta)
+            pipeline_samples = []
+            for _ in range(cycles):
+                start = time.perf_counter()
+                collector.stream_cycle(list(collector._locations.names))
+                pipeline_samples.append(time.perf_counter() - start)
+            results.append(_stage(f'pipeline_{mode}', size, size * cycles, sum(pipeline_samples), pipeline_samples))
+        connection.close()
+
+    return results
+
+
+def format_table(results: List[Dict[str, float]]) -> str:
+    columns = ('stage', 'locations', 'ops', 'total_s', 'throughput_per_s', 'p50_ms', 'p95_ms', 'p99_ms')
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    lines = ['  '.join(c.ljust(widths[c]) for c in columns)]
+    lines.append('  '.join('-' * widths[c] for c in columns))
+    for row in results:
+        lines.append('  '.join(str(row[c]).ljust(widths[c]) for c in columns))
+    return '\n'.join(lines)
+
+
+def run(sizes=DEFAULT_SIZES, latency: float = 0.0, error_rate: float = 0.0, broker_latency: float = 0.0,
+        cycles: int = 3, sample: int = 500) -> List[Dict[str, float]]:
+    """Inicia os serviços locais e executa o benchmark para cada tamanho."""
+    collector.configure()
+    results = []
+    broker = FakeAmqpBroker(latency=broker_latency)
+    with StubOpenMeteoServer(latency=latency, error_rate=error_rate) as upstream, \
+            StubBackendServer(latency=latency, error_rate=error_rate) as backend:
+        for size in sizes:
+            results.extend(run_size(size, upstream, backend, broker, cycles=cycles, sample=sample))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do collector com API, backend e broker locais")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help="quantidades de localizações (ex.: 27,1000,10000)")
+    parser.add_argument('--latency', type=float, default=0.0, help="latência simulada por requisição HTTP (segundos)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração de requisições HTTP que falham com 500")
+    parser.add_argument('--broker-latency', type=float, default=0.0, help="latência simulada do broker (segundos)")
+    parser.add_argument('--cycles', type=int, default=3, help="ciclos medidos por tamanho")
+    parser.add_argument('--sample', type=int, default=500, help="envios individuais medidos em post_direct/publish")
+    parser.add_argument('--json', help="arquivo para gravar os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    # Logs por cidade dominariam o tempo medido
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('collector').setLevel(logging.WARNING)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = run(sizes, args.latency, args.error_rate, args.broker_latency, args.cycles, args.sample)
+    print(format_table(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Serviços locais usados pelos benchmarks.
+
+- StubOpenMeteoServer: imita /v1/forecast da Open-Meteo (uma ou várias
+  coordenadas por requisição), com latência e taxa de erro configuráveis.
+- StubBackendServer: imita POST /weather/logs e /weather/logs/batch.
+- FakeAmqpBroker: substitui pika.BlockingConnection em processo, confirmando
+  cada publicação (com latência opcional) sem rede.
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlsplit
+
+import pika
+
+UTC_OFFSET_SECONDS = -3 * 3600
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 para permitir keep-alive com as sessões do collector
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalho e corpo saem em escritas separadas; sem isso o delayed ACK soma ~40 ms
+    disable_nagle_algorithm = True
+
+    def _reply(self, status: int, body: object) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _simulate(self) -> bool:
+        """Aplica a latência configurada; retorna False se a requisição deve falhar."""
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        with stub.lock:
+            stub.requests += 1
+            failed = stub.random.random() < stub.error_rate
+            stub.errors += failed
+        if failed:
+            self._reply(500, {'error': 'erro simulado'})
+        return not failed
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # O collector abre até FETCH_CONCURRENCY conexões simultâneas
+    request_queue_size = 256
+
+
+class _StubServer:
+    """Base dos servidores stub: ThreadingHTTPServer em thread daemon."""
+
+    handler = _StubHandler
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 42):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._server: Optional[_ThreadingServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> '_StubServer':
+        self._server = _ThreadingServer(('127.0.0.1', 0), self.handler)
+        self._server.stub = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _OpenMeteoHandler(_StubHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != '/v1/forecast':
+            self._reply(404, {'error': 'not found'})
+            return
+        if not self._simulate():
+            return
+
+        query = parse_qs(parts.query)
+        lats = [float(v) for v in query.get('latitude', [''])[0].split(',') if v]
+        lons = [float(v) for v in query.get('longitude', [''])[0].split(',') if v]
+        if not lats or len(lats) != len(lons):
+            self._reply(400, {'error': True, 'reason': 'latitude/longitude inválidas'})
+            return
+
+        local_now = datetime.now(timezone.utc) + timedelta(seconds=UTC_OFFSET_SECONDS)
+        observed = local_now.replace(minute=local_now.minute - local_now.minute % 15, second=0, microsecond=0)
+        results = [{
+            'latitude': lat,
+            'longitude': lon,
+            'utc_offset_seconds': UTC_OFFSET_SECONDS,
+            'current': {
+                'time': observed.strftime('%Y-%m-%dT%H:%M'),
+                'interval': 900,
+                'temperature_2m': round(25 + lat / 10, 1),
+                'relative_humidity_2m': round(60 + abs(lon) % 30, 1),
+            },
+        } for lat, lon in zip(lats, lons)]
+        self._reply(200, results if len(results) > 1 else results[0])
+
+
+class StubOpenMeteoServer(_StubServer):
+    """API Open-Meteo local. A URL do endpoint é `forecast_url`."""
+
+    handler = _OpenMeteoHandler
+
+    @property
+    def forecast_url(self) -> str:
+        return f"{self.url}/v1/forecast"
+
+
+class _BackendHandler(_StubHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path not in ('/weather/logs', '/weather/logs/batch'):
+            self._reply(404, {'error': 'not found'})
+            return
+        if not self._simulate():
+            return
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        records = json.loads(body)
+        with self.server.stub.lock:
+            self.server.stub.records += len(records) if isinstance(records, list) else 1
+        if self.path == '/weather/logs':
+            self._reply(201, records)
+        else:
+            self._reply(201, {'results': [{'index': i, 'success': True} for i in range(len(records))]})
+
+
+class StubBackendServer(_StubServer):
+    """Backend local que aceita registros individuais e em lote."""
+
+    handler = _BackendHandler
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.records = 0
+
+
+class _FakeImplChannel:
+    """Canal assíncrono (BlockingChannel._impl) que confirma cada publicação."""
+
+    def __init__(self, broker: 'FakeAmqpBroker'):
+        self.broker = broker
+        self.on_confirm = None
+        self.tag = 0
+
+    def confirm_delivery(self, ack_nack_callback, callback=None):
+        self.on_confirm = ack_nack_callback
+        if callback:
+            callback(Mock())
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.tag += 1
+        self.broker.published += 1
+        self.broker.pending.append((self, pika.spec.Basic.Ack(delivery_tag=self.tag)))
+
+
+class _FakeBlockingChannel:
+    def __init__(self, broker: 'FakeAmqpBroker'):
+        self.broker = broker
+        self.is_open = True
+        self.is_closed = False
+        self._impl = _FakeImplChannel(broker)
+
+    def queue_declare(self, queue, durable=False, **kwargs):
+        return Mock()
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        if self.broker.latency:
+            time.sleep(self.broker.latency)
+        self.broker.published += 1
+
+    def close(self):
+        self.is_open, self.is_closed = False, True
+
+
+class _FakeConnection:
+    def __init__(self, broker: 'FakeAmqpBroker'):
+        self.broker = broker
+        self.is_closed = False
+
+    def channel(self):
+        return _FakeBlockingChannel(self.broker)
+
+    def add_on_connection_blocked_callback(self, callback):
+        pass
+
+    def add_on_connection_unblocked_callback(self, callback):
+        pass
+
+    def process_data_events(self, time_limit=0):
+        if self.broker.latency:
+            time.sleep(self.broker.latency)
+        pending, self.broker.pending = self.broker.pending, []
+        for channel, method in pending:
+            channel.on_confirm(Mock(method=method))
+
+    def close(self):
+        self.is_closed = True
+
+
+class FakeAmqpBroker:
+    """
+    Broker AMQP em processo. Use `connection_factory` no lugar de
+    pika.BlockingConnection; `latency` é aplicada a cada publicação síncrona
+    e a cada rodada de confirmações.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.published = 0
+        self.pending: List = []
+        self.connections = 0
+
+    def connection_factory(self, params=None) -> _FakeConnection:
+        self.connections += 1
+        return _FakeConnection(self)
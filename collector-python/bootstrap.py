@@ -0,0 +1,60 @@
+"""
+Inicialização leve do collector.
+
+Importar o collector não deve pagar por dependências que a execução não vai
+usar (ex.: pika no modo direct) nem tocar no sistema de arquivos além do
+necessário, já que em CronJobs/funções serverless o tempo de inicialização é
+cobrado a cada execução.
+
+- lazy_import: registra o módulo e adia o import real até o primeiro acesso
+  a um atributo (importlib.util.LazyLoader).
+- load_env_files: carrega o primeiro arquivo .env existente; o python-dotenv
+  só é importado se houver arquivo.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable, Optional
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Importa um módulo de forma preguiçosa.
+
+    O módulo é registrado em sys.modules imediatamente (imports posteriores
+    recebem o mesmo objeto), mas só é executado no primeiro acesso a um
+    atributo.
+
+    Raises:
+        ModuleNotFoundError: Se o módulo não estiver instalado
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load_env_files(paths: Iterable[Path]) -> Optional[Path]:
+    """
+    Carrega o primeiro arquivo .env existente em `paths`.
+
+    Variáveis já definidas no ambiente não são sobrescritas.
+
+    Returns:
+        Caminho do arquivo carregado, ou None se nenhum existir
+    """
+    for path in paths:
+        if path.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return path
+    return None
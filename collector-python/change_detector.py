@@ -0,0 +1,67 @@
+"""
+Supressão de leituras repetidas antes do envio.
+
+A Open-Meteo só atualiza o bloco `current` a cada ~15 minutos, então a maior
+parte dos ciclos reenviaria exatamente a mesma leitura de cada cidade. Este
+estágio guarda a última leitura enviada por cidade e só deixa passar uma
+nova quando o horário da observação ou os valores mudam, ou quando o
+heartbeat vence (para que cidades sem mudança continuem aparecendo).
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+Reading = Tuple[Optional[str], Tuple[float, ...]]
+
+
+class ChangeDetector:
+    """
+    Detector de mudanças por cidade, seguro para uso entre threads.
+
+    Args:
+        heartbeat: Segundos após os quais uma leitura inalterada é reenviada (0 = nunca)
+    """
+
+    def __init__(self, heartbeat: float = 900.0):
+        self.heartbeat = heartbeat
+        self._last_sent: Dict[str, Tuple[Reading, float]] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def should_send(self, city: str, observed_at: Optional[str], values: Tuple[float, ...],
+                    now: Optional[float] = None) -> bool:
+        """
+        Indica se a leitura deve ser enviada.
+
+        Args:
+            city: Cidade da leitura
+            observed_at: Horário da observação informado pela API (None se desconhecido)
+            values: Valores medidos (ex.: temperatura, umidade)
+            now: Horário atual (monotônico), para testes
+
+        Returns:
+            bool: True se a leitura é nova, mudou ou o heartbeat venceu
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._last_sent.get(city)
+            if last is None:
+                return True
+            (last_observed_at, last_values), sent_at = last
+            if observed_at != last_observed_at or values != last_values:
+                return True
+            if self.heartbeat > 0 and now - sent_at >= self.heartbeat:
+                return True
+            self.suppressed += 1
+            return False
+
+    def record(self, city: str, observed_at: Optional[str], values: Tuple[float, ...],
+               now: Optional[float] = None) -> None:
+        """Registra a leitura como enviada."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_sent[city] = ((observed_at, values), now)
+
+    def __len__(self) -> int:
+        return len(self._last_sent)
@@ -0,0 +1,91 @@
+"""
+Índice espacial por célula da grade do modelo.
+
+A Open-Meteo responde com os dados do ponto de grade do modelo mais próximo,
+então localizações na mesma célula (≈ 2 a 11 km, conforme o modelo) recebem
+valores idênticos. O índice divide o plano lat/lon em células quadradas de
+`resolution` graus, atribui cada localização a uma célula e permite buscar
+cada célula uma única vez (pelas coordenadas do seu centro), replicando o
+resultado para todas as localizações da célula.
+
+A célula de cada localização é calculada uma vez (build() para o registro
+inteiro, ou na primeira consulta) e reutilizada nos ciclos seguintes.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+Location = Tuple[str, float, float]
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Associação localização -> célula da grade, segura para uso entre threads.
+
+    Args:
+        resolution: Tamanho da célula em graus (ex.: 0.1 ≈ 11 km de latitude)
+    """
+
+    def __init__(self, resolution: float):
+        if resolution <= 0:
+            raise ValueError("a resolução da grade deve ser positiva")
+        self.resolution = resolution
+        self._cells: Dict[str, Cell] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, locations: Iterable[Location], resolution: float) -> 'GridIndex':
+        """Cria o índice já com a célula de cada localização calculada."""
+        index = cls(resolution)
+        for name, lat, lon in locations:
+            index._cells[name] = index.cell_of(lat, lon)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @property
+    def cell_count(self) -> int:
+        return len(set(self._cells.values()))
+
+    def cell_of(self, lat: float, lon: float) -> Cell:
+        """Célula que contém o ponto (centros em múltiplos de `resolution`)."""
+        return round(lat / self.resolution), round(lon / self.resolution)
+
+    def center(self, cell: Cell) -> Tuple[float, float]:
+        """Coordenadas do centro da célula."""
+        row, col = cell
+        return round(row * self.resolution, 6), round(col * self.resolution, 6)
+
+    def _cell(self, name: str, lat: float, lon: float) -> Cell:
+        cell = self._cells.get(name)
+        if cell is None:
+            cell = self.cell_of(lat, lon)
+            with self._lock:
+                self._cells[name] = cell
+        return cell
+
+    def group(self, locations: Iterable[Location]) -> List[Tuple[Location, List[str]]]:
+        """
+        Agrupa as localizações por célula.
+
+        Returns:
+            Lista de (requisição, nomes), na ordem em que cada célula aparece
+            pela primeira vez: a requisição usa o nome da primeira localização
+            da célula e as coordenadas do centro; `nomes` são todas as
+            localizações da célula (a primeira inclusa)
+        """
+        groups: Dict[Cell, Tuple[Location, List[str]]] = {}
+        for name, lat, lon in locations:
+            cell = self._cell(name, lat, lon)
+            group = groups.get(cell)
+            if group is None:
+                lat_c, lon_c = self.center(cell)
+                groups[cell] = ((name, lat_c, lon_c), [name])
+            else:
+                group[1].append(name)
+        return list(groups.values())
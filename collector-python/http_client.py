@@ -0,0 +1,262 @@
+"""
+Camada de cliente HTTP do collector.
+
+Mantém sessões HTTP persistentes (keep-alive) com pool de conexões por host,
+evitando um novo handshake TCP/TLS a cada requisição à API externa ou ao
+backend. Também centraliza timeouts de conexão/leitura, registra a latência
+de cada requisição e mantém um circuit breaker por host.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from bootstrap import lazy_import
+from resilience import CircuitBreaker, Deadline
+
+# Carregado apenas na primeira requisição (ou no primeiro acesso às exceções)
+requests = lazy_import('requests')
+
+logger = logging.getLogger(__name__)
+
+
+class HostLatencyStats:
+    """Estatísticas acumuladas de latência das requisições para um host."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed: float, error: bool) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if error:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        avg = self.total_seconds / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': round(avg * 1000, 2),
+            'max_ms': round(self.max_seconds * 1000, 2),
+        }
+
+
+class _HttpxResponse:
+    """
+    Adapta uma resposta do httpx à interface usada pelo collector
+    (status_code, json(), raise_for_status()), convertendo erros HTTP
+    para as exceções do requests.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self._response.url}",
+                response=self,
+            )
+
+
+class HttpClient:
+    """
+    Cliente HTTP com sessões persistentes por host.
+
+    Cada host (esquema + host + porta) recebe sua própria sessão com pool de
+    até `pool_size` conexões keep-alive, compartilhada entre as threads de
+    coleta. Com `http2=True` e o pacote `httpx[http2]` instalado, as sessões
+    usam HTTP/2; caso contrário, usa-se `requests` (HTTP/1.1).
+
+    Com `breaker_threshold > 0`, cada host tem um CircuitBreaker: erros de
+    conexão, timeouts e respostas 5xx/429 contam como falha, e com o circuito
+    aberto as requisições falham imediatamente com CircuitOpenError.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        keep_alive: bool = True,
+        http2: bool = False,
+        breaker_threshold: int = 0,
+        breaker_reset: float = 30.0,
+        breaker_probes: int = 1,
+    ):
+        self.pool_size = max(1, pool_size)
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.http2 = http2 and self._http2_available()
+        self._sessions: Dict[str, object] = {}
+        self._stats: Dict[str, HostLatencyStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.breaker_probes = breaker_probes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import httpx  # noqa: F401
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("[collector] HTTP/2 solicitado, mas httpx[http2] não está instalado. Usando HTTP/1.1")
+            return False
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _create_session(self):
+        if self.http2:
+            import httpx
+            return httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size if self.keep_alive else 0,
+                ),
+            )
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _session_for(self, host: str):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+                self._stats[host] = HostLatencyStats()
+                if self.breaker_threshold > 0 and host not in self._breakers:
+                    self._breakers[host] = CircuitBreaker(host, self.breaker_threshold, self.breaker_reset, self.breaker_probes)
+            return session
+
+    def _send_httpx(self, session, method: str, url: str, timeout, **kwargs):
+        import httpx
+        if 'json' not in kwargs and 'data' in kwargs:
+            kwargs['content'] = kwargs.pop('data')
+        if timeout is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            kwargs['timeout'] = httpx.Timeout(read, connect=connect)
+        try:
+            return _HttpxResponse(session.request(method, url, **kwargs))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def request(self, method: str, url: str, timeout=None, deadline: Optional[Deadline] = None, **kwargs):
+        """
+        Executa uma requisição HTTP reutilizando a sessão do host.
+
+        Args:
+            method: Método HTTP (GET, POST, ...)
+            url: URL completa
+            timeout: Timeout (segundos ou tupla conexão/leitura). Padrão: configuração do cliente
+            deadline: Prazo do ciclo; o timeout é limitado ao tempo restante
+            **kwargs: Argumentos repassados à sessão (params, json, data, headers...)
+
+        Returns:
+            Resposta HTTP (requests.Response ou adaptador equivalente)
+
+        Raises:
+            requests.exceptions.RequestException: Em erros de conexão ou timeout
+            CircuitOpenError: Se o circuito do host estiver aberto
+            DeadlineExceeded: Se o prazo do ciclo já se esgotou
+        """
+        host = self._host_key(url)
+        session = self._session_for(host)
+        timeout = timeout or self.timeout
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+        breaker = self._breakers.get(host)
+        if breaker is not None:
+            breaker.allow()
+        start = time.perf_counter()
+        error = True
+        status = None
+        try:
+            if self.http2:
+                response = self._send_httpx(session, method, url, timeout, **kwargs)
+            else:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            status = response.status_code
+            error = status >= 400
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stats[host].record(elapsed, error)
+            if breaker is not None:
+                # Erros 4xx (exceto 429) são do pedido, não do destino
+                if status is None or status >= 500 or status == 429:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            logger.debug(f"[collector] HTTP {method} {host} -> {status or 'erro'} em {elapsed * 1000:.1f}ms")
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Retorna as estatísticas de latência acumuladas, por host."""
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Retorna o estado do circuit breaker de cada host (closed, open ou half_open)."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.state for host, breaker in breakers.items()}
+
+    def reset_stats(self) -> None:
+        """Zera as estatísticas de latência (ex.: no início de cada ciclo)."""
+        with self._lock:
+            for host in self._stats:
+                self._stats[host] = HostLatencyStats()
+
+    def close(self) -> None:
+        """Fecha todas as sessões e libera as conexões do pool."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"[collector] Erro ao fechar sessão HTTP: {e}")
+
@@ -0,0 +1,241 @@
+"""
+Registro de localizações do collector.
+
+Guarda as localizações em colunas compactas (`array('d')` para latitude,
+longitude e intervalo) em vez de um dicionário de dicionários, o que permite
+carregar centenas de milhares de pontos a partir de CSV ou GeoJSON.
+
+O registro também divide as localizações entre N réplicas do collector por
+hashing consistente (`shard(i, N)`): cada réplica coleta apenas a sua fatia
+e, ao mudar N, só ~1/N das localizações trocam de réplica. partition_for()
+faz o mesmo para as partições das mensagens no RabbitMQ.
+"""
+
+import bisect
+import csv
+import hashlib
+import json
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Nomes de coluna aceitos no CSV (comparados em minúsculas)
+NAME_COLUMNS = ('name', 'city', 'cidade', 'nome', 'id')
+LAT_COLUMNS = ('lat', 'latitude')
+LON_COLUMNS = ('lon', 'lng', 'longitude')
+INTERVAL_COLUMNS = ('interval', 'intervalo')
+
+# Pontos virtuais por réplica no anel de hashing consistente
+RING_VNODES = 64
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def partition_for(name: str, count: int) -> int:
+    """
+    Partição (0..count-1) de uma localização, estável entre processos.
+
+    Usa jump consistent hash (Lamping e Veach) sobre o nome: ao passar de N
+    para N+1 partições, só ~1/(N+1) das localizações mudam de partição.
+    """
+    key = _hash64(name)
+    bucket, jump = -1, 0
+    while jump < count:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return max(bucket, 0)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Interpreta uma especificação de shard no formato "i/N" (ex.: "0/4").
+
+    Args:
+        spec: Texto da especificação
+
+    Returns:
+        Tupla (índice, total)
+
+    Raises:
+        ValueError: Se o formato for inválido ou o índice estiver fora de [0, N)
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard inválido: {spec!r} (use o formato i/N, ex.: 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard inválido: {spec!r} (índice deve estar entre 0 e {count - 1})")
+    return index, count
+
+
+class LocationRegistry:
+    """
+    Conjunto de localizações com colunas de latitude/longitude em arrays.
+
+    Cada localização tem um nome único, usado como chave no agendador e no
+    payload. O intervalo por localização é opcional (0 = usar o padrão).
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.lat = array('d')
+        self.lon = array('d')
+        self.intervals = array('d')
+        self._index: Dict[str, int] = {}
+
+    def add(self, name: str, lat: float, lon: float, interval: float = 0.0) -> bool:
+        """
+        Adiciona uma localização.
+
+        Returns:
+            bool: False se o nome já existia (a localização é ignorada)
+        """
+        if name in self._index:
+            return False
+        self._index[name] = len(self.names)
+        self.names.append(name)
+        self.lat.append(lat)
+        self.lon.append(lon)
+        self.intervals.append(interval)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> Iterator[Tuple[str, float, float]]:
+        return zip(self.names, self.lat, self.lon)
+
+    def coordinates(self, name: str) -> Optional[Tuple[float, float]]:
+        """Retorna (lat, lon) de uma localização, ou None se desconhecida."""
+        idx = self._index.get(name)
+        if idx is None:
+            return None
+        return self.lat[idx], self.lon[idx]
+
+    def interval(self, name: str) -> float:
+        """Retorna o intervalo próprio da localização (0 = padrão)."""
+        idx = self._index.get(name)
+        return self.intervals[idx] if idx is not None else 0.0
+
+    def locations(self, names: Optional[List[str]] = None) -> List[Tuple[str, float, float]]:
+        """
+        Lista as localizações como tuplas (nome, lat, lon).
+
+        Args:
+            names: Subconjunto de nomes (padrão: todas, na ordem do registro). Nomes desconhecidos são ignorados.
+        """
+        if names is None:
+            return list(self)
+        return [(name, self.lat[idx], self.lon[idx]) for name in names if (idx := self._index.get(name)) is not None]
+
+    def shard(self, index: int, count: int) -> 'LocationRegistry':
+        """
+        Retorna a fatia do registro atribuída à réplica `index` de `count`.
+
+        A atribuição usa um anel de hashing consistente sobre o nome da
+        localização, com RING_VNODES pontos virtuais por réplica.
+        """
+        if count <= 1:
+            return self
+        ring = sorted((_hash64(f"shard-{replica}-{vnode}"), replica)
+                      for replica in range(count) for vnode in range(RING_VNODES))
+        points = [point for point, _ in ring]
+
+        shard = LocationRegistry()
+        for idx, name in enumerate(self.names):
+            pos = bisect.bisect(points, _hash64(name)) % len(ring)
+            if ring[pos][1] == index:
+                shard.add(name, self.lat[idx], self.lon[idx], self.intervals[idx])
+        return shard
+
+    @classmethod
+    def from_mapping(cls, coordinates: Dict[str, Dict[str, float]]) -> 'LocationRegistry':
+        """Cria o registro a partir de um dicionário {nome: {'lat': .., 'lon': ..}}."""
+        registry = cls()
+        for name, coords in coordinates.items():
+            registry.add(name, float(coords['lat']), float(coords['lon']), float(coords.get('interval', 0)))
+        return registry
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'LocationRegistry':
+        """
+        Carrega localizações de um CSV com cabeçalho.
+
+        Colunas aceitas: nome (name/city/cidade/nome/id), latitude (lat/latitude),
+        longitude (lon/lng/longitude) e, opcionalmente, intervalo (interval/intervalo).
+        Linhas inválidas ou com nome repetido são ignoradas com aviso.
+        """
+        registry = cls()
+        skipped = 0
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+
+            def column(candidates: Tuple[str, ...]) -> Optional[int]:
+                return next((header.index(c) for c in candidates if c in header), None)
+
+            name_col, lat_col, lon_col = column(NAME_COLUMNS), column(LAT_COLUMNS), column(LON_COLUMNS)
+            interval_col = column(INTERVAL_COLUMNS)
+            if name_col is None or lat_col is None or lon_col is None:
+                raise ValueError(f"CSV de localizações sem colunas de nome/latitude/longitude: {path}")
+
+            for row in reader:
+                try:
+                    interval = float(row[interval_col] or 0) if interval_col is not None else 0.0
+                    added = registry.add(row[name_col].strip(), float(row[lat_col]), float(row[lon_col]), interval)
+                except (IndexError, ValueError):
+                    added = False
+                skipped += not added
+
+        if skipped:
+            logger.warning(f"[collector] {skipped} linhas inválidas ou repetidas ignoradas em {path}")
+        return registry
+
+    @classmethod
+    def from_geojson(cls, path: str) -> 'LocationRegistry':
+        """
+        Carrega localizações de um GeoJSON (FeatureCollection de pontos).
+
+        O nome vem de `properties.name` (ou city/nome/id); coordenadas seguem a
+        ordem GeoJSON [lon, lat]. Features que não são pontos são ignoradas.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        registry = cls()
+        skipped = 0
+        for feature in data.get('features', []):
+            geometry = feature.get('geometry') or {}
+            properties = feature.get('properties') or {}
+            name = next((str(properties[key]) for key in NAME_COLUMNS if properties.get(key) is not None), None)
+            try:
+                if geometry.get('type') != 'Point' or name is None:
+                    raise ValueError
+                lon, lat = geometry['coordinates'][:2]
+                added = registry.add(name, float(lat), float(lon), float(properties.get('interval') or 0))
+            except (KeyError, TypeError, ValueError):
+                added = False
+            skipped += not added
+
+        if skipped:
+            logger.warning(f"[collector] {skipped} features inválidas ou repetidas ignoradas em {path}")
+        return registry
+
+    @classmethod
+    def load(cls, path: str) -> 'LocationRegistry':
+        """Carrega um arquivo de localizações, escolhendo o formato pela extensão (.csv, .geojson/.json)."""
+        suffix = Path(path).suffix.lower()
+        if suffix == '.csv':
+            return cls.from_csv(path)
+        if suffix in ('.geojson', '.json'):
+            return cls.from_geojson(path)
+        raise ValueError(f"Formato de arquivo de localizações não suportado: {path}")
@@ -0,0 +1,203 @@
+"""
+Configuração de logging do collector.
+
+- Um único handler no logger raiz, em texto ou JSON (STRUCTURED_LOGS), para
+  que cada registro seja escrito uma só vez.
+- Modo assíncrono: os registros entram em uma fila limitada e são formatados
+  e escritos por uma thread em segundo plano (QueueListener). A thread de
+  coleta só paga o custo de enfileirar; se a fila encher, o registro é
+  descartado e contado em vez de bloquear a coleta.
+- Encoder JSON rápido opcional (orjson, se instalado; senão json compacto).
+- CityLogAggregator: mensagens INFO por cidade podem ser todas escritas,
+  amostradas (1 a cada N) ou agregadas em um resumo por ciclo.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, UTC
+from typing import Callable, Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - [%(levelname)s] [collector] %(message)s'
+
+CITY_LOG_MODES = ('all', 'sample', 'summary')
+
+
+def _json_encoder(fast: bool) -> Callable[[Dict], str]:
+    if fast:
+        try:
+            import orjson
+            return lambda data: orjson.dumps(data, default=str).decode('utf-8')
+        except ImportError:
+            pass
+        encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, check_circular=False, default=str)
+        return encoder.encode
+    return json.dumps
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha."""
+
+    def __init__(self, fast_json: bool = False):
+        super().__init__()
+        self._encode = _json_encoder(fast_json)
+
+    def format(self, record):
+        log_data = {
+            'timestamp': datetime.fromtimestamp(record.created, UTC).isoformat(),
+            'level': record.levelname,
+            'service': 'collector',
+            'message': record.getMessage(),
+        }
+        # Adicionar campos extras se existirem
+        if hasattr(record, 'module'):
+            log_data['module'] = record.module
+        if hasattr(record, 'operation'):
+            log_data['operation'] = record.operation
+        if hasattr(record, 'extra_data'):
+            log_data.update(record.extra_data)
+        if record.exc_info:
+            log_data['exception'] = self.formatException(record.exc_info)
+        return self._encode(log_data)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata na thread chamadora.
+
+    O QueueHandler padrão mescla mensagem e argumentos em prepare() (para
+    permitir pickling); como a fila é local ao processo, o registro segue
+    intacto e a formatação acontece na thread do listener. Com a fila cheia,
+    o registro é descartado e contado.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AsyncLogging:
+    """Handler de fila + listener em segundo plano; stop() esvazia a fila."""
+
+    def __init__(self, target: logging.Handler, max_queue: int = 10000):
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self.handler = _LazyQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def stop(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    structured: bool = False,
+    async_mode: bool = False,
+    fast_json: bool = False,
+    max_queue: int = 10000,
+) -> Optional[AsyncLogging]:
+    """
+    Configura o logger raiz com um único handler.
+
+    Args:
+        level: Nível mínimo
+        structured: Escrever em JSON (uma linha por registro)
+        async_mode: Enfileirar os registros e escrevê-los em uma thread dedicada
+        fast_json: Usar o encoder JSON rápido (apenas com structured)
+        max_queue: Tamanho máximo da fila no modo assíncrono
+
+    Returns:
+        AsyncLogging no modo assíncrono (já registrado para parar no atexit), senão None
+    """
+    stream_handler = logging.StreamHandler()
+    if structured:
+        stream_handler.setFormatter(StructuredFormatter(fast_json=fast_json))
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    async_logging = None
+    handler: logging.Handler = stream_handler
+    if async_mode:
+        async_logging = AsyncLogging(stream_handler, max_queue=max_queue)
+        atexit.register(async_logging.stop)
+        handler = async_logging.handler
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    return async_logging
+
+
+class CityLogAggregator:
+    """
+    Controla as mensagens INFO emitidas por cidade.
+
+    Modos:
+        all: todas as mensagens são escritas (comportamento padrão)
+        sample: apenas 1 a cada `sample_every` mensagens é escrita
+        summary: nenhuma é escrita; summary() resume as contagens do ciclo
+
+    Em todos os modos, as mensagens com `kind` são contadas para o resumo.
+    """
+
+    def __init__(self, logger: logging.Logger, mode: str = 'all', sample_every: int = 100):
+        if mode not in CITY_LOG_MODES:
+            logger.warning(f"[collector] LOG_CITY_MODE inválido: {mode}. Usando 'all'")
+            mode = 'all'
+        self.logger = logger
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self._counts: Dict[str, int] = {}
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def info(self, kind: Optional[str], msg: str, *args) -> None:
+        """
+        Registra uma mensagem INFO de cidade (formatação adiada, estilo %).
+
+        Args:
+            kind: Categoria contada no resumo (ex.: 'coletadas'), ou None
+            msg: Mensagem com marcadores %s
+            *args: Argumentos da mensagem
+        """
+        with self._lock:
+            if kind is not None:
+                self._counts[kind] = self._counts.get(kind, 0) + 1
+            emit = self.mode == 'all' or (self.mode == 'sample' and self._seen % self.sample_every == 0)
+            self._seen += 1
+        if emit:
+            self.logger.info(msg, *args)
+
+    def count(self, kind: str) -> None:
+        """Conta um evento no resumo sem escrever mensagem (ex.: falhas já logadas como erro)."""
+        with self._lock:
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+
+    def summary(self) -> Dict[str, int]:
+        """Retorna e zera as contagens do ciclo; no modo summary, escreve uma linha de resumo."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._seen = 0
+        if self.mode == 'summary' and counts:
+            details = ', '.join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+            self.logger.info("[collector] Resumo do ciclo por cidade: %s", details)
+        return counts
@@ -0,0 +1,408 @@
+"""
+Outbox em disco para payloads que falharam no envio.
+
+Quando o backend ou o RabbitMQ estão indisponíveis, os registros que não
+puderam ser enviados são gravados em um spool local (append-only, dividido
+em segmentos) e reenviados em lote, do mais antigo para o mais recente,
+quando o destino volta a responder.
+
+Formato de cada registro no segmento:
+    [tamanho: uint32][crc32: uint32][enfileirado_em: float64][payload JSON compacto]
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>IId')
+_SEGMENT_PREFIX = 'segment-'
+_SEGMENT_SUFFIX = '.log'
+_CURSOR_FILE = 'cursor'
+
+
+class Outbox:
+    """
+    Spool durável de payloads, em segmentos rotacionados.
+
+    - Escritas são bufferizadas e o fsync é feito em lote: no máximo a cada
+      `fsync_interval` segundos (por um timer, mesmo sem novas escritas) ou
+      `fsync_every` registros, além de na drenagem e no close().
+    - O cursor de leitura (segmento + offset) é persistido a cada lote drenado,
+      então reinícios continuam de onde pararam.
+    - O uso de disco é limitado a `max_bytes`: quando excedido, os segmentos
+      mais antigos são descartados (e contabilizados em `dropped_records`).
+      O tamanho de cada segmento é mantido em memória; o diretório só é
+      listado na abertura.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+        fsync_every: int = 1000,
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        self.fsync_every = fsync_every
+
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_seq: Optional[int] = None
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self._sync_timer: Optional[threading.Timer] = None
+
+        self.appended_records = 0
+        self.drained_records = 0
+        self.dropped_records = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sizes = self._scan_sizes()
+        self._bytes = sum(self._sizes.values())
+        self._cursor = self._load_cursor()
+        self._pending_records, self._oldest_enqueued_at = self._scan_pending()
+
+    # ------------------------------------------------------------------
+    # Segmentos e cursor
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{_SEGMENT_PREFIX}{seq:010d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> List[int]:
+        seqs = []
+        for path in self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"):
+            try:
+                seqs.append(int(path.name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+        return sorted(seqs)
+
+    def _scan_sizes(self) -> Dict[int, int]:
+        """Tamanho em disco de cada segmento (lido só na abertura; depois mantido em memória)."""
+        sizes = {}
+        for seq in self._segments():
+            try:
+                sizes[seq] = self._segment_path(seq).stat().st_size
+            except FileNotFoundError:
+                continue
+        return sizes
+
+    def _remove_segment(self, seq: int) -> None:
+        self._segment_path(seq).unlink(missing_ok=True)
+        self._bytes -= self._sizes.pop(seq, 0)
+
+    def _load_cursor(self) -> Tuple[int, int]:
+        try:
+            seq, offset = (self.directory / _CURSOR_FILE).read_text().split()
+            return int(seq), int(offset)
+        except (OSError, ValueError):
+            return 0, 0
+
+    def _save_cursor(self) -> None:
+        tmp_path = self.directory / f"{_CURSOR_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(f"{self._cursor[0]} {self._cursor[1]}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.directory / _CURSOR_FILE)
+
+    @staticmethod
+    def _read_records(path: Path, offset: int, limit: Optional[int] = None) -> Tuple[List[Tuple[float, Dict]], int]:
+        """
+        Lê registros de um segmento a partir de `offset`.
+
+        Um registro truncado ou corrompido (ex.: queda durante a escrita)
+        encerra a leitura do segmento.
+
+        Returns:
+            (lista de (enfileirado_em, payload), offset após o último registro lido)
+        """
+        records = []
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                while limit is None or len(records) < limit:
+                    header = f.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    length, crc, enqueued_at = _HEADER.unpack(header)
+                    data = f.read(length)
+                    if len(data) < length or zlib.crc32(data) != crc:
+                        logger.warning(f"[collector] Registro corrompido no outbox ({path.name}, offset {offset}). Ignorando restante do segmento")
+                        break
+                    records.append((enqueued_at, json.loads(data)))
+                    offset += _HEADER.size + length
+        except FileNotFoundError:
+            pass
+        return records, offset
+
+    def _scan_pending(self) -> Tuple[int, Optional[float]]:
+        count = 0
+        oldest = None
+        cursor_seq, cursor_offset = self._cursor
+        for seq in sorted(self._sizes):
+            if seq < cursor_seq:
+                continue
+            offset = cursor_offset if seq == cursor_seq else 0
+            records, _ = self._read_records(self._segment_path(seq), offset)
+            if records and oldest is None:
+                oldest = records[0][0]
+            count += len(records)
+        return count, oldest
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def _open_writer(self) -> None:
+        seq = max(self._sizes) if self._sizes else max(self._cursor[0], 1)
+        path = self._segment_path(seq)
+        if path.exists():
+            # Descartar um registro final truncado (queda durante a escrita) antes de continuar
+            _, valid_end = self._read_records(path, 0)
+            if valid_end < path.stat().st_size:
+                with open(path, 'r+b') as f:
+                    f.truncate(valid_end)
+            self._bytes += valid_end - self._sizes.get(seq, 0)
+            self._sizes[seq] = valid_end
+            if valid_end >= self.segment_max_bytes:
+                seq += 1
+                path = self._segment_path(seq)
+        self._writer = open(path, 'ab')
+        self._writer_seq = seq
+        self._sizes.setdefault(seq, 0)
+
+    def _rotate_if_needed(self) -> None:
+        if self._writer is None:
+            self._open_writer()
+        elif self._writer.tell() >= self.segment_max_bytes:
+            self._sync_locked()
+            self._writer.close()
+            self._writer = open(self._segment_path(self._writer_seq + 1), 'ab')
+            self._writer_seq += 1
+            self._sizes[self._writer_seq] = 0
+
+    def _sync_locked(self) -> None:
+        if self._writer is not None and self._unsynced:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+    def _schedule_sync(self) -> None:
+        """Agenda o fsync dos registros ainda não sincronizados para o fim do intervalo."""
+        if self._sync_timer is not None or not self._unsynced:
+            return
+        delay = max(0.0, self.fsync_interval - (time.monotonic() - self._last_fsync))
+        self._sync_timer = threading.Timer(delay, self._timed_sync)
+        self._sync_timer.daemon = True
+        self._sync_timer.start()
+
+    def _timed_sync(self) -> None:
+        with self._lock:
+            self._sync_timer = None
+            self._sync_locked()
+
+    def _enforce_limit(self) -> None:
+        """Descarta os segmentos mais antigos enquanto o spool exceder max_bytes."""
+        segments = sorted(self._sizes)
+        while len(segments) > 1 and self._bytes > self.max_bytes:
+            seq = segments.pop(0)
+            if seq < self._cursor[0]:
+                dropped = []
+            else:
+                offset = self._cursor[1] if seq == self._cursor[0] else 0
+                dropped, _ = self._read_records(self._segment_path(seq), offset)
+            self._remove_segment(seq)
+            self.dropped_records += len(dropped)
+            self._pending_records -= len(dropped)
+            # Segmento já drenado (atrás do cursor): o cursor continua onde está
+            if seq >= self._cursor[0]:
+                self._cursor = (segments[0], 0)
+                self._save_cursor()
+            logger.warning(f"[collector] Outbox excedeu {self.max_bytes} bytes: {len(dropped)} registros antigos descartados")
+        self._oldest_enqueued_at = None if self._pending_records == 0 else self._oldest_enqueued_at
+
+    def _append_locked(self, payloads: List[Dict]) -> None:
+        now = time.time()
+        self._rotate_if_needed()
+        for payload in payloads:
+            data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+            self._writer.write(_HEADER.pack(len(data), zlib.crc32(data), now) + data)
+            self._sizes[self._writer_seq] += _HEADER.size + len(data)
+            self._bytes += _HEADER.size + len(data)
+            self._rotate_if_needed()
+        self._unsynced += len(payloads)
+        self._pending_records += len(payloads)
+        self.appended_records += len(payloads)
+        if self._oldest_enqueued_at is None:
+            self._oldest_enqueued_at = now
+
+        self._writer.flush()
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._sync_locked()
+        else:
+            self._schedule_sync()
+        self._enforce_limit()
+
+    def append_many(self, payloads: List[Dict]) -> None:
+        """
+        Grava payloads no outbox.
+
+        Args:
+            payloads: Registros que falharam no envio
+        """
+        if not payloads:
+            return
+        with self._lock:
+            self._append_locked(payloads)
+
+    def append(self, payload: Dict) -> None:
+        self.append_many([payload])
+
+    def sync(self) -> None:
+        """Força o fsync dos registros pendentes."""
+        with self._lock:
+            self._sync_locked()
+
+    # ------------------------------------------------------------------
+    # Leitura / drenagem
+    # ------------------------------------------------------------------
+
+    def drain(self, send_batch: Callable[[List[Dict]], List[bool]], batch_size: int = 500,
+              max_records: Optional[int] = None) -> int:
+        """
+        Reenvia os registros pendentes, do mais antigo para o mais recente.
+
+        A drenagem para no primeiro lote em que nenhum registro é aceito
+        (destino ainda indisponível). Registros rejeitados individualmente em um
+        lote parcialmente aceito são regravados no fim do outbox.
+
+        Args:
+            send_batch: Função que envia uma lista de payloads e retorna o sucesso de cada um
+            batch_size: Registros por lote
+            max_records: Limite de registros processados nesta chamada (None = todos os pendentes)
+
+        Returns:
+            int: Quantidade de registros entregues
+        """
+        delivered = 0
+        processed = 0
+        with self._lock:
+            self._sync_locked()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+            # Registros regravados durante a drenagem ficam para a próxima chamada
+            budget = self._pending_records if max_records is None else min(max_records, self._pending_records)
+            while processed < budget:
+                seq, offset = self._cursor
+                segments = [s for s in sorted(self._sizes) if s >= seq]
+                if not segments:
+                    break
+                if segments[0] != seq:
+                    self._cursor = (segments[0], 0)
+                    continue
+
+                limit = min(batch_size, budget - processed)
+                records, next_offset = self._read_records(self._segment_path(seq), offset, limit)
+                if not records:
+                    if seq == segments[-1]:
+                        break
+                    # Segmento totalmente drenado: remover e avançar
+                    self._remove_segment(seq)
+                    self._cursor = (segments[1], 0)
+                    self._save_cursor()
+                    continue
+
+                payloads = [payload for _, payload in records]
+                try:
+                    results = send_batch(payloads)
+                except Exception as e:
+                    logger.error(f"[collector] Erro ao drenar outbox: {e}")
+                    break
+                if not any(results):
+                    break
+
+                rejected = [payload for payload, ok in zip(payloads, results) if not ok]
+                self._cursor = (seq, next_offset)
+                self._save_cursor()
+                accepted = len(payloads) - len(rejected)
+                processed += len(payloads)
+                delivered += accepted
+                self.drained_records += accepted
+                self._pending_records -= len(payloads)
+                # Aproximação: o próximo pendente é ao menos tão recente quanto o último drenado
+                self._oldest_enqueued_at = records[-1][0]
+
+                if rejected:
+                    # Regravar no fim para não bloquear a fila com registros problemáticos
+                    self._append_locked(rejected)
+                    self._sync_locked()
+                    self._writer.close()
+                    self._writer = None
+
+            if self._pending_records <= 0 and self._sizes:
+                self._pending_records = 0
+                self._oldest_enqueued_at = None
+                # Tudo drenado: liberar segmentos antigos
+                for seq in sorted(self._sizes):
+                    self._remove_segment(seq)
+                self._cursor = (self._cursor[0] + 1, 0)
+                self._save_cursor()
+
+        if delivered:
+            logger.info(f"[collector] Outbox: {delivered} registros reenviados, {self._pending_records} pendentes")
+        return delivered
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._pending_records
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna métricas do outbox.
+
+        - pending_records: registros aguardando reenvio
+        - pending_bytes: espaço ocupado em disco pelos segmentos
+        - lag_seconds: idade aproximada do registro pendente mais antigo
+        """
+        with self._lock:
+            lag = time.time() - self._oldest_enqueued_at if self._oldest_enqueued_at else 0.0
+            return {
+                'pending_records': self._pending_records,
+                'pending_bytes': self._bytes,
+                'segments': len(self._sizes),
+                'lag_seconds': round(lag, 3),
+                'appended_records': self.appended_records,
+                'drained_records': self.drained_records,
+                'dropped_records': self.dropped_records,
+            }
+
+    def close(self) -> None:
+        """Faz o fsync final e fecha o segmento ativo."""
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            self._sync_locked()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
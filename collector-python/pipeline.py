@@ -0,0 +1,212 @@
+"""
+Pipeline limitado produtor/consumidor para o ciclo de coleta.
+
+    origem (threads de coleta) -> fila -> transformação (1 thread) -> fila -> destino (lotes)
+
+Cada fila tem capacidade fixa: quando o destino (envio) fica para trás, a
+transformação e depois a origem bloqueiam ao inserir (backpressure), de modo
+que a memória fica limitada pelas filas e não cresce com o número de
+localizações. O destino recebe lotes com o que já estiver disponível (até
+`batch_size`, aguardando no máximo `batch_wait` por mais itens), então os
+primeiros registros são enviados enquanto o restante ainda está sendo coletado.
+
+Um erro em qualquer etapa cancela as demais e é repassado a quem chamou run().
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Generic, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+_END = object()
+
+
+class PipelineCancelled(Exception):
+    """O pipeline foi cancelado (erro em outra etapa)."""
+
+
+class BoundedChannel(Generic[T]):
+    """
+    Fila limitada entre duas etapas, com fechamento e cancelamento.
+
+    Args:
+        maxsize: Capacidade da fila
+        cancelled: Evento compartilhado de cancelamento do pipeline
+    """
+
+    def __init__(self, maxsize: int, cancelled: threading.Event):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._cancelled = cancelled
+        self.high_watermark = 0
+
+    def put(self, item: T) -> bool:
+        """
+        Insere um item, bloqueando enquanto a fila estiver cheia.
+
+        Returns:
+            bool: False se o pipeline foi cancelado (o item é descartado)
+        """
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            self.high_watermark = max(self.high_watermark, self._queue.qsize())
+            return True
+        return False
+
+    def close(self) -> None:
+        """Sinaliza o fim dos itens."""
+        self.put(_END)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Retira um item (ou o marcador de fim).
+
+        Raises:
+            queue.Empty: Se nada chegar em `timeout`
+            PipelineCancelled: Se o pipeline foi cancelado
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._cancelled.is_set():
+                raise PipelineCancelled()
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty()
+            try:
+                return self._queue.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def __iter__(self):
+        while True:
+            item = self.get()
+            if item is _END:
+                return
+            yield item
+
+
+class Pipeline(Generic[T, U]):
+    """
+    Pipeline de três etapas conectadas por filas limitadas.
+
+    Args:
+        source: Recebe `emit` e produz os itens chamando emit(item); emit
+            bloqueia com a fila cheia e retorna False se o pipeline foi
+            cancelado (a origem deve parar). Pode usar várias threads.
+        transform: Converte um item em zero ou mais itens para o destino
+            (executada em uma única thread, na ordem de chegada)
+        sink: Recebe lotes de itens transformados (executado na thread que chamou run())
+        queue_size: Capacidade de cada fila
+        batch_size: Máximo de itens por lote entregue ao destino
+        batch_wait: Segundos aguardando mais itens antes de entregar um lote incompleto
+    """
+
+    def __init__(self, source: Callable[[Callable[[T], bool]], None], transform: Callable[[T], Iterable[U]],
+                 sink: Callable[[List[U]], None], queue_size: int = 1000, batch_size: int = 500,
+                 batch_wait: float = 0.5):
+        self.source = source
+        self.transform = transform
+        self.sink = sink
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.first_batch_seconds: Optional[float] = None
+        self.high_watermark = 0
+
+    def _run_stage(self, name: str, target: Callable[[], None], cancelled: threading.Event,
+                   errors: List[BaseException]) -> threading.Thread:
+        def runner():
+            try:
+                target()
+            except PipelineCancelled:
+                pass
+            except BaseException as e:
+                errors.append(e)
+                cancelled.set()
+
+        thread = threading.Thread(target=runner, name=f'collector-pipeline-{name}', daemon=True)
+        thread.start()
+        return thread
+
+    def run(self) -> None:
+        """
+        Executa o pipeline até a origem terminar e todos os itens serem entregues.
+
+        Raises:
+            Exception: O primeiro erro ocorrido em qualquer etapa
+        """
+        start = time.perf_counter()
+        cancelled = threading.Event()
+        errors: List[BaseException] = []
+        raw: BoundedChannel[T] = BoundedChannel(self.queue_size, cancelled)
+        ready: BoundedChannel[U] = BoundedChannel(self.queue_size, cancelled)
+        count_lock = threading.Lock()
+
+        def emit(item: T) -> bool:
+            with count_lock:
+                self.items_in += 1
+            return raw.put(item)
+
+        def produce():
+            try:
+                self.source(emit)
+            finally:
+                raw.close()
+
+        def transform():
+            try:
+                for item in raw:
+                    for output in self.transform(item):
+                        if not ready.put(output):
+                            return
+            finally:
+                ready.close()
+
+        threads = [
+            self._run_stage('source', produce, cancelled, errors),
+            self._run_stage('transform', transform, cancelled, errors),
+        ]
+        try:
+            done = False
+            while not done:
+                item = ready.get()
+                if item is _END:
+                    break
+                batch = [item]
+                batch_deadline = time.monotonic() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    try:
+                        item = ready.get(timeout=max(0.0, batch_deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _END:
+                        done = True
+                        break
+                    batch.append(item)
+                if self.first_batch_seconds is None:
+                    self.first_batch_seconds = time.perf_counter() - start
+                self.sink(batch)
+                self.batches += 1
+                self.items_out += len(batch)
+        except PipelineCancelled:
+            pass
+        except BaseException:
+            cancelled.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join(timeout=None if not cancelled.is_set() else 1.0)
+            self.high_watermark = max(raw.high_watermark, ready.high_watermark)
+        if errors:
+            raise errors[0]
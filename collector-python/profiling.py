@@ -0,0 +1,231 @@
+"""
+Perfilamento opcional dos ciclos de coleta.
+
+Com o perfilamento ativado, cada ciclo registra spans (início e duração)
+das etapas instrumentadas no collector: coleta por lote/cidade,
+normalização, envio, reconexões ao RabbitMQ e o tempo gasto emitindo logs.
+A cada `every` ciclos (e em todo ciclo mais lento que `slow_cycle`) os spans
+são gravados como um arquivo Chrome trace (`.trace.json`, abra em
+chrome://tracing ou https://ui.perfetto.dev), opcionalmente acompanhados de:
+
+- `.prof`: cProfile do ciclo (`python -m pstats arquivo.prof`). O cProfile
+  cobre apenas a thread do ciclo (normalização e envio); a coleta, feita em
+  outras threads, aparece nos spans.
+- `.tracemalloc.txt`: linhas que mais alocaram memória durante o ciclo.
+
+Desativado, span() devolve um context manager vazio compartilhado, então os
+pontos de instrumentação podem ficar no caminho crítico; cProfile e
+tracemalloc só são carregados no primeiro ciclo que os utiliza.
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bootstrap import lazy_import
+
+cProfile = lazy_import('cProfile')
+tracemalloc = lazy_import('tracemalloc')
+
+logger = logging.getLogger(__name__)
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Trace:
+    """Eventos de um ciclo no formato Chrome trace (tempos em microssegundos)."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.threads: Dict[int, str] = {}
+        self.log_records = 0
+        self.log_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6, 1),
+            'dur': round((end - start) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': thread.ident,
+            'args': args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self.threads.setdefault(thread.ident, thread.name)
+
+    def add_logging(self, seconds: float) -> None:
+        with self._lock:
+            self.log_records += 1
+            self.log_seconds += seconds
+
+
+class _Span:
+    def __init__(self, trace: _Trace, name: str, args: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.trace.add(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class CycleProfiler:
+    """
+    Spans por etapa e capturas periódicas de cProfile/tracemalloc.
+
+    Args:
+        directory: Diretório dos arquivos gerados
+        enabled: Registrar spans (desativado, todas as chamadas são no-op)
+        every: Gravar o perfil a cada N ciclos (0 = só os ciclos lentos)
+        slow_cycle: Gravar também ciclos com duração >= este valor, em segundos (0 = desativado)
+        cprofile: Capturar cProfile nos ciclos múltiplos de `every`
+        trace_memory: Capturar tracemalloc nos ciclos múltiplos de `every`
+        keep: Quantidade de ciclos gravados mantidos no diretório (os mais antigos são removidos)
+    """
+
+    def __init__(self, directory: Optional[str], enabled: bool = False, every: int = 10, slow_cycle: float = 0.0,
+                 cprofile: bool = False, trace_memory: bool = False, keep: int = 20):
+        self.directory = Path(directory) if directory else None
+        self.enabled = enabled and self.directory is not None
+        self.every = max(0, every)
+        self.slow_cycle = slow_cycle
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.keep = max(1, keep)
+        self.cycles = 0
+        self._active: Optional[_Trace] = None
+
+    def span(self, name: str, **args: Any):
+        """Context manager que registra a duração do bloco no ciclo em andamento."""
+        trace = self._active
+        if trace is None:
+            return _NULL_SPAN
+        return _Span(trace, name, args)
+
+    def traced(self, name: str):
+        """Decorador que registra cada chamada da função como um span."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if self._active is None:
+                    return func(*args, **kwargs)
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument_handler(self, handler: logging.Handler) -> None:
+        """Contabiliza no ciclo em andamento o tempo gasto emitindo logs pelo handler."""
+        if not self.enabled:
+            return
+        handle = handler.handle
+
+        def timed_handle(record: logging.LogRecord):
+            trace = self._active
+            if trace is None:
+                return handle(record)
+            start = time.perf_counter()
+            try:
+                return handle(record)
+            finally:
+                trace.add_logging(time.perf_counter() - start)
+
+        handler.handle = timed_handle
+
+    @contextlib.contextmanager
+    def cycle(self, **args: Any):
+        """
+        Delimita um ciclo: registra os spans do bloco e grava o perfil se o
+        ciclo for amostrado (a cada `every`) ou lento (>= `slow_cycle`).
+        """
+        if not self.enabled:
+            yield
+            return
+        self.cycles += 1
+        sampled = self.every > 0 and (self.cycles - 1) % self.every == 0
+        trace = _Trace()
+        profile = cProfile.Profile() if sampled and self.cprofile else None
+        started_tracemalloc = False
+        if sampled and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+        if sampled and self.trace_memory:
+            tracemalloc.reset_peak()
+
+        self._active = trace
+        if profile is not None:
+            profile.enable()
+        start = time.perf_counter()
+        try:
+            with _Span(trace, 'cycle', dict(args, cycle=self.cycles)):
+                yield
+        finally:
+            duration = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            self._active = None
+            snapshot = None
+            memory = None
+            if sampled and self.trace_memory:
+                memory = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+            if sampled or (self.slow_cycle > 0 and duration >= self.slow_cycle):
+                self._write(trace, duration, profile, snapshot, memory)
+
+    def _write(self, trace: _Trace, duration: float, profile: Optional['cProfile.Profile'],
+               snapshot: Optional['tracemalloc.Snapshot'], memory: Optional[tuple]) -> None:
+        # Horário e pid antes do contador: a ordem dos nomes segue a da gravação
+        # mesmo quando o contador recomeça após um reinício do processo
+        pid = os.getpid()
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+        base = self.directory / f"cycle-{stamp}-{pid}-{self.cycles:06d}"
+        events = list(trace.events)
+        events.extend({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                      for tid, name in trace.threads.items())
+        summary = {'duration_seconds': round(duration, 6), 'log_records': trace.log_records,
+                   'log_seconds': round(trace.log_seconds, 6)}
+        if memory is not None:
+            summary['memory_current_bytes'], summary['memory_peak_bytes'] = memory
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(f"{base}.trace.json", 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': summary}, f, separators=(',', ':'))
+            if profile is not None:
+                profile.dump_stats(f"{base}.prof")
+            if snapshot is not None:
+                with open(f"{base}.tracemalloc.txt", 'w', encoding='utf-8') as f:
+                    for stat in snapshot.statistics('lineno')[:50]:
+                        f.write(f"{stat}\n")
+            self._prune()
+        except OSError as e:
+            logger.warning(f"[collector] Não foi possível gravar o perfil do ciclo {self.cycles}: {e}")
+            return
+        logger.info(f"[collector] Perfil do ciclo {self.cycles} ({duration:.2f}s, {len(trace.events)} spans) gravado em {base}.trace.json")
+
+    def _prune(self) -> None:
+        """Remove os arquivos dos ciclos mais antigos além de `keep`."""
+        cycles = sorted({path.name.split('.', 1)[0] for path in self.directory.glob('cycle-*')})
+        for old in cycles[:-self.keep]:
+            for path in self.directory.glob(f"{old}.*"):
+                path.unlink(missing_ok=True)
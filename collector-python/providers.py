@@ -0,0 +1,345 @@
+"""
+Provedores de dados climáticos.
+
+Cada provedor sabe montar a requisição para um grupo de localizações e
+converter a resposta para um resultado comum:
+
+    {'temperature', 'humidity', 'observed_at', 'expires_at', 'provider'}
+
+(`expires_at` é o epoch em que a leitura deixa de ser atual, ou None se o
+provedor não informa). As requisições em si são feitas por uma função `get`
+recebida do collector, que aplica rate limit, prazo do ciclo e circuit breaker.
+
+- OpenMeteoProvider: API gratuita, sem chave, várias localizações por requisição.
+- OpenWeatherProvider: requer OPENWEATHER_KEY, uma localização por requisição.
+- StubProvider: valores fixos, sem rede (desenvolvimento local).
+
+ProviderChain combina provedores em ordem de preferência: se o principal
+falhar, o próximo é consultado (failover); se o principal demorar mais que um
+percentil da própria latência recente, o próximo é consultado em paralelo
+(hedge) e vence a primeira resposta válida.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from response_cache import upstream_expiry
+
+logger = logging.getLogger(__name__)
+
+Location = Tuple[str, float, float]
+# get(url, params) -> resposta com raise_for_status() e json()
+Getter = Callable[[str, Dict[str, Any]], Any]
+
+
+class ProviderError(Exception):
+    """Resposta de um provedor sem dados utilizáveis."""
+
+
+class WeatherProvider(ABC):
+    """
+    Base dos provedores: subclasses definem `name` e fetch().
+    """
+
+    name = ''
+
+    @abstractmethod
+    def fetch(self, locations: Sequence[Location], get: Getter) -> List[Optional[Dict[str, Any]]]:
+        """
+        Busca as leituras de `locations`.
+
+        Returns:
+            Lista de resultados na ordem de `locations` (None para localizações sem dados)
+        """
+
+    def _result(self, temperature: Any, humidity: Any, observed_at: Optional[str],
+                expires_at: Optional[float]) -> Dict[str, Any]:
+        return {
+            'temperature': temperature,
+            'humidity': humidity,
+            'observed_at': observed_at,
+            'expires_at': expires_at,
+            'provider': self.name,
+        }
+
+
+class HttpWeatherProvider(WeatherProvider):
+    """
+    Base dos provedores consultados por HTTP.
+
+    Subclasses definem `name`, `max_batch` (localizações por requisição;
+    None = sem limite), build_request() e parse_result().
+    """
+
+    max_batch: Optional[int] = 1
+
+    @abstractmethod
+    def build_request(self, locations: Sequence[Location]) -> Tuple[str, Dict[str, Any]]:
+        """Monta a URL e os parâmetros da requisição de um grupo de localizações."""
+
+    @abstractmethod
+    def parse_result(self, result: Any) -> Optional[Dict[str, Any]]:
+        """Converte o resultado de uma localização (None se vier sem dados)."""
+
+    def split_results(self, data: Any, count: int) -> List[Any]:
+        """Separa a resposta de uma requisição em um resultado por localização."""
+        return [data]
+
+    def fetch(self, locations: Sequence[Location], get: Getter) -> List[Optional[Dict[str, Any]]]:
+        """
+        Busca as leituras de `locations`, em requisições de até `max_batch` localizações.
+
+        Returns:
+            Lista de resultados na ordem de `locations` (None para localizações sem dados)
+
+        Raises:
+            ProviderError: Se a resposta vier incompleta ou sem nenhuma leitura
+            Exception: Erros da requisição (HTTP, timeout, prazo, circuito aberto)
+        """
+        size = self.max_batch or len(locations)
+        results: List[Optional[Dict[str, Any]]] = []
+        for start in range(0, len(locations), size):
+            chunk = locations[start:start + size]
+            url, params = self.build_request(chunk)
+            response = get(url, params)
+            response.raise_for_status()
+            raw = self.split_results(response.json(), len(chunk))
+            if len(raw) != len(chunk):
+                raise ProviderError(f"{self.name}: resposta com {len(raw)} resultados para {len(chunk)} localizações")
+            results.extend(self.parse_result(item) for item in raw)
+        if results and all(result is None for result in results):
+            raise ProviderError(f"{self.name}: resposta sem dados")
+        return results
+
+
+class OpenMeteoProvider(HttpWeatherProvider):
+    """
+    Open-Meteo: aceita listas de latitude/longitude separadas por vírgula e
+    responde com um array de resultados na mesma ordem.
+
+    Args:
+        url: Endpoint de previsão
+        current: Variáveis do bloco `current`
+        tz: Fuso horário dos horários retornados
+        default_ttl: Validade (segundos) quando a API não informa o intervalo de atualização
+    """
+
+    name = 'open-meteo'
+    max_batch = None
+
+    def __init__(self, url: str, current: str = "temperature_2m,relative_humidity_2m",
+                 tz: str = "America/Sao_Paulo", default_ttl: float = 60.0):
+        self.url = url
+        self.current = current
+        self.tz = tz
+        self.default_ttl = default_ttl
+
+    def build_request(self, locations: Sequence[Location]) -> Tuple[str, Dict[str, Any]]:
+        return self.url, {
+            "latitude": ",".join(str(lat) for _, lat, _ in locations),
+            "longitude": ",".join(str(lon) for _, _, lon in locations),
+            "current": self.current,
+            "timezone": self.tz,
+        }
+
+    def split_results(self, data: Any, count: int) -> List[Any]:
+        return data if isinstance(data, list) else [data]
+
+    def parse_result(self, result: Any) -> Optional[Dict[str, Any]]:
+        current = result.get('current') if isinstance(result, dict) else None
+        if not current:
+            return None
+        return self._result(
+            current.get('temperature_2m', 0),
+            current.get('relative_humidity_2m', 0),
+            current.get('time'),
+            upstream_expiry(result, self.default_ttl),
+        )
+
+
+class OpenWeatherProvider(HttpWeatherProvider):
+    """
+    OpenWeather (Current Weather Data): uma localização por requisição.
+
+    Args:
+        url: Endpoint de clima atual
+        api_key: Chave da API (OPENWEATHER_KEY)
+    """
+
+    name = 'openweather'
+    max_batch = 1
+
+    def __init__(self, url: str, api_key: str):
+        if not api_key:
+            raise ValueError("o provedor openweather requer OPENWEATHER_KEY")
+        self.url = url
+        self.api_key = api_key
+
+    def build_request(self, locations: Sequence[Location]) -> Tuple[str, Dict[str, Any]]:
+        _, lat, lon = locations[0]
+        return self.url, {"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"}
+
+    def parse_result(self, result: Any) -> Optional[Dict[str, Any]]:
+        main = result.get('main') if isinstance(result, dict) else None
+        if not main or 'temp' not in main:
+            return None
+        observed_at = None
+        if isinstance(result.get('dt'), (int, float)):
+            observed_at = datetime.fromtimestamp(result['dt'], timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return self._result(main['temp'], main.get('humidity', 0), observed_at, None)
+
+
+class StubProvider(WeatherProvider):
+    """Valores fixos, sem requisições (os mesmos usados antes como dados mock)."""
+
+    name = 'stub'
+
+    def __init__(self, temperature: float = 25.5, humidity: float = 70.0):
+        self.temperature = temperature
+        self.humidity = humidity
+
+    def fetch(self, locations: Sequence[Location], get: Getter) -> List[Optional[Dict[str, Any]]]:
+        return [self._result(self.temperature, self.humidity, None, None) for _ in locations]
+
+
+class LatencyTracker:
+    """Janela das latências mais recentes de um provedor, segura para uso entre threads."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentil `p` (0-100) das amostras, pelo método do posto mais próximo."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))
+        return samples[rank]
+
+
+class ProviderChain:
+    """
+    Provedores em ordem de preferência, com failover e hedge.
+
+    Args:
+        providers: Provedores; o primeiro é o principal
+        hedge_percentile: Percentil da latência do principal após o qual o
+            próximo provedor é consultado em paralelo (0 = sem hedge)
+        hedge_min_delay: Espera mínima antes do hedge, em segundos
+        hedge_min_samples: Latências observadas antes de o hedge ser ativado
+        max_workers: Threads para as requisições concorrentes
+        listener: Chamado com (provedor, motivo) a cada consulta, sendo o
+            motivo 'primary', 'hedge' ou 'failover' (para métricas)
+    """
+
+    def __init__(self, providers: Sequence[WeatherProvider], hedge_percentile: float = 95.0,
+                 hedge_min_delay: float = 0.5, hedge_min_samples: int = 20, max_workers: int = 8,
+                 listener: Optional[Callable[[str, str], None]] = None):
+        if not providers:
+            raise ValueError("nenhum provedor de dados climáticos configurado")
+        self.providers = list(providers)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = max(1, hedge_min_samples)
+        self.max_workers = max(1, max_workers)
+        self.listener = listener
+        self.latency = {provider.name: LatencyTracker() for provider in self.providers}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return [provider.name for provider in self.providers]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Espera antes do hedge, ou None se desativado/sem amostras suficientes."""
+        if self.hedge_percentile <= 0 or len(self.providers) < 2:
+            return None
+        tracker = self.latency[self.providers[0].name]
+        if len(tracker) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, tracker.percentile(self.hedge_percentile))
+
+    def _notify(self, provider: WeatherProvider, reason: str) -> None:
+        if self.listener is not None:
+            self.listener(provider.name, reason)
+
+    def _call(self, provider: WeatherProvider, locations: Sequence[Location], get: Getter) -> List[Optional[Dict[str, Any]]]:
+        start = time.perf_counter()
+        results = provider.fetch(locations, get)
+        self.latency[provider.name].observe(time.perf_counter() - start)
+        return results
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='collector-provider')
+            return self._executor
+
+    def fetch(self, locations: Sequence[Location], get: Getter) -> List[Optional[Dict[str, Any]]]:
+        """
+        Busca as leituras no primeiro provedor que responder com dados.
+
+        Returns:
+            Lista de resultados na ordem de `locations`; cada resultado
+            informa em 'provider' quem o forneceu
+
+        Raises:
+            Exception: O erro do provedor principal, se todos falharem
+        """
+        if len(self.providers) == 1:
+            self._notify(self.providers[0], 'primary')
+            return self._call(self.providers[0], locations, get)
+
+        pool = self._pool()
+        waiting = list(self.providers)
+        pending: Dict[Any, WeatherProvider] = {}
+        errors: List[Exception] = []
+        hedged = False
+
+        def launch(reason: str) -> None:
+            provider = waiting.pop(0)
+            self._notify(provider, reason)
+            pending[pool.submit(self._call, provider, locations, get)] = provider
+
+        launch('primary')
+        while pending:
+            delay = self.hedge_delay() if waiting and not hedged else None
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # Principal mais lento que o percentil: consulta o próximo em paralelo
+                hedged = True
+                launch('hedge')
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.warning(f"[collector] Provedor {provider.name} falhou: {e}")
+                    errors.append(e)
+            if not pending and waiting:
+                launch('failover')
+        raise errors[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
@@ -0,0 +1,138 @@
+"""
+Proteções contra dependências lentas ou indisponíveis.
+
+- CircuitBreaker: depois de `failure_threshold` falhas seguidas, o circuito
+  abre e as chamadas falham imediatamente (CircuitOpenError) em vez de
+  esperar o timeout completo. Passado `reset_timeout`, o circuito fica
+  meio-aberto e deixa passar até `half_open_max_calls` chamadas de teste:
+  sucesso fecha o circuito, falha o reabre por mais `reset_timeout`.
+- Deadline: orçamento de tempo de um ciclo. Os timeouts das requisições são
+  limitados ao tempo restante e, esgotado o prazo, nenhuma requisição nova é
+  iniciada (DeadlineExceeded).
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Optional, Tuple, Union
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class CircuitOpenError(Exception):
+    """O circuito do destino está aberto; a requisição não foi enviada."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"circuito aberto para {name} (nova tentativa em {retry_in:.1f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(Exception):
+    """O prazo do ciclo se esgotou; a requisição não foi enviada."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de um destino (ex.: um host), seguro para uso entre threads.
+
+    Args:
+        name: Nome do destino (usado nas mensagens)
+        failure_threshold: Falhas seguidas que abrem o circuito
+        reset_timeout: Segundos com o circuito aberto antes do teste (meio-aberto)
+        half_open_max_calls: Chamadas de teste simultâneas no estado meio-aberto
+        clock: Relógio monotônico (para testes)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> None:
+        """
+        Reserva uma chamada ao destino.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto (ou meio-aberto sem vagas para teste)
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            now = self._clock()
+            if self._state == self.OPEN:
+                retry_in = self._opened_at + self.reset_timeout - now
+                if retry_in > 0:
+                    raise CircuitOpenError(self.name, retry_in)
+                self._state = self.HALF_OPEN
+                self._probes = 0
+            if self._probes >= self.half_open_max_calls:
+                raise CircuitOpenError(self.name, 0.0)
+            self._probes += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+
+class Deadline:
+    """
+    Prazo de um ciclo.
+
+    Args:
+        budget: Segundos disponíveis a partir de agora (None ou <= 0 = sem prazo)
+        clock: Relógio monotônico (para testes)
+    """
+
+    def __init__(self, budget: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + budget if budget and budget > 0 else math.inf
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def clamp(self, timeout: Timeout) -> Timeout:
+        """
+        Limita um timeout (segundos ou tupla conexão/leitura) ao tempo restante.
+
+        Raises:
+            DeadlineExceeded: Se o prazo já se esgotou
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("prazo do ciclo esgotado")
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
@@ -0,0 +1,151 @@
+"""
+Cache de respostas da API Open-Meteo.
+
+O bloco `current` da Open-Meteo só muda a cada `interval` segundos (15 min
+nos modelos atuais), mas o collector consulta todas as cidades a cada
+COLLECT_INTERVAL. Este cache guarda o resultado por localização (coordenadas
+arredondadas + variáveis solicitadas) até o próximo horário de atualização
+informado pela própria API, evitando requisições que retornariam os mesmos
+valores.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def upstream_expiry(result: Dict, default_ttl: float, now: Optional[float] = None) -> float:
+    """
+    Calcula quando um resultado da Open-Meteo deixa de ser atual.
+
+    Usa `current.time` (horário local da observação), `utc_offset_seconds` e
+    `current.interval`: o próximo valor fica disponível em time + interval.
+    Se os campos estiverem ausentes ou inválidos, usa `default_ttl`.
+
+    Args:
+        result: Resultado de uma localização (objeto com o bloco `current`)
+        default_ttl: TTL em segundos quando não for possível calcular pela API
+        now: Horário atual (epoch), para testes
+
+    Returns:
+        float: Epoch em que a entrada expira
+    """
+    now = time.time() if now is None else now
+    current = result.get('current') or {}
+    try:
+        interval = float(current['interval'])
+        observed = datetime.fromisoformat(current['time']).replace(tzinfo=timezone.utc).timestamp()
+        observed -= float(result.get('utc_offset_seconds', 0))
+    except (KeyError, TypeError, ValueError):
+        return now + default_ttl
+
+    expires_at = observed + interval
+    # Proteção contra relógios dessincronizados: nunca além de um intervalo a partir de agora
+    return min(expires_at, now + interval) if expires_at > now else now + min(default_ttl, interval)
+
+
+class ResponseCache:
+    """
+    Cache LRU com expiração por entrada, seguro para uso entre threads.
+
+    Opcionalmente persiste as entradas em um arquivo JSON (`persist_path`),
+    para que um reinício do collector não comece com o cache vazio.
+    """
+
+    def __init__(self, max_entries: int = 10000, precision: int = 4, persist_path: Optional[str] = None):
+        self.max_entries = max(1, max_entries)
+        self.precision = precision
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, lat: float, lon: float, variables: str) -> str:
+        """Monta a chave a partir das coordenadas arredondadas e das variáveis solicitadas."""
+        return f"{round(lat, self.precision)},{round(lon, self.precision)}|{variables}"
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Retorna o resultado em cache, ou None se ausente/expirado."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                    self._dirty = True
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Dict, expires_at: float) -> None:
+        """Armazena um resultado até `expires_at`, removendo o menos usado se necessário."""
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def load(self) -> int:
+        """
+        Carrega as entradas ainda válidas do arquivo de persistência.
+
+        Returns:
+            int: Quantidade de entradas carregadas
+        """
+        if not self.persist_path or not self.persist_path.exists():
+            return 0
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[collector] Não foi possível carregar o cache de respostas: {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for key, expires_at, value in stored:
+                if expires_at > now:
+                    self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = False
+            return len(self._entries)
+
+    def save(self) -> None:
+        """Grava as entradas válidas no arquivo de persistência (se houver mudanças)."""
+        if not self.persist_path:
+            return
+        now = time.time()
+        with self._lock:
+            if not self._dirty:
+                return
+            stored = [[key, expires_at, value] for key, (expires_at, value) in self._entries.items() if expires_at > now]
+            self._dirty = False
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, separators=(',', ':'))
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logger.warning(f"[collector] Não foi possível salvar o cache de respostas: {e}")
@@ -0,0 +1,133 @@
+"""
+Agendador de coletas sem deriva.
+
+Substitui o padrão "coleta + time.sleep(COLLECT_INTERVAL)", cujo período real
+é intervalo + duração do ciclo. Cada localização tem seu próprio horário de
+vencimento, calculado a partir de ticks fixos do relógio de parede (ex.: a
+cada minuto cheio), e as esperas usam o relógio monotônico, imune a ajustes
+de hora do sistema.
+
+- Espalhamento: as localizações podem ser distribuídas em `slots` dentro do
+  intervalo, em vez de todas dispararem no mesmo instante.
+- Intervalos por localização: cada chave pode ter seu próprio intervalo.
+- Atrasos: se um ciclo demora mais que um intervalo, os ticks perdidos são
+  pulados (coalescidos) em vez de acumulados.
+- Jitter por réplica: um deslocamento determinístico (derivado do hostname)
+  evita que várias réplicas do collector disparem juntas.
+"""
+
+import heapq
+import logging
+import socket
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def replica_offset(jitter: float, identity: Optional[str] = None) -> float:
+    """
+    Deslocamento estável desta réplica dentro de [0, jitter).
+
+    Args:
+        jitter: Deslocamento máximo em segundos
+        identity: Identificador da réplica (padrão: hostname)
+
+    Returns:
+        float: Deslocamento em segundos
+    """
+    if jitter <= 0:
+        return 0.0
+    identity = identity or socket.gethostname()
+    return (zlib.crc32(identity.encode('utf-8')) / 2 ** 32) * jitter
+
+
+class CollectionScheduler:
+    """
+    Agenda as coletas de um conjunto de localizações em ticks fixos.
+
+    Args:
+        intervals: Intervalo de coleta (segundos) por chave de localização
+        slots: Quantidade de grupos em que as localizações são espalhadas no intervalo (1 = todas juntas)
+        jitter: Deslocamento máximo (segundos) aplicado a esta réplica
+        identity: Identificador da réplica para o jitter (padrão: hostname)
+        clock: Relógio monotônico (para testes)
+        wall_clock: Relógio de parede, usado apenas para alinhar os ticks (para testes)
+        sleep: Função de espera (para testes)
+    """
+
+    # Entradas que vencem dentro desta janela são agrupadas no mesmo ciclo
+    GROUP_WINDOW = 0.05
+
+    def __init__(
+        self,
+        intervals: Dict[str, float],
+        slots: int = 1,
+        jitter: float = 0.0,
+        identity: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.clock = clock
+        self.sleep = sleep
+        self.slots = max(1, slots)
+        self.offset = replica_offset(jitter, identity)
+        self.skipped_ticks = 0
+        self._heap: List[Tuple[float, int, str, float]] = []
+
+        mono_now = clock()
+        wall_now = wall_clock()
+        for index, (key, interval) in enumerate(intervals.items()):
+            interval = max(0.001, float(interval))
+            slot = index % self.slots
+            phase = (self.offset + slot * interval / self.slots) % interval
+            # Próximo instante de parede t tal que (t - phase) é múltiplo do intervalo
+            delay = (phase - wall_now) % interval
+            heapq.heappush(self._heap, (mono_now + delay, index, key, interval))
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def seconds_until_next(self) -> float:
+        """Segundos até o próximo vencimento (0 se já venceu)."""
+        if not self._heap:
+            return 0.0
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def wait_next(self) -> List[str]:
+        """
+        Aguarda o próximo vencimento e retorna as chaves que devem ser coletadas.
+
+        Cada chave retornada é reagendada para o tick seguinte do seu próprio
+        intervalo; ticks que já passaram (ciclo anterior atrasado) são pulados.
+
+        Returns:
+            Lista de chaves vencidas
+        """
+        if not self._heap:
+            return []
+
+        wait = self._heap[0][0] - self.clock()
+        if wait > 0:
+            self.sleep(wait)
+
+        now = self.clock()
+        due: List[str] = []
+        missed_total = 0
+        late_keys = 0
+        while self._heap and self._heap[0][0] <= now + self.GROUP_WINDOW:
+            due_at, index, key, interval = heapq.heappop(self._heap)
+            due.append(key)
+            next_due = due_at + interval
+            if next_due <= now:
+                missed = int((now - next_due) // interval) + 1
+                next_due += missed * interval
+                missed_total += missed
+                late_keys += 1
+            heapq.heappush(self._heap, (next_due, index, key, interval))
+        if missed_total:
+            self.skipped_ticks += missed_total
+            logger.warning("[collector] Coleta atrasada: %s tick(s) pulado(s) em %s chave(s)", missed_total, late_keys)
+        return due
@@ -0,0 +1,110 @@
+"""
+Testes unitários para o arquivo local colunar das leituras
+"""
+import pytest
+import sys
+import os
+from datetime import datetime, UTC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive import ArchiveReader, ArchiveSegment, ArchiveWriter, parse_time_window
+
+
+def _record(timestamp, city="Recife", temperature=26.5, provider="open-meteo"):
+    record = {"timestamp": timestamp, "temperature": temperature, "humidity": 80.0, "city": city}
+    if provider:
+        record["provider"] = provider
+    return record
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+def test_janela_de_tempo():
+    """Testa a leitura da janela: data sem hora no fim inclui o dia inteiro, sem fuso = UTC"""
+    assert parse_time_window("2025-01-01/2025-01-02") == (_utc(2025, 1, 1), _utc(2025, 1, 3))
+    assert parse_time_window("2025-01-01T06:00/2025-01-01T12:30Z") == (_utc(2025, 1, 1, 6), _utc(2025, 1, 1, 12, 30))
+    with pytest.raises(ValueError):
+        parse_time_window("2025-01-02/2025-01-01T00:00")
+    with pytest.raises(ValueError):
+        parse_time_window("2025-01-01:2025-01-02")
+
+
+def test_gravacao_particionada_por_dia_e_leitura_da_janela(tmp_path):
+    """Testa o round-trip dos registros, a partição diária e o recorte da janela em ordem cronológica"""
+    writer = ArchiveWriter(str(tmp_path))
+    writer.append_many([
+        _record("2025-01-02T00:30:00.000001Z", city="Natal", provider=None),
+        _record("2025-01-01T10:00:00Z"),
+        _record("2025-01-01T23:59:59.5Z", city="Manaus", temperature=31.25),
+    ])
+    assert len(writer) == 3 and not list(tmp_path.iterdir())
+    assert writer.flush() == 3
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["date=2025-01-01", "date=2025-01-02"]
+    reader = ArchiveReader(str(tmp_path))
+    records = list(reader.read(_utc(2025, 1, 1), _utc(2025, 1, 3)))
+    assert records == [
+        _record("2025-01-01T10:00:00Z"),
+        _record("2025-01-01T23:59:59.500000Z", city="Manaus", temperature=31.25),
+        _record("2025-01-02T00:30:00.000001Z", city="Natal", provider=None),
+    ]
+    # Fim exclusivo e filtro por cidade
+    assert [r["city"] for r in reader.read(_utc(2025, 1, 1, 10), _utc(2025, 1, 2, 0, 30))] == ["Recife", "Manaus"]
+    assert [r["city"] for r in reader.read(_utc(2025, 1, 1), _utc(2025, 1, 3), cities=["Natal"])] == ["Natal"]
+
+
+def test_lote_gravado_ao_atingir_o_limite_e_arquivos_intercalados(tmp_path):
+    """Testa a gravação por tamanho do lote e a leitura de vários arquivos do mesmo dia em ordem"""
+    writer = ArchiveWriter(str(tmp_path), max_rows=2)
+    writer.append_many([_record("2025-01-01T10:00:00Z"), _record("2025-01-01T12:00:00Z")])
+    writer.append_many([_record("2025-01-01T11:00:00Z", city="Natal"), _record("invalido")])
+    assert writer.files_written == 1 and len(writer) == 1 and writer.rejected == 1
+    writer.close()
+
+    segments = sorted((tmp_path / "date=2025-01-01").glob("*.wcol"))
+    assert len(segments) == 2
+    records = ArchiveReader(str(tmp_path)).read(_utc(2025, 1, 1), _utc(2025, 1, 2))
+    assert [r["timestamp"] for r in records] == ["2025-01-01T10:00:00Z", "2025-01-01T11:00:00Z", "2025-01-01T12:00:00Z"]
+
+
+def test_segmento_mapeado_expoe_colunas_sem_copia(tmp_path):
+    """Testa as colunas tipadas do arquivo mapeado em memória e a busca da janela"""
+    writer = ArchiveWriter(str(tmp_path))
+    writer.append_many([_record(f"2025-01-01T{hour:02d}:00:00Z", temperature=float(hour)) for hour in (5, 1, 3)])
+    writer.flush()
+
+    segment = ArchiveSegment(next((tmp_path / "date=2025-01-01").glob("*.wcol")))
+    try:
+        assert len(segment) == 3
+        assert isinstance(segment.columns["temperature"], memoryview)
+        assert segment.columns["temperature"].tolist() == [1.0, 3.0, 5.0]
+        assert segment.cities == ["Recife"]
+        hour = 3600 * 1_000_000
+        base = segment.columns["ts"][0] - hour
+        assert segment.window(base + 2 * hour, base + 5 * hour) == (1, 2)
+    finally:
+        segment.close()
+
+
+def test_arquivo_corrompido_e_ignorado(tmp_path):
+    """Testa que um arquivo ilegível na partição não interrompe a leitura"""
+    writer = ArchiveWriter(str(tmp_path))
+    writer.append_many([_record("2025-01-01T10:00:00Z")])
+    writer.flush()
+    (tmp_path / "date=2025-01-01" / "part-0-0000.wcol").write_bytes(b"lixo")
+
+    assert len(list(ArchiveReader(str(tmp_path)).read(_utc(2025, 1, 1), _utc(2025, 1, 2)))) == 1
+
+
+def test_janela_com_fuso_usa_as_particoes_em_utc(tmp_path):
+    """Testa que uma janela com offset encontra a partição do dia em UTC"""
+    writer = ArchiveWriter(str(tmp_path))
+    writer.append_many([_record("2025-01-01T22:30:00Z")])
+    writer.flush()
+
+    start, end = parse_time_window("2025-01-02T01:00+03:00/2025-01-02T03:00+03:00")
+    records = list(ArchiveReader(str(tmp_path)).read(start, end))
+    assert [r["timestamp"] for r in records] == ["2025-01-01T22:30:00Z"]
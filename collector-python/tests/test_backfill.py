@@ -0,0 +1,140 @@
+"""
+Testes unitários para o backfill de leituras históricas
+"""
+import pytest
+import sys
+import os
+from datetime import date
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backfill import (
+    Backfill, BackfillCheckpoint, BackfillTask, OpenMeteoArchive, date_chunks, hourly_readings,
+    parse_date_range, plan_tasks, unit_key,
+)
+
+LOCAIS = [("Recife", -8.0476, -34.877), ("Natal", -5.7945, -35.211), ("Manaus", -3.119, -60.0217)]
+
+
+def _hourly(*temperatures):
+    times = [f"2025-01-01T{hour:02d}:00" for hour in range(len(temperatures))]
+    return {"hourly": {"time": times, "temperature_2m": list(temperatures), "relative_humidity_2m": [80] * len(temperatures)}}
+
+
+def test_intervalo_e_trechos_de_datas():
+    """Testa a leitura do intervalo e a divisão em trechos inclusivos"""
+    assert parse_date_range("2025-01-01:2025-01-10") == (date(2025, 1, 1), date(2025, 1, 10))
+    with pytest.raises(ValueError):
+        parse_date_range("2025-01-10:2025-01-01")
+    with pytest.raises(ValueError):
+        parse_date_range("ontem")
+
+    assert date_chunks(date(2025, 1, 1), date(2025, 1, 10), 4) == [
+        (date(2025, 1, 1), date(2025, 1, 4)),
+        (date(2025, 1, 5), date(2025, 1, 8)),
+        (date(2025, 1, 9), date(2025, 1, 10)),
+    ]
+
+
+def test_plan_tasks_omite_unidades_concluidas():
+    """Testa o agrupamento por trecho e a retomada a partir do checkpoint"""
+    checkpoint = BackfillCheckpoint(None)
+    checkpoint.mark([unit_key("Recife", date(2025, 1, 1), date(2025, 1, 7))])
+
+    tasks = plan_tasks(LOCAIS, date(2025, 1, 1), date(2025, 1, 14), 7, 2, checkpoint)
+
+    assert [([city for city, _, _ in t.locations], t.start.day) for t in tasks] == [
+        (["Natal", "Manaus"], 1), (["Recife", "Natal"], 8), (["Manaus"], 8)]
+
+
+def test_hourly_readings_ignora_horas_sem_dados():
+    """Testa a conversão das séries horárias em leituras com horário UTC"""
+    readings = hourly_readings("Recife", _hourly(26.0, None, 27.5), "open-meteo-archive")
+
+    assert [(r["timestamp"], r["temperature"]) for r in readings] == [
+        ("2025-01-01T00:00:00Z", 26.0), ("2025-01-01T02:00:00Z", 27.5)]
+    assert readings[0]["city"] == "Recife" and readings[0]["provider"] == "open-meteo-archive"
+    assert hourly_readings("Recife", {"error": True}, "x") == []
+
+
+def test_hourly_readings_percorre_time_com_series_ausentes():
+    """Testa que séries faltando ou mais curtas não descartam as horas de `time`"""
+    result = {"hourly": {"time": ["2025-01-01T00:00", "2025-01-01T01:00", "2025-01-01T02:00"],
+                         "temperature_2m": [26.0, 25.0]}}
+
+    readings = hourly_readings("Recife", result, "open-meteo-archive")
+
+    assert [(r["timestamp"], r["humidity"], r.get("incomplete")) for r in readings] == [
+        ("2025-01-01T00:00:00Z", 0, True), ("2025-01-01T01:00:00Z", 0, True)]
+    full = hourly_readings("Recife", _hourly(26.0), "x")
+    assert "incomplete" not in full[0] and full[0]["humidity"] == 80
+
+
+def test_archive_requisita_intervalo_para_varias_localizacoes():
+    """Testa a requisição em lote e a desmultiplexação por localização"""
+    response = Mock()
+    response.json.return_value = [_hourly(26.0), _hourly(30.0, 31.0)]
+    get = Mock(return_value=response)
+    task = BackfillTask(tuple(LOCAIS[:2]), date(2025, 1, 1), date(2025, 1, 7))
+
+    results = OpenMeteoArchive("http://archive").fetch(task, get)
+
+    params = get.call_args.args[1]
+    assert params["latitude"] == "-8.0476,-5.7945"
+    assert (params["start_date"], params["end_date"], params["timezone"]) == ("2025-01-01", "2025-01-07", "GMT")
+    assert [[r["temperature"] for r in readings] for readings in results] == [[26.0], [30.0, 31.0]]
+
+
+def test_checkpoint_persiste_unidades(tmp_path):
+    """Testa a gravação e a recarga do checkpoint"""
+    path = tmp_path / "checkpoint.json"
+    checkpoint = BackfillCheckpoint(str(path), flush_every=2)
+    checkpoint.mark(["a"])
+    assert not path.exists()
+    checkpoint.mark(["b"])
+    assert path.exists()
+
+    restored = BackfillCheckpoint(str(path))
+    assert restored.load() == 2 and restored.done("a")
+
+
+def test_backfill_marca_apenas_unidades_entregues():
+    """Testa que unidades com falha no envio ou na requisição ficam fora do checkpoint"""
+    def fetch(task, get):
+        if task.start.day == 8:
+            raise TimeoutError("lento")
+        return [[{"city": city, "temperature": 20.0}] * 7 * 24 for city, _, _ in task.locations]
+
+    archive = Mock(fetch=Mock(side_effect=fetch))
+    checkpoint = BackfillCheckpoint(None)
+    send = Mock(side_effect=lambda records: [r["city"] != "Natal" for r in records])
+    tasks = plan_tasks(LOCAIS, date(2025, 1, 1), date(2025, 1, 14), 7, 2)
+
+    stats = Backfill(archive, Mock(), send, dict, checkpoint, concurrency=2, batch_wait=0).run(tasks)
+
+    assert checkpoint.done(unit_key("Recife", date(2025, 1, 1), date(2025, 1, 7)))
+    assert checkpoint.done(unit_key("Manaus", date(2025, 1, 1), date(2025, 1, 7)))
+    assert not checkpoint.done(unit_key("Natal", date(2025, 1, 1), date(2025, 1, 7)))
+    assert stats["units"] == 2 and stats["units_failed"] == 1 and stats["requests_failed"] == 2
+    assert stats["records"] == 2 * 7 * 24 and stats["records_failed"] == 7 * 24
+
+
+def test_backfill_unidade_com_horas_faltando_nao_entra_no_checkpoint():
+    """Testa que horas ainda não publicadas ou sem umidade deixam a unidade pendente, mas as leituras seguem"""
+    def fetch(task, get):
+        full = [{"city": "Recife", "temperature": 20.0}] * 24
+        return [full, full[:20], full[:23] + [{"city": "Manaus", "temperature": 20.0, "incomplete": True}]]
+
+    archive = Mock(fetch=Mock(side_effect=fetch))
+    checkpoint = BackfillCheckpoint(None)
+    send = Mock(side_effect=lambda records: [True] * len(records))
+    tasks = plan_tasks(LOCAIS, date(2025, 1, 1), date(2025, 1, 1), 1, 3)
+
+    stats = Backfill(archive, Mock(), send, dict, checkpoint, batch_wait=0).run(tasks)
+
+    assert checkpoint.done(unit_key("Recife", date(2025, 1, 1), date(2025, 1, 1)))
+    assert not checkpoint.done(unit_key("Natal", date(2025, 1, 1), date(2025, 1, 1)))
+    assert not checkpoint.done(unit_key("Manaus", date(2025, 1, 1), date(2025, 1, 1)))
+    assert stats["units"] == 1 and stats["units_partial"] == 2
+    assert stats["records"] == 24 + 20 + 24
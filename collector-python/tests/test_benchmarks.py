@@ -0,0 +1,48 @@
+"""
+Testes de fumaça para o benchmark e seus serviços locais
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import bench_collector
+from benchmarks.stubs import StubOpenMeteoServer
+import collector
+
+
+@pytest.fixture(autouse=True, scope="module")
+def configurado():
+    """Lê a configuração do ambiente (sem arquivos .env) e cria os objetos compartilhados do collector"""
+    collector.configure(env_files=[])
+
+
+def test_percentil_nearest_rank():
+    """Testa o cálculo de percentis"""
+    samples = [0.1 * i for i in range(1, 11)]
+    assert bench_collector.percentile(samples, 50) == pytest.approx(0.5)
+    assert bench_collector.percentile(samples, 99) == pytest.approx(1.0)
+    assert bench_collector.percentile([], 95) == 0.0
+
+
+def test_stub_open_meteo_responde_lote():
+    """Testa que a API local responde um resultado por coordenada"""
+    with StubOpenMeteoServer() as upstream:
+        response = collector._http_client.get(upstream.forecast_url, params={
+            "latitude": "-8.0,-5.7", "longitude": "-34.8,-35.2", "current": collector.OPEN_METEO_CURRENT,
+        })
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["current"]["interval"] == 900
+
+
+def test_benchmark_executa_todas_as_etapas():
+    """Testa uma execução curta do benchmark com 27 localizações"""
+    results = bench_collector.run(sizes=[27], cycles=1, sample=5)
+
+    stages = {row['stage']: row for row in results}
+    assert set(stages) == {'fetch_all_capitals', 'normalize_payload', 'post_direct', 'rabbitmq_publish', 'cycle_direct', 'cycle_rabbit', 'pipeline_direct', 'pipeline_rabbit'}
+    assert stages['fetch_all_capitals']['ops'] == 27
+    assert stages['post_direct']['ops'] == 5
+    assert all(row['throughput_per_s'] > 0 for row in results if row['stage'] != 'normalize_payload')
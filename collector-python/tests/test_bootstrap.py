@@ -0,0 +1,52 @@
+"""
+Testes unitários para a inicialização leve (imports preguiçosos e arquivos .env)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bootstrap import lazy_import, load_env_files
+
+
+def test_lazy_import_adia_execucao_ate_primeiro_acesso(tmp_path, monkeypatch):
+    """Testa que o módulo só é executado no primeiro acesso a um atributo"""
+    (tmp_path / "modulo_preguicoso.py").write_text(
+        "import os\nos.environ['MODULO_PREGUICOSO_CARREGADO'] = '1'\nVALOR = 42\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delenv('MODULO_PREGUICOSO_CARREGADO', raising=False)
+    monkeypatch.delitem(sys.modules, 'modulo_preguicoso', raising=False)
+
+    module = lazy_import('modulo_preguicoso')
+    assert 'MODULO_PREGUICOSO_CARREGADO' not in os.environ
+    assert lazy_import('modulo_preguicoso') is module
+
+    assert module.VALOR == 42
+    assert os.environ['MODULO_PREGUICOSO_CARREGADO'] == '1'
+    sys.modules.pop('modulo_preguicoso')
+
+
+def test_lazy_import_modulo_inexistente():
+    """Testa que um módulo não instalado falha já na chamada"""
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import('modulo_que_nao_existe')
+
+
+def test_load_env_files_carrega_primeiro_existente_sem_sobrescrever(tmp_path, monkeypatch):
+    """Testa que apenas o primeiro .env existente é carregado e o ambiente prevalece"""
+    primeiro, segundo = tmp_path / "a.env", tmp_path / "b.env"
+    primeiro.write_text("BOOTSTRAP_A=arquivo\nBOOTSTRAP_B=arquivo\n", encoding="utf-8")
+    segundo.write_text("BOOTSTRAP_C=segundo\n", encoding="utf-8")
+    monkeypatch.setenv('BOOTSTRAP_B', 'ambiente')
+    monkeypatch.delenv('BOOTSTRAP_A', raising=False)
+    monkeypatch.delenv('BOOTSTRAP_C', raising=False)
+
+    assert load_env_files([tmp_path / "ausente.env", primeiro, segundo]) == primeiro
+    assert os.environ['BOOTSTRAP_A'] == 'arquivo'
+    assert os.environ['BOOTSTRAP_B'] == 'ambiente'
+    assert 'BOOTSTRAP_C' not in os.environ
+    monkeypatch.delenv('BOOTSTRAP_A')
+
+    assert load_env_files([tmp_path / "ausente.env"]) is None
@@ -0,0 +1,36 @@
+"""
+Testes unitários para o detector de mudanças (supressão de leituras repetidas)
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_detector import ChangeDetector
+
+
+def test_primeira_leitura_sempre_enviada():
+    """Testa que uma cidade sem histórico sempre envia"""
+    detector = ChangeDetector(heartbeat=900)
+    assert detector.should_send("Recife", "2025-01-24T10:00", (27.0, 80.0), now=0) is True
+
+
+def test_suprime_leitura_identica_ate_heartbeat():
+    """Testa a supressão de leituras idênticas e o reenvio pelo heartbeat"""
+    detector = ChangeDetector(heartbeat=900)
+    detector.record("Recife", "2025-01-24T10:00", (27.0, 80.0), now=0)
+
+    assert detector.should_send("Recife", "2025-01-24T10:00", (27.0, 80.0), now=60) is False
+    assert detector.should_send("Recife", "2025-01-24T10:00", (27.0, 80.0), now=900) is True
+    assert detector.suppressed == 1
+
+
+def test_envia_quando_observacao_ou_valores_mudam():
+    """Testa que nova observação ou novos valores liberam o envio"""
+    detector = ChangeDetector(heartbeat=0)
+    detector.record("Recife", "2025-01-24T10:00", (27.0, 80.0), now=0)
+
+    assert detector.should_send("Recife", "2025-01-24T10:15", (27.0, 80.0), now=10) is True
+    assert detector.should_send("Recife", "2025-01-24T10:00", (27.5, 80.0), now=10) is True
+    assert detector.should_send("Recife", "2025-01-24T10:00", (27.0, 80.0), now=10 ** 6) is False
@@ -0,0 +1,41 @@
+"""
+Testes unitários para o índice espacial por célula da grade
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grid_index import GridIndex
+
+
+def test_celula_e_centro():
+    """Testa o arredondamento para a célula mais próxima e o centro dela"""
+    grid = GridIndex(0.1)
+    assert grid.cell_of(-8.04, -34.96) == (-80, -350)
+    assert grid.cell_of(-8.06, -34.94) == (-81, -349)
+    assert grid.center((-81, -349)) == (-8.1, -34.9)
+    with pytest.raises(ValueError):
+        GridIndex(0)
+
+
+def test_agrupa_por_celula_na_ordem_de_aparicao():
+    """Testa que a requisição usa o primeiro nome da célula e as coordenadas do centro"""
+    locais = [("Olinda", -8.01, -34.90), ("Natal", -5.79, -35.21), ("Recife", -8.05, -34.88)]
+    grid = GridIndex.build(locais, 0.25)
+
+    assert grid.group(locais) == [
+        (("Olinda", -8.0, -35.0), ["Olinda", "Recife"]),
+        (("Natal", -5.75, -35.25), ["Natal"]),
+    ]
+    assert len(grid) == 3 and grid.cell_count == 2
+
+
+def test_celula_calculada_uma_vez_por_localizacao():
+    """Testa que a célula de cada nome é reaproveitada e novos nomes são indexados na primeira consulta"""
+    grid = GridIndex.build([("Recife", -8.05, -34.88)], 0.25)
+    grid.group([("Recife", 0.0, 0.0), ("Manaus", -3.1, -60.0)])
+
+    assert grid.cell_of(0.0, 0.0) != (-32, -140)
+    assert grid._cells == {"Recife": (-32, -140), "Manaus": (-12, -240)}
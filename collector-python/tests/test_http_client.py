@@ -0,0 +1,100 @@
+"""
+Testes unitários para o cliente HTTP com sessões persistentes
+"""
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from http_client import HttpClient
+
+
+def _response(status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    return response
+
+
+def test_reutiliza_sessao_por_host():
+    """Testa que requisições ao mesmo host compartilham a mesma sessão"""
+    client = HttpClient()
+    with patch.object(requests.Session, 'request', return_value=_response()) as mock_request:
+        client.get("https://api.open-meteo.com/v1/forecast")
+        client.get("https://api.open-meteo.com/v1/forecast?x=1")
+        client.post("http://localhost:3000/weather/logs", json={})
+
+    assert len(client._sessions) == 2
+    assert mock_request.call_count == 3
+    client.close()
+    assert client._sessions == {}
+
+
+def test_aplica_timeouts_padrao():
+    """Testa que o timeout (conexão, leitura) configurado é usado por padrão"""
+    client = HttpClient(connect_timeout=1.5, read_timeout=7)
+    with patch.object(requests.Session, 'request', return_value=_response()) as mock_request:
+        client.get("http://localhost:3000/health")
+
+    assert mock_request.call_args.kwargs['timeout'] == (1.5, 7)
+
+
+def test_registra_latencia_e_erros():
+    """Testa que a latência e os erros são contabilizados por host"""
+    client = HttpClient()
+    with patch.object(requests.Session, 'request', side_effect=[_response(200), _response(500)]):
+        client.get("http://localhost:3000/a")
+        client.get("http://localhost:3000/b")
+
+    with patch.object(requests.Session, 'request', side_effect=requests.exceptions.ConnectionError("down")):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("http://localhost:3000/c")
+
+    stats = client.stats()["http://localhost:3000"]
+    assert stats['count'] == 3
+    assert stats['errors'] == 2
+
+    client.reset_stats()
+    assert client.stats()["http://localhost:3000"]['count'] == 0
+
+
+def test_http2_sem_httpx_usa_http11():
+    """Testa que HTTP/2 é desativado quando httpx[http2] não está disponível"""
+    with patch.dict(sys.modules, {'httpx': None}):
+        client = HttpClient(http2=True)
+    assert client.http2 is False
+
+
+def test_circuit_breaker_por_host():
+    """Testa que erros 5xx abrem o circuito do host sem afetar os demais e 4xx não contam como falha"""
+    from resilience import CircuitOpenError
+    client = HttpClient(breaker_threshold=2, breaker_reset=60)
+    with patch.object(requests.Session, 'request', side_effect=[_response(404), _response(503), _response(502), _response(200)]) as mock_request:
+        client.get("http://localhost:3000/a")
+        client.get("http://localhost:3000/b")
+        client.get("http://localhost:3000/c")
+        with pytest.raises(CircuitOpenError):
+            client.get("http://localhost:3000/d")
+        client.get("https://api.open-meteo.com/v1/forecast")
+
+    assert mock_request.call_count == 4
+    assert client.circuit_states() == {"http://localhost:3000": "open", "https://api.open-meteo.com": "closed"}
+
+
+def test_prazo_limita_timeout_da_requisicao():
+    """Testa que o prazo do ciclo limita o timeout e impede requisições após esgotado"""
+    from resilience import Deadline, DeadlineExceeded
+    client = HttpClient(connect_timeout=3.05, read_timeout=10)
+    deadline = Deadline(2)
+    with patch.object(requests.Session, 'request', return_value=_response()) as mock_request:
+        client.get("http://localhost:3000/a", deadline=deadline)
+        connect, read = mock_request.call_args.kwargs['timeout']
+        assert connect <= 2 and read <= 2
+
+        deadline.expires_at = 0
+        with pytest.raises(DeadlineExceeded):
+            client.get("http://localhost:3000/b", deadline=deadline)
+
+    assert mock_request.call_count == 1
@@ -0,0 +1,103 @@
+"""
+Testes unitários para o registro de localizações e a divisão entre réplicas
+"""
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from location_registry import LocationRegistry, parse_shard, partition_for
+
+
+def _registro(n):
+    registry = LocationRegistry()
+    for i in range(n):
+        registry.add(f"estacao-{i}", -10.0 - i / 1000, -40.0 - i / 1000)
+    return registry
+
+
+def test_carrega_csv_com_intervalo_e_ignora_linhas_invalidas(tmp_path):
+    """Testa a leitura de CSV com colunas alternativas, intervalo opcional e linhas inválidas"""
+    path = tmp_path / "estacoes.csv"
+    path.write_text(
+        "Cidade,Latitude,Longitude,interval\n"
+        "Recife,-8.0476,-34.8770,30\n"
+        "Natal,-5.7945,-35.2110,\n"
+        "Quebrada,abc,-35.0,\n"
+        "Recife,-8.0,-34.0,\n",
+        encoding="utf-8",
+    )
+
+    registry = LocationRegistry.load(str(path))
+
+    assert registry.names == ["Recife", "Natal"]
+    assert registry.coordinates("Natal") == (-5.7945, -35.2110)
+    assert registry.interval("Recife") == 30.0
+    assert registry.interval("Natal") == 0.0
+
+
+def test_carrega_geojson_de_pontos(tmp_path):
+    """Testa a leitura de GeoJSON (coordenadas em ordem lon, lat)"""
+    path = tmp_path / "estacoes.geojson"
+    path.write_text(json.dumps({
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [-34.877, -8.0476]}, "properties": {"name": "Recife"}},
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]}, "properties": {"name": "Linha"}},
+        ],
+    }), encoding="utf-8")
+
+    registry = LocationRegistry.load(str(path))
+
+    assert registry.locations() == [("Recife", -8.0476, -34.877)]
+
+
+def test_formato_desconhecido():
+    """Testa que extensões não suportadas geram erro"""
+    with pytest.raises(ValueError):
+        LocationRegistry.load("estacoes.txt")
+
+
+def test_shards_particionam_sem_sobreposicao():
+    """Testa que as fatias cobrem todas as localizações sem repetição e de forma equilibrada"""
+    registry = _registro(4000)
+    shards = [registry.shard(i, 4) for i in range(4)]
+
+    names = [name for shard in shards for name in shard.names]
+    assert sorted(names) == sorted(registry.names)
+    assert all(600 < len(shard) < 1400 for shard in shards)
+
+
+def test_shard_consistente_ao_adicionar_replica():
+    """Testa que adicionar uma réplica move apenas uma fração das localizações"""
+    registry = _registro(4000)
+
+    def owners(count):
+        return {name: i for i in range(count) for name in registry.shard(i, count).names}
+
+    before, after = owners(4), owners(5)
+    moved = sum(1 for name in registry.names if before[name] != after[name])
+    assert moved < len(registry) * 0.35
+
+
+def test_partition_for_estavel_e_consistente():
+    """Testa que a partição é determinística, equilibrada e muda pouco ao adicionar partições"""
+    names = [f"Estacao {i}" for i in range(4000)]
+    before = [partition_for(name, 8) for name in names]
+
+    assert before == [partition_for(name, 8) for name in names]
+    assert all(400 < before.count(p) < 600 for p in range(8))
+    after = [partition_for(name, 9) for name in names]
+    assert sum(1 for a, b in zip(before, after) if a != b) < len(names) * 0.15
+    assert all(b in (a, 8) for a, b in zip(before, after))
+    assert partition_for("Recife", 1) == 0
+
+
+def test_parse_shard():
+    """Testa a interpretação de --shard i/N"""
+    assert parse_shard("2/4") == (2, 4)
+    for invalid in ("4/4", "-1/2", "1", "a/b", "0/0"):
+        with pytest.raises(ValueError):
+            parse_shard(invalid)
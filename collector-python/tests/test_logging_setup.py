@@ -0,0 +1,103 @@
+"""
+Testes unitários para a configuração de logging (handler único, modo assíncrono e logs por cidade)
+"""
+import io
+import json
+import logging
+import queue
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logging_setup import AsyncLogging, CityLogAggregator, StructuredFormatter, _LazyQueueHandler, configure_logging
+
+
+@pytest.fixture
+def raiz_restaurada():
+    """Restaura os handlers e o nível do logger raiz após o teste"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_logs_estruturados_usam_um_unico_handler(raiz_restaurada):
+    """Testa que STRUCTURED_LOGS substitui o handler de texto em vez de somar outro"""
+    configure_logging(structured=False)
+    configure_logging(structured=True)
+
+    assert len(raiz_restaurada.handlers) == 1
+    assert isinstance(raiz_restaurada.handlers[0].formatter, StructuredFormatter)
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_formatter_estruturado_gera_json(fast_json):
+    """Testa que os dois encoders produzem JSON válido com a mensagem formatada"""
+    record = logging.LogRecord("collector", logging.INFO, __file__, 1, "Dados para %s: %s°C", ("São Paulo", 25.5), None)
+
+    data = json.loads(StructuredFormatter(fast_json=fast_json).format(record))
+
+    assert data["message"] == "Dados para São Paulo: 25.5°C"
+    assert data["level"] == "INFO"
+    assert data["service"] == "collector"
+
+
+def test_modo_assincrono_formata_na_thread_do_listener():
+    """Testa que o registro é enfileirado sem formatação e escrito pelo listener"""
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    async_logging = AsyncLogging(target)
+    logger = logging.getLogger("teste.assincrono")
+    logger.propagate = False
+    logger.addHandler(async_logging.handler)
+    try:
+        prepared = async_logging.handler.prepare(logging.makeLogRecord({"msg": "cidade %s", "args": ("Recife",)}))
+        assert prepared.args == ("Recife",)
+
+        logger.warning("coleta de %s", "Natal")
+        async_logging.stop()
+    finally:
+        logger.removeHandler(async_logging.handler)
+
+    assert stream.getvalue() == "coleta de Natal\n"
+
+
+def test_fila_cheia_descarta_e_conta():
+    """Testa que, com a fila cheia, registros são descartados sem bloquear"""
+    handler = _LazyQueueHandler(queue.Queue(maxsize=1))
+
+    for i in range(3):
+        handler.emit(logging.makeLogRecord({"msg": f"registro {i}"}))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_agregador_por_cidade(caplog):
+    """Testa os modos all, sample e summary das mensagens por cidade"""
+    logger = logging.getLogger("teste.cidades")
+
+    with caplog.at_level(logging.INFO, logger="teste.cidades"):
+        sample = CityLogAggregator(logger, mode="sample", sample_every=10)
+        for i in range(25):
+            sample.info("coletadas", "cidade %s", i)
+        assert [r.getMessage() for r in caplog.records] == ["cidade 0", "cidade 10", "cidade 20"]
+
+        caplog.clear()
+        summary = CityLogAggregator(logger, mode="summary")
+        for i in range(5):
+            summary.info("coletadas", "cidade %s", i)
+        summary.info("em cache", "cidade em cache")
+        summary.count("mock")
+        assert caplog.records == []
+
+        assert summary.summary() == {"coletadas": 5, "em cache": 1, "mock": 1}
+        assert caplog.records[-1].getMessage() == "[collector] Resumo do ciclo por cidade: 5 coletadas, 1 em cache, 1 mock"
+        assert summary.summary() == {}
@@ -0,0 +1,80 @@
+"""
+Testes unitários para o registro de métricas e o endpoint /metrics
+"""
+import urllib.request
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import MetricsRegistry, MetricsServer
+
+
+def test_contador_e_gauge_com_rotulos():
+    """Testa contadores/gauges rotulados e sua renderização"""
+    registry = MetricsRegistry()
+    total = registry.counter('collector_fetch_total', 'Coletas', ['result'])
+    total.inc(result='success')
+    total.inc(2, result='success')
+    total.inc(result='failure')
+    registry.gauge('collector_last_success_timestamp_seconds', 'Último envio').set(1700000000)
+
+    text = registry.render()
+
+    assert '# TYPE collector_fetch_total counter' in text
+    assert 'collector_fetch_total{result="success"} 3' in text
+    assert 'collector_fetch_total{result="failure"} 1' in text
+    assert 'collector_last_success_timestamp_seconds 1700000000' in text
+
+
+def test_histograma_buckets_cumulativos():
+    """Testa buckets cumulativos, soma e contagem do histograma"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('collector_cycle_duration_seconds', 'Ciclo', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+
+    text = registry.render()
+
+    assert 'collector_cycle_duration_seconds_bucket{le="0.1"} 1' in text
+    assert 'collector_cycle_duration_seconds_bucket{le="1"} 3' in text
+    assert 'collector_cycle_duration_seconds_bucket{le="+Inf"} 4' in text
+    assert 'collector_cycle_duration_seconds_sum 4.25' in text
+    assert 'collector_cycle_duration_seconds_count 4' in text
+
+
+def test_timed_registra_mesmo_com_excecao():
+    """Testa que o decorador timed observa a duração mesmo quando a função falha"""
+    histogram = MetricsRegistry().histogram('collector_send_duration_seconds', 'Envio', ['operation'])
+
+    @histogram.timed(operation='post')
+    def falha():
+        raise RuntimeError("erro")
+
+    with pytest.raises(RuntimeError):
+        falha()
+    assert histogram.count(operation='post') == 1
+
+
+def test_rotulos_invalidos():
+    """Testa que rótulos diferentes dos declarados geram erro"""
+    counter = MetricsRegistry().counter('collector_fetch_total', 'Coletas', ['result'])
+    with pytest.raises(ValueError):
+        counter.inc(city='Recife')
+
+
+def test_servidor_expoe_metricas():
+    """Testa que o endpoint HTTP serve o registro em /metrics"""
+    registry = MetricsRegistry()
+    registry.counter('collector_records_total', 'Registros', ['result']).inc(5, result='success')
+    server = MetricsServer(registry, host='127.0.0.1', port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+            assert response.headers['Content-Type'].startswith('text/plain')
+    finally:
+        server.close()
+
+    assert 'collector_records_total{result="success"} 5' in body
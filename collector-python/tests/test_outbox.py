@@ -0,0 +1,178 @@
+"""
+Testes unitários para o outbox em disco
+"""
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from outbox import Outbox
+
+
+def _registros(n, start=0):
+    return [{"timestamp": "2025-01-24T10:00:00Z", "temperature": float(i), "humidity": 50.0, "city": f"C{i}"}
+            for i in range(start, start + n)]
+
+
+def test_drena_em_ordem_e_remove_segmentos(tmp_path):
+    """Testa que os registros são reenviados do mais antigo para o mais recente"""
+    outbox = Outbox(str(tmp_path), segment_max_bytes=200)
+    outbox.append_many(_registros(5))
+    outbox.append_many(_registros(5, start=5))
+    assert len(outbox) == 10
+    assert outbox.stats()['segments'] > 1
+
+    sent = []
+    delivered = outbox.drain(lambda batch: sent.extend(batch) or [True] * len(batch), batch_size=3)
+
+    assert delivered == 10
+    assert [p['city'] for p in sent] == [f"C{i}" for i in range(10)]
+    assert len(outbox) == 0
+    assert outbox.stats()['segments'] == 0
+
+
+def test_drenagem_para_quando_destino_indisponivel(tmp_path):
+    """Testa que a drenagem para no primeiro lote totalmente rejeitado"""
+    outbox = Outbox(str(tmp_path))
+    outbox.append_many(_registros(4))
+
+    calls = []
+    delivered = outbox.drain(lambda batch: calls.append(len(batch)) or [False] * len(batch), batch_size=2)
+
+    assert delivered == 0
+    assert calls == [2]
+    assert len(outbox) == 4
+
+
+def test_persiste_entre_reinicios(tmp_path):
+    """Testa que pendentes e cursor sobrevivem a um reinício do processo"""
+    outbox = Outbox(str(tmp_path))
+    outbox.append_many(_registros(6))
+    outbox.drain(lambda batch: [True] * len(batch), batch_size=2, max_records=2)
+    outbox.close()
+
+    reopened = Outbox(str(tmp_path))
+    assert len(reopened) == 4
+
+    sent = []
+    reopened.drain(lambda batch: sent.extend(batch) or [True] * len(batch))
+    assert [p['city'] for p in sent] == ['C2', 'C3', 'C4', 'C5']
+
+
+def test_rejeitados_individualmente_voltam_para_o_fim(tmp_path):
+    """Testa que itens rejeitados em lote parcialmente aceito são regravados"""
+    outbox = Outbox(str(tmp_path))
+    outbox.append_many(_registros(3))
+
+    delivered = outbox.drain(lambda batch: [p['city'] != 'C1' for p in batch])
+
+    assert delivered == 2
+    assert len(outbox) == 1
+    sent = []
+    outbox.drain(lambda batch: sent.extend(batch) or [True] * len(batch))
+    assert [p['city'] for p in sent] == ['C1']
+
+
+def test_limite_de_disco_descarta_segmentos_antigos(tmp_path):
+    """Testa que o uso de disco é limitado descartando os registros mais antigos"""
+    outbox = Outbox(str(tmp_path), segment_max_bytes=300, max_bytes=900)
+    for i in range(20):
+        outbox.append_many(_registros(2, start=i * 2))
+
+    stats = outbox.stats()
+    assert stats['pending_bytes'] <= 900 + 300
+    assert stats['dropped_records'] > 0
+    assert stats['pending_records'] == 40 - stats['dropped_records']
+
+    sent = []
+    outbox.drain(lambda batch: sent.extend(batch) or [True] * len(batch))
+    assert sent[-1]['city'] == 'C39'
+    assert len(sent) == stats['pending_records']
+
+
+def test_registro_truncado_e_descartado(tmp_path):
+    """Testa que um registro final truncado não impede novas gravações"""
+    outbox = Outbox(str(tmp_path))
+    outbox.append_many(_registros(2))
+    outbox.close()
+
+    segment = next(tmp_path.glob('segment-*.log'))
+    with open(segment, 'ab') as f:
+        f.write(b'\x00\x00\x00\xff\x00')
+
+    reopened = Outbox(str(tmp_path))
+    reopened.append_many(_registros(1, start=2))
+    sent = []
+    reopened.drain(lambda batch: sent.extend(batch) or [True] * len(batch))
+    assert [p['city'] for p in sent] == ['C0', 'C1', 'C2']
+
+
+def test_metricas_de_lag(tmp_path):
+    """Testa que as métricas expõem pendentes e lag"""
+    outbox = Outbox(str(tmp_path))
+    assert outbox.stats()['lag_seconds'] == 0.0
+    outbox.append_many(_registros(1))
+    stats = outbox.stats()
+    assert stats['pending_records'] == 1
+    assert stats['lag_seconds'] >= 0.0
+    assert stats['appended_records'] == 1
+
+
+def test_tamanho_em_memoria_acompanha_o_disco(tmp_path):
+    """Testa que os bytes mantidos em memória batem com os segmentos após gravação, rotação, drenagem e reabertura"""
+    def disk_usage():
+        return sum(path.stat().st_size for path in tmp_path.glob('segment-*.log'))
+
+    outbox = Outbox(str(tmp_path), segment_max_bytes=300)
+    outbox.append_many(_registros(10))
+    assert outbox.stats()['pending_bytes'] == disk_usage()
+    assert outbox.stats()['segments'] == len(list(tmp_path.glob('segment-*.log')))
+
+    outbox.drain(lambda batch: [p['city'] != 'C9' for p in batch], batch_size=4, max_records=8)
+    assert outbox.stats()['pending_bytes'] == disk_usage()
+    outbox.close()
+
+    reopened = Outbox(str(tmp_path), segment_max_bytes=300)
+    reopened.append_many(_registros(1, start=10))
+    assert reopened.stats()['pending_bytes'] == disk_usage()
+
+
+def test_limite_de_disco_nao_recua_o_cursor(tmp_path):
+    """Testa que descartar um segmento anterior ao cursor não faz o cursor voltar (sem reenvios)"""
+    outbox = Outbox(str(tmp_path), segment_max_bytes=300)
+    for i in range(20):
+        outbox.append_many(_registros(1, start=i))
+    outbox.close()
+    segments = sorted(tmp_path.glob('segment-*.log'))
+    assert len(segments) >= 4
+
+    # Cursor no terceiro segmento, com os dois primeiros ainda em disco (já drenados)
+    third = int(segments[2].name[len('segment-'):-len('.log')])
+    (tmp_path / 'cursor').write_text(f"{third} 0")
+    expected = [p['city'] for path in segments[2:] for _, p in Outbox._read_records(path, 0)[0]] + ['C20']
+
+    usage = sum(path.stat().st_size for path in segments)
+    reopened = Outbox(str(tmp_path), segment_max_bytes=300, max_bytes=usage)
+    reopened.append_many(_registros(1, start=20))
+    assert not segments[0].exists()
+    assert reopened.stats()['dropped_records'] == 0
+
+    sent = []
+    reopened.drain(lambda batch: sent.extend(batch) or [True] * len(batch))
+    assert [p['city'] for p in sent] == expected
+
+
+def test_fsync_por_intervalo_sem_novas_gravacoes(tmp_path):
+    """Testa que o fsync do intervalo acontece mesmo sem outra gravação depois"""
+    outbox = Outbox(str(tmp_path), fsync_interval=0.2, fsync_every=1000)
+    outbox.append_many(_registros(1))
+    outbox.append_many(_registros(1, start=1))
+    assert outbox._unsynced > 0
+
+    deadline = time.monotonic() + 2
+    while outbox._unsynced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert outbox._unsynced == 0
+    outbox.close()
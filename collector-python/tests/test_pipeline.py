@@ -0,0 +1,109 @@
+"""
+Testes unitários para o pipeline limitado de coleta e envio
+"""
+import pytest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import Pipeline
+
+
+def _source(items):
+    def source(emit):
+        for item in items:
+            if not emit(item):
+                return
+    return source
+
+
+def test_pipeline_entrega_todos_os_itens_transformados_em_lotes():
+    """Testa a transformação (com itens filtrados) e o limite de itens por lote"""
+    batches = []
+    pipeline = Pipeline(_source(range(10)), lambda n: [n * 10] if n % 2 == 0 else [], batches.append,
+                        queue_size=4, batch_size=2, batch_wait=0.5)
+
+    pipeline.run()
+
+    assert [n for batch in batches for n in batch] == [0, 20, 40, 60, 80]
+    assert all(len(batch) <= 2 for batch in batches)
+    assert pipeline.items_in == 10 and pipeline.items_out == 5
+
+
+def test_pipeline_envia_antes_de_a_origem_terminar():
+    """Testa que o primeiro lote chega ao destino enquanto a origem ainda produz"""
+    first_sent = threading.Event()
+
+    def source(emit):
+        emit('a')
+        # Com coleta-depois-envio, 'b' só seria produzido após esperar todo o timeout
+        assert first_sent.wait(5)
+        emit('b')
+
+    batches = []
+
+    def sink(batch):
+        batches.append(batch)
+        first_sent.set()
+
+    Pipeline(source, lambda item: [item], sink, batch_wait=0.01).run()
+
+    assert batches == [['a'], ['b']]
+
+
+def test_pipeline_aplica_backpressure_na_origem():
+    """Testa que, com o destino lento, a origem fica limitada pela capacidade das filas"""
+    produced = []
+    in_flight = []
+    delivered = []
+
+    def source(emit):
+        for n in range(50):
+            produced.append(n)
+            in_flight.append(len(produced) - len(delivered))
+            if not emit(n):
+                return
+
+    def sink(batch):
+        time.sleep(0.005)
+        delivered.extend(batch)
+
+    pipeline = Pipeline(source, lambda n: [n], sink, queue_size=2, batch_size=1, batch_wait=0)
+    pipeline.run()
+
+    assert delivered == list(range(50))
+    # Duas filas de 2, um item na transformação, um no destino e o que está sendo emitido
+    assert max(in_flight) <= 2 * 2 + 3
+    assert pipeline.high_watermark <= 2
+
+
+def test_pipeline_erro_no_destino_cancela_a_origem():
+    """Testa que um erro no envio interrompe a coleta e é repassado"""
+    stopped = threading.Event()
+
+    def endless(emit):
+        n = 0
+        while emit(n):
+            n += 1
+        stopped.set()
+
+    def sink(batch):
+        raise RuntimeError("envio falhou")
+
+    with pytest.raises(RuntimeError, match="envio falhou"):
+        Pipeline(endless, lambda n: [n], sink, queue_size=2, batch_wait=0).run()
+    assert stopped.wait(2)
+
+
+def test_pipeline_repassa_erro_da_origem():
+    """Testa que um erro na coleta é repassado após entregar o que já foi produzido"""
+    def source(emit):
+        emit(1)
+        raise ValueError("coleta falhou")
+
+    batches = []
+    with pytest.raises(ValueError, match="coleta falhou"):
+        Pipeline(source, lambda n: [n], batches.append, batch_wait=0).run()
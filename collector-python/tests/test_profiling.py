@@ -0,0 +1,124 @@
+"""
+Testes unitários para o perfilamento dos ciclos
+"""
+import pytest
+import sys
+import os
+import json
+import logging
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiling import CycleProfiler
+
+
+def _traces(directory):
+    return sorted(directory.glob('*.trace.json'))
+
+
+def test_desativado_nao_registra_nada(tmp_path):
+    """Testa que, desativado, spans e ciclos são no-op e nenhum arquivo é gravado"""
+    profiler = CycleProfiler(str(tmp_path), enabled=False, every=1)
+
+    with profiler.cycle():
+        with profiler.span('fetch') as span:
+            assert span is None
+
+    assert profiler.cycles == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ciclo_amostrado_grava_chrome_trace(tmp_path):
+    """Testa os spans (inclusive de outras threads) e o formato Chrome trace"""
+    profiler = CycleProfiler(str(tmp_path), enabled=True, every=2)
+
+    @profiler.traced('send')
+    def send():
+        time.sleep(0.001)
+
+    def fetch():
+        with profiler.span('fetch', cities=['Recife']):
+            pass
+
+    for _ in range(3):
+        with profiler.cycle(cities=2):
+            worker = threading.Thread(target=fetch, name='collector-fetch_0')
+            worker.start()
+            worker.join()
+            send()
+
+    # Ciclos 1 e 3 (a cada 2, começando pelo primeiro)
+    traces = _traces(tmp_path)
+    assert [path.name.split('.')[0].split('-')[-1] for path in traces] == ['000001', '000003']
+    trace = json.loads(traces[0].read_text())
+    spans = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+    assert set(spans) == {'cycle', 'fetch', 'send'}
+    assert spans['cycle']['args'] == {'cities': 2, 'cycle': 1}
+    assert spans['send']['dur'] >= 1000
+    assert spans['fetch']['tid'] != spans['send']['tid']
+    assert 'collector-fetch_0' in [event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M']
+
+
+def test_ciclo_lento_grava_com_cprofile_e_tracemalloc(tmp_path):
+    """Testa a gravação de ciclos lentos e as capturas de cProfile e tracemalloc nos amostrados"""
+    profiler = CycleProfiler(str(tmp_path), enabled=True, every=0, slow_cycle=0.01)
+    with profiler.cycle():
+        pass
+    with profiler.cycle():
+        time.sleep(0.02)
+    assert len(_traces(tmp_path)) == 1
+
+    sampled = CycleProfiler(str(tmp_path / 'amostrado'), enabled=True, every=1, cprofile=True, trace_memory=True)
+    with sampled.cycle():
+        data = [bytes(1000) for _ in range(100)]
+    names = sorted(path.name.split('.', 1)[1] for path in (tmp_path / 'amostrado').iterdir())
+    assert names == ['prof', 'trace.json', 'tracemalloc.txt']
+    trace = json.loads(_traces(tmp_path / 'amostrado')[0].read_text())
+    assert trace['otherData']['memory_peak_bytes'] >= 100000
+
+
+def test_erro_no_ciclo_e_registrado_e_repassado(tmp_path):
+    """Testa que o span registra o erro e a exceção segue para quem chamou"""
+    profiler = CycleProfiler(str(tmp_path), enabled=True, every=1)
+    with pytest.raises(RuntimeError):
+        with profiler.cycle():
+            with profiler.span('send'):
+                raise RuntimeError("falhou")
+
+    trace = json.loads(_traces(tmp_path)[0].read_text())
+    assert [event['args'].get('error') for event in trace['traceEvents'] if event['ph'] == 'X'] == ['RuntimeError', 'RuntimeError']
+
+
+def test_tempo_de_logging_e_remocao_dos_antigos(tmp_path):
+    """Testa a contabilização dos logs do ciclo e o limite de ciclos mantidos"""
+    profiler = CycleProfiler(str(tmp_path), enabled=True, every=1, keep=2)
+    handler = logging.NullHandler()
+    profiler.instrument_handler(handler)
+    record = logging.LogRecord('collector', logging.INFO, __file__, 1, "msg", None, None)
+
+    handler.handle(record)
+    for _ in range(3):
+        with profiler.cycle():
+            handler.handle(record)
+
+    traces = _traces(tmp_path)
+    assert len(traces) == 2 and '000003' in traces[-1].name
+    assert json.loads(traces[-1].read_text())['otherData']['log_records'] == 1
+
+
+def test_remocao_dos_antigos_apos_reinicio_mantem_os_mais_recentes(tmp_path):
+    """Testa que, após reiniciar (contador de volta a 1), os ciclos novos não são os removidos"""
+    profiler = CycleProfiler(str(tmp_path), enabled=True, every=1, keep=3)
+    for _ in range(5):
+        with profiler.cycle():
+            pass
+
+    restarted = CycleProfiler(str(tmp_path), enabled=True, every=1, keep=3)
+    with restarted.cycle():
+        pass
+
+    traces = _traces(tmp_path)
+    assert len(traces) == 3
+    assert [path.name.split('.')[0].split('-')[-1] for path in traces] == ['000004', '000005', '000001']
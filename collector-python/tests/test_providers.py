@@ -0,0 +1,187 @@
+"""
+Testes unitários para os provedores de dados climáticos e a cadeia com failover/hedge
+"""
+import pytest
+import sys
+import os
+import threading
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from providers import (
+    HttpWeatherProvider, LatencyTracker, OpenMeteoProvider, OpenWeatherProvider, ProviderChain, ProviderError,
+    StubProvider, WeatherProvider,
+)
+
+LOCAIS = [("Recife", -8.0476, -34.877), ("Natal", -5.7945, -35.211)]
+
+
+def _getter(data):
+    """Função get falsa que devolve sempre `data` e registra as chamadas"""
+    response = Mock()
+    response.json.return_value = data
+    return Mock(return_value=response)
+
+
+class FakeProvider(WeatherProvider):
+    """Provedor falso: responde com `temperature`, falha com `error` ou espera `release`"""
+
+    def __init__(self, name, temperature=20.0, error=None, release=None):
+        self.name = name
+        self.temperature = temperature
+        self.error = error
+        self.release = release
+        self.calls = 0
+
+    def fetch(self, locations, get):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return [self._result(self.temperature, 50, None, None) for _ in locations]
+
+
+def test_open_meteo_requisita_lote_e_desmultiplexa():
+    """Testa que a Open-Meteo recebe todas as localizações em uma requisição"""
+    provider = OpenMeteoProvider("http://meteo/forecast")
+    get = _getter([
+        {"current": {"time": "2025-01-24T10:00", "temperature_2m": 27.0, "relative_humidity_2m": 80}},
+        {"current": {"time": "2025-01-24T10:00", "temperature_2m": 29.0, "relative_humidity_2m": 75}},
+    ])
+
+    results = provider.fetch(LOCAIS, get)
+
+    url, params = get.call_args.args
+    assert url == "http://meteo/forecast"
+    assert params["latitude"] == "-8.0476,-5.7945"
+    assert [r["temperature"] for r in results] == [27.0, 29.0]
+    assert all(r["provider"] == "open-meteo" and r["expires_at"] for r in results)
+
+
+def test_open_meteo_resposta_incompleta():
+    """Testa localização sem dados (None), resposta truncada e resposta vazia"""
+    provider = OpenMeteoProvider("http://meteo/forecast")
+
+    results = provider.fetch(LOCAIS, _getter([{"current": {"temperature_2m": 27.0}}, {"error": True}]))
+    assert results[0]["temperature"] == 27.0 and results[1] is None
+
+    with pytest.raises(ProviderError):
+        provider.fetch(LOCAIS, _getter([{"current": {"temperature_2m": 27.0}}]))
+    with pytest.raises(ProviderError):
+        provider.fetch(LOCAIS[:1], _getter({"error": True}))
+
+
+def test_open_weather_uma_requisicao_por_localizacao():
+    """Testa a conversão da resposta da OpenWeather e a exigência da chave"""
+    provider = OpenWeatherProvider("http://owm/weather", "chave")
+    get = _getter({"dt": 1737723600, "main": {"temp": 26.3, "humidity": 81}})
+
+    results = provider.fetch(LOCAIS, get)
+
+    assert get.call_count == 2
+    assert get.call_args.args[1] == {"lat": -5.7945, "lon": -35.211, "appid": "chave", "units": "metric"}
+    assert results[0] == {"temperature": 26.3, "humidity": 81, "observed_at": "2025-01-24T13:00:00Z",
+                          "expires_at": None, "provider": "openweather"}
+    with pytest.raises(ValueError):
+        OpenWeatherProvider("http://owm/weather", "")
+
+
+def test_provedor_incompleto_falha_ao_instanciar():
+    """Testa que um provedor sem os métodos abstratos não pode ser criado"""
+    class SemFetch(WeatherProvider):
+        name = 'sem-fetch'
+
+    class SemParse(HttpWeatherProvider):
+        name = 'sem-parse'
+
+        def build_request(self, locations):
+            return "http://x", {}
+
+    with pytest.raises(TypeError):
+        SemFetch()
+    with pytest.raises(TypeError):
+        SemParse()
+
+
+def test_stub_nao_faz_requisicoes():
+    """Testa que o stub responde com valores fixos sem chamar get"""
+    get = Mock()
+    results = StubProvider().fetch(LOCAIS, get)
+    assert [(r["temperature"], r["humidity"], r["provider"]) for r in results] == [(25.5, 70.0, "stub")] * 2
+    get.assert_not_called()
+
+
+def test_latency_tracker_percentil():
+    """Testa o percentil pelo posto mais próximo sobre a janela recente"""
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95) is None
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000)
+    assert tracker.percentile(50) == pytest.approx(0.050)
+    assert tracker.percentile(95) == pytest.approx(0.095)
+    tracker.observe(1.0)
+    assert len(tracker) == 100
+
+
+def test_cadeia_faz_failover_quando_principal_falha():
+    """Testa que o próximo provedor é consultado quando o principal falha"""
+    events = []
+    primary = FakeProvider("a", error=RuntimeError("fora do ar"))
+    secondary = FakeProvider("b", temperature=31.0)
+    chain = ProviderChain([primary, secondary], listener=lambda p, r: events.append((p, r)))
+
+    results = chain.fetch(LOCAIS, Mock())
+    chain.close()
+
+    assert [r["provider"] for r in results] == ["b", "b"]
+    assert events == [("a", "primary"), ("b", "failover")]
+
+
+def test_cadeia_propaga_erro_do_principal_se_todos_falharem():
+    """Testa que, sem nenhum provedor disponível, o erro do principal é propagado"""
+    chain = ProviderChain([FakeProvider("a", error=TimeoutError("lento")), FakeProvider("b", error=RuntimeError("x"))])
+    with pytest.raises(TimeoutError):
+        chain.fetch(LOCAIS, Mock())
+    chain.close()
+
+
+def test_cadeia_dispara_hedge_quando_principal_excede_percentil():
+    """Testa que o hedge é disparado após o percentil e a primeira resposta válida vence"""
+    events = []
+    release = threading.Event()
+    primary = FakeProvider("a", release=release)
+    secondary = FakeProvider("b", temperature=31.0)
+    chain = ProviderChain([primary, secondary], hedge_percentile=95, hedge_min_delay=0.01,
+                          hedge_min_samples=3, listener=lambda p, r: events.append((p, r)))
+    for _ in range(3):
+        chain.latency["a"].observe(0.01)
+
+    try:
+        results = chain.fetch(LOCAIS, Mock())
+    finally:
+        release.set()
+        chain.close()
+
+    assert [r["provider"] for r in results] == ["b", "b"]
+    assert events == [("a", "primary"), ("b", "hedge")]
+
+
+def test_cadeia_sem_amostras_nao_dispara_hedge():
+    """Testa que o hedge só é ativado após hedge_min_samples latências do principal"""
+    chain = ProviderChain([FakeProvider("a"), FakeProvider("b")], hedge_min_samples=20)
+    assert chain.hedge_delay() is None
+    for _ in range(20):
+        chain.latency["a"].observe(0.2)
+    assert chain.hedge_delay() == pytest.approx(0.5)
+    assert ProviderChain([FakeProvider("a")]).hedge_delay() is None
+
+
+def test_cadeia_com_um_provedor_consulta_direto():
+    """Testa que um único provedor é consultado na própria thread, sem pool"""
+    provider = FakeProvider("a")
+    chain = ProviderChain([provider])
+    assert chain.fetch(LOCAIS, Mock())[0]["provider"] == "a"
+    assert chain._executor is None
+    assert len(chain.latency["a"]) == 1
@@ -0,0 +1,99 @@
+"""
+Testes unitários para o circuit breaker e o prazo por ciclo
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resilience import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuito_abre_apos_falhas_seguidas():
+    """Testa que o circuito abre no limite de falhas seguidas e um sucesso zera a contagem"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("api", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.allow()
+    assert exc.value.retry_in == pytest.approx(30)
+
+
+def test_meio_aberto_permite_uma_sonda_e_fecha_com_sucesso():
+    """Testa que, passado o reset_timeout, apenas uma sonda passa e o sucesso fecha o circuito"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("api", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+    breaker.allow()
+
+
+def test_falha_da_sonda_reabre_o_circuito():
+    """Testa que uma sonda com falha reabre o circuito por mais reset_timeout"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("api", failure_threshold=5, reset_timeout=10, clock=clock)
+    for _ in range(5):
+        breaker.record_failure()
+
+    clock.now += 10
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    clock.now += 1
+    breaker.allow()
+
+
+def test_deadline_limita_timeouts_ao_tempo_restante():
+    """Testa que o timeout é limitado ao tempo restante e falha com o prazo esgotado"""
+    clock = FakeClock()
+    deadline = Deadline(5, clock=clock)
+
+    assert deadline.clamp((3.05, 10)) == (3.05, 5)
+    clock.now += 4
+    assert deadline.clamp(10) == pytest.approx(1)
+    assert not deadline.expired()
+
+    clock.now += 1
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceeded):
+        deadline.clamp((3.05, 10))
+
+
+def test_deadline_sem_prazo():
+    """Testa que budget 0/None desativa o prazo"""
+    for budget in (0, None):
+        deadline = Deadline(budget)
+        assert not deadline.expired()
+        assert deadline.clamp((3.05, 10)) == (3.05, 10)
@@ -0,0 +1,68 @@
+"""
+Testes unitários para o cache de respostas da Open-Meteo
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_cache import ResponseCache, upstream_expiry
+
+# 2025-01-24T10:00 em America/Sao_Paulo (UTC-3) = 13:00 UTC
+OBSERVED_EPOCH = 1737723600.0
+
+
+def _resultado(time_str="2025-01-24T10:00", interval=900):
+    return {"utc_offset_seconds": -10800, "current": {"time": time_str, "interval": interval, "temperature_2m": 25.0}}
+
+
+def test_expiracao_pelo_horario_da_observacao():
+    """Testa que a entrada expira em current.time + interval (convertido para UTC)"""
+    expires_at = upstream_expiry(_resultado(), default_ttl=60, now=OBSERVED_EPOCH + 100)
+    assert expires_at == OBSERVED_EPOCH + 900
+
+
+def test_expiracao_sem_campos_usa_ttl_padrao():
+    """Testa o TTL padrão quando a resposta não informa time/interval"""
+    assert upstream_expiry({"current": {}}, default_ttl=60, now=1000.0) == 1060.0
+
+
+def test_observacao_atrasada_usa_ttl_curto():
+    """Testa que uma observação já vencida recebe um TTL curto em vez de expirar no passado"""
+    now = OBSERVED_EPOCH + 2000
+    assert upstream_expiry(_resultado(), default_ttl=60, now=now) == now + 60
+
+
+def test_chave_arredonda_coordenadas():
+    """Testa que coordenadas muito próximas compartilham a mesma chave"""
+    cache = ResponseCache(precision=2)
+    assert cache.key(-8.04761, -34.87701, "t") == cache.key(-8.0479, -34.8768, "t")
+    assert cache.key(-8.04, -34.87, "t") != cache.key(-8.04, -34.87, "t,h")
+
+
+def test_expira_e_remove_menos_usado():
+    """Testa expiração por entrada e despejo LRU"""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", {"v": 1}, expires_at=200)
+    cache.put("b", {"v": 2}, expires_at=200)
+    assert cache.get("a", now=100) == {"v": 1}
+    cache.put("c", {"v": 3}, expires_at=200)
+
+    assert cache.get("b", now=100) is None
+    assert cache.get("a", now=100) == {"v": 1}
+    assert cache.get("a", now=300) is None
+    assert len(cache) == 1
+
+
+def test_persistencia_em_disco(tmp_path):
+    """Testa que entradas válidas sobrevivem a um reinício"""
+    path = tmp_path / "cache.json"
+    cache = ResponseCache(persist_path=str(path))
+    cache.put("valida", {"v": 1}, expires_at=4102444800)
+    cache.put("expirada", {"v": 2}, expires_at=1)
+    cache.save()
+
+    reloaded = ResponseCache(persist_path=str(path))
+    assert reloaded.load() == 1
+    assert reloaded.get("valida") == {"v": 1}
@@ -0,0 +1,118 @@
+"""
+Testes unitários para o agendador de coletas sem deriva
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import CollectionScheduler, replica_offset
+
+
+class FakeClock:
+    """Relógio controlado manualmente; sleep apenas avança o tempo."""
+
+    def __init__(self, mono=1000.0, wall=0.0):
+        self.mono = mono
+        self.wall_base = wall - mono
+        self.sleeps = []
+
+    def clock(self):
+        return self.mono
+
+    def wall(self):
+        return self.mono + self.wall_base
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.mono += seconds
+
+
+def _scheduler(fake, intervals, **kwargs):
+    return CollectionScheduler(intervals, clock=fake.clock, wall_clock=fake.wall, sleep=fake.sleep, **kwargs)
+
+
+def test_alinha_ao_tick_do_relogio_sem_deriva():
+    """Testa que os disparos caem em múltiplos fixos do intervalo, mesmo com ciclos lentos"""
+    fake = FakeClock(wall=1015.0)
+    scheduler = _scheduler(fake, {"Recife": 60})
+
+    fired_at = []
+    for _ in range(3):
+        assert scheduler.wait_next() == ["Recife"]
+        fired_at.append(fake.wall())
+        fake.mono += 7  # duração do ciclo
+
+    assert fired_at == [1020.0, 1080.0, 1140.0]
+
+
+def test_espalha_cidades_em_slots():
+    """Testa que as cidades são distribuídas uniformemente no intervalo"""
+    fake = FakeClock(wall=0.0)
+    scheduler = _scheduler(fake, {"A": 60, "B": 60, "C": 60}, slots=3)
+
+    assert scheduler.wait_next() == ["A"]
+    assert scheduler.wait_next() == ["B"]
+    assert fake.wall() == 20.0
+    assert scheduler.wait_next() == ["C"]
+    assert fake.wall() == 40.0
+    assert scheduler.wait_next() == ["A"]
+    assert fake.wall() == 60.0
+
+
+def test_intervalos_por_cidade():
+    """Testa que cada cidade segue seu próprio intervalo"""
+    fake = FakeClock(wall=0.0)
+    scheduler = _scheduler(fake, {"Rápida": 30, "Lenta": 90})
+
+    fired = []
+    while fake.wall() < 180:
+        fired.extend((fake.wall(), city) for city in scheduler.wait_next())
+
+    assert [t for t, city in fired if city == "Lenta"] == [0.0, 90.0, 180.0]
+    assert [t for t, city in fired if city == "Rápida"] == [0.0, 30.0, 60.0, 90.0, 120.0, 150.0, 180.0]
+
+
+def test_coalesce_ticks_perdidos():
+    """Testa que um ciclo mais longo que o intervalo pula ticks em vez de acumulá-los"""
+    fake = FakeClock(wall=0.0)
+    scheduler = _scheduler(fake, {"Recife": 60})
+
+    scheduler.wait_next()
+    fake.mono += 150  # ciclo atrasado: perdeu os ticks 60 e 120
+
+    # Os ticks perdidos viram uma única coleta imediata, e o agendamento volta ao tick 180
+    assert scheduler.wait_next() == ["Recife"]
+    assert fake.wall() == 150.0
+    assert scheduler.skipped_ticks == 1
+    assert scheduler.wait_next() == ["Recife"]
+    assert fake.wall() == 180.0
+
+
+def test_atraso_de_varias_chaves_gera_um_unico_aviso(caplog):
+    """Testa que os ticks pulados de todas as chaves vencidas são resumidos em uma linha de log"""
+    fake = FakeClock(wall=0.0)
+    scheduler = _scheduler(fake, {"A": 60, "B": 60, "C": 60})
+
+    assert scheduler.wait_next() == ["A", "B", "C"]
+    fake.mono += 150
+
+    with caplog.at_level("WARNING", logger="scheduler"):
+        assert scheduler.wait_next() == ["A", "B", "C"]
+
+    assert scheduler.skipped_ticks == 3
+    assert [r.getMessage() for r in caplog.records] == ["[collector] Coleta atrasada: 3 tick(s) pulado(s) em 3 chave(s)"]
+
+
+def test_jitter_por_replica_estavel():
+    """Testa que o deslocamento é determinístico por réplica e limitado ao jitter"""
+    assert replica_offset(0) == 0.0
+    assert replica_offset(10, "collector-1") == replica_offset(10, "collector-1")
+    assert replica_offset(10, "collector-1") != replica_offset(10, "collector-2")
+    assert 0 <= replica_offset(10, "collector-2") < 10
+
+    fake = FakeClock(wall=0.0)
+    scheduler = _scheduler(fake, {"Recife": 60}, jitter=10, identity="collector-1")
+    scheduler.wait_next()
+    assert fake.wall() == pytest.approx(replica_offset(10, "collector-1"))
@@ -0,0 +1,74 @@
+"""
+Testes unitários para o formato das mensagens publicadas no RabbitMQ
+"""
+import gzip
+import json
+import struct
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wire_format
+from wire_format import WireEncoder, msgpack_dumps
+
+REGISTRO = {"timestamp": "2025-01-24T10:00:00Z", "temperature": 25.5, "humidity": 70.0, "city": "Recife"}
+
+
+def test_json_e_o_padrao():
+    """Testa que o padrão continua sendo um registro JSON por mensagem"""
+    messages = WireEncoder().encode([REGISTRO, dict(REGISTRO, city="Natal")])
+
+    assert len(messages) == 2
+    assert messages[0].content_type == "application/json"
+    assert messages[0].content_encoding is None
+    assert json.loads(messages[1].body)["city"] == "Natal"
+    assert [m.indices for m in messages] == [[0], [1]]
+
+
+def test_envelope_em_lote_comprimido():
+    """Testa o agrupamento em envelopes gzip e os índices de cada envelope"""
+    payloads = [dict(REGISTRO, city=f"C{i}") for i in range(5)]
+    messages = WireEncoder(batch_size=2, compression="gzip", compress_min_bytes=0).encode(payloads)
+
+    assert [m.indices for m in messages] == [[0, 1], [2, 3], [4]]
+    assert messages[0].content_type == wire_format.CONTENT_TYPE_JSON_BATCH
+    assert messages[0].content_encoding == "gzip"
+    assert [r["city"] for r in json.loads(gzip.decompress(messages[1].body))] == ["C2", "C3"]
+    # Grupo de um único registro usa o formato simples
+    assert messages[2].content_type == wire_format.CONTENT_TYPE_JSON
+
+
+def test_compressao_respeita_tamanho_minimo():
+    """Testa que corpos pequenos não são comprimidos"""
+    message = WireEncoder(compression="gzip", compress_min_bytes=10_000).encode_one(REGISTRO)
+    assert message.content_encoding is None
+
+
+def test_msgpack_embutido():
+    """Testa o codificador MessagePack embutido (sem o pacote msgpack)"""
+    with patch.object(wire_format, "msgpack", None):
+        body = msgpack_dumps({"a": 1, "b": [True, None, -3], "t": 25.5, "s": "São"})
+
+    assert body == (
+        b"\x84"
+        b"\xa1a\x01"
+        b"\xa1b\x93\xc3\xc0\xfd"
+        b"\xa1t\xcb" + struct.pack(">d", 25.5) +
+        b"\xa1s\xa4S\xc3\xa3o"
+    )
+
+
+def test_msgpack_declara_content_type():
+    """Testa o content_type das mensagens MessagePack"""
+    encoder = WireEncoder(encoding="msgpack", batch_size=10)
+    assert encoder.encode_one(REGISTRO).content_type == wire_format.CONTENT_TYPE_MSGPACK
+    assert encoder.encode([REGISTRO, REGISTRO])[0].content_type == wire_format.CONTENT_TYPE_MSGPACK_BATCH
+
+
+def test_configuracao_invalida_usa_padrao():
+    """Testa que codificação/compressão inválidas voltam ao padrão"""
+    encoder = WireEncoder(encoding="avro", compression="zstd")
+    assert (encoder.encoding, encoder.compression) == ("json", "none")
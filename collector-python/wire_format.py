@@ -0,0 +1,171 @@
+"""
+Formato das mensagens publicadas no RabbitMQ.
+
+Cada mensagem declara seu formato nas propriedades AMQP:
+
+- content_type:
+    application/json                              um registro em JSON (padrão)
+    application/msgpack                           um registro em MessagePack
+    application/vnd.gdash.weather-batch+json      array de registros em JSON
+    application/vnd.gdash.weather-batch+msgpack   array de registros em MessagePack
+- content_encoding: "gzip" quando o corpo está comprimido (ausente caso contrário)
+
+Com `batch_size > 1`, vários registros viajam em um único envelope,
+reduzindo a quantidade de mensagens (e de escritas em disco da fila durável).
+O MessagePack usa o pacote `msgpack`, se instalado; caso contrário, um
+codificador embutido para os tipos usados nos registros (dict, list, str,
+int, float, bool e None).
+"""
+
+import gzip
+import json
+import logging
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_MSGPACK = 'application/msgpack'
+CONTENT_TYPE_JSON_BATCH = 'application/vnd.gdash.weather-batch+json'
+CONTENT_TYPE_MSGPACK_BATCH = 'application/vnd.gdash.weather-batch+msgpack'
+
+ENCODINGS = ('json', 'msgpack')
+COMPRESSIONS = ('none', 'gzip')
+
+
+def _msgpack_encode(value, out: bytearray) -> None:
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xff)
+        elif 0 <= value < 2 ** 64:
+            out += b'\xcf' + struct.pack('>Q', value)
+        else:
+            out += b'\xd3' + struct.pack('>q', value)
+    elif isinstance(value, float):
+        out += b'\xcb' + struct.pack('>d', value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        size = len(data)
+        if size < 32:
+            out.append(0xa0 | size)
+        elif size < 0x100:
+            out += b'\xd9' + struct.pack('>B', size)
+        elif size < 0x10000:
+            out += b'\xda' + struct.pack('>H', size)
+        else:
+            out += b'\xdb' + struct.pack('>I', size)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        size = len(value)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size < 0x10000:
+            out += b'\xdc' + struct.pack('>H', size)
+        else:
+            out += b'\xdd' + struct.pack('>I', size)
+        for item in value:
+            _msgpack_encode(item, out)
+    elif isinstance(value, dict):
+        size = len(value)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size < 0x10000:
+            out += b'\xde' + struct.pack('>H', size)
+        else:
+            out += b'\xdf' + struct.pack('>I', size)
+        for key, item in value.items():
+            _msgpack_encode(str(key), out)
+            _msgpack_encode(item, out)
+    else:
+        raise TypeError(f"Tipo não suportado em MessagePack: {type(value).__name__}")
+
+
+def msgpack_dumps(value) -> bytes:
+    """Serializa em MessagePack (pacote `msgpack` se disponível, senão o codificador embutido)."""
+    if msgpack is not None:
+        return msgpack.packb(value, use_bin_type=True)
+    out = bytearray()
+    _msgpack_encode(value, out)
+    return bytes(out)
+
+
+class WireMessage(NamedTuple):
+    """Mensagem pronta para publicação e os índices dos registros que ela carrega."""
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str]
+    indices: List[int]
+
+
+class WireEncoder:
+    """
+    Codifica registros em mensagens AMQP.
+
+    Args:
+        encoding: 'json' (padrão) ou 'msgpack'
+        batch_size: Registros por mensagem (1 = um registro por mensagem)
+        compression: 'none' (padrão) ou 'gzip'
+        compress_min_bytes: Corpos menores que isso não são comprimidos
+    """
+
+    def __init__(self, encoding: str = 'json', batch_size: int = 1, compression: str = 'none', compress_min_bytes: int = 256):
+        if encoding not in ENCODINGS:
+            logger.warning(f"[collector] Codificação inválida: {encoding}. Usando 'json'")
+            encoding = 'json'
+        if compression not in COMPRESSIONS:
+            logger.warning(f"[collector] Compressão inválida: {compression}. Usando 'none'")
+            compression = 'none'
+        self.encoding = encoding
+        self.batch_size = max(1, batch_size)
+        self.compression = compression
+        self.compress_min_bytes = max(0, compress_min_bytes)
+
+    def _serialize(self, value) -> bytes:
+        if self.encoding == 'msgpack':
+            return msgpack_dumps(value)
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def _content_type(self, batch: bool) -> str:
+        if self.encoding == 'msgpack':
+            return CONTENT_TYPE_MSGPACK_BATCH if batch else CONTENT_TYPE_MSGPACK
+        return CONTENT_TYPE_JSON_BATCH if batch else CONTENT_TYPE_JSON
+
+    def encode_one(self, payload: Dict, index: int = 0) -> WireMessage:
+        """Codifica um único registro (sem envelope de lote)."""
+        return self._finish(self._serialize(payload), self._content_type(False), [index])
+
+    def encode(self, payloads: List[Dict]) -> List[WireMessage]:
+        """
+        Agrupa os registros em mensagens de até `batch_size` registros.
+
+        Grupos de um único registro usam o formato simples (sem envelope).
+        """
+        messages = []
+        for start in range(0, len(payloads), self.batch_size):
+            group = payloads[start:start + self.batch_size]
+            indices = list(range(start, start + len(group)))
+            if len(group) == 1:
+                messages.append(self.encode_one(group[0], start))
+            else:
+                messages.append(self._finish(self._serialize(group), self._content_type(True), indices))
+        return messages
+
+    def _finish(self, body: bytes, content_type: str, indices: List[int]) -> WireMessage:
+        if self.compression == 'gzip' and len(body) >= self.compress_min_bytes:
+            return WireMessage(gzip.compress(body), content_type, 'gzip', indices)
+        return WireMessage(body, content_type, None, indices)
+
@@ -2,14 +2,17 @@ package main
 
 import (
 	"bytes"
+	"context"
 	"encoding/json"
 	"fmt"
+	"io"
 	"log"
 	"net"
 	"net/http"
 	"os"
 	"os/signal"
 	"path/filepath"
+	"strconv"
 	"strings"
 	"syscall"
 	"time"
@@ -20,6 +23,9 @@ import (
 
 const (
 	queueName      = "weather"
+	// defaultPartitionExchange é a exchange (direct) das filas de partição,
+	// a mesma usada pelo collector (RABBITMQ_PARTITION_EXCHANGE)
+	defaultPartitionExchange = "weather.partitioned"
 	// maxRetries define o número máximo de tentativas para enviar mensagem ao backend.
 	// Escolhemos 3 tentativas como balanceamento entre:
 	// - Resiliência: permite recuperação de falhas temporárias (rede, timeout, 5xx)
@@ -32,6 +38,9 @@ const (
 	// - Reduzir carga em caso de problemas de rede transitórios
 	// - Evitar "thundering herd" quando múltiplos workers tentam simultaneamente
 	initialBackoff = 1 * time.Second
+	// maxResponseBytes limita a leitura das respostas do backend (a resposta de
+	// /weather/logs/batch traz o resultado de cada item)
+	maxResponseBytes = 1 << 20
 )
 
 // logStructured cria um log estruturado no formato JSON
@@ -93,6 +102,12 @@ var (
 	rabbitmqURL string
 	backendURL  string
 	httpClient  *http.Client
+
+	// partitionCount é o número de filas weather.0..N-1 (0 = fila única "weather")
+	partitionCount    int
+	partitionExchange string
+	// workerPartitions são as partições consumidas por esta instância
+	workerPartitions []int
 )
 
 func init() {
@@ -152,6 +167,18 @@ func init() {
 	backendURL = strings.TrimSuffix(backendURL, "/")
 	backendURL = backendURL + "/weather/logs"
 
+	// Partições (RABBITMQ_PARTITIONS deve ser igual ao do collector)
+	var err error
+	partitionCount, err = strconv.Atoi(getEnvDefault("RABBITMQ_PARTITIONS", "0"))
+	if err != nil || partitionCount < 0 {
+		log.Fatalf("[worker] Invalid RABBITMQ_PARTITIONS: %q", os.Getenv("RABBITMQ_PARTITIONS"))
+	}
+	partitionExchange = getEnvDefault("RABBITMQ_PARTITION_EXCHANGE", defaultPartitionExchange)
+	workerPartitions, err = parsePartitions(os.Getenv("WORKER_PARTITIONS"), partitionCount)
+	if err != nil {
+		log.Fatalf("[worker] Invalid WORKER_PARTITIONS: %v", err)
+	}
+
 	// HTTP client com timeout
 	httpClient = &http.Client{
 		Timeout: 10 * time.Second,
@@ -163,9 +190,147 @@ func init() {
 		"backend_url": backendURL,
 		"endpoint":    "/weather/logs",
 		"full_url":    backendURL,
+		"partitions":  partitionCount,
+		"consumes":    workerPartitions,
 	})
 }
 
+// getEnvDefault retorna a variável de ambiente ou o valor padrão se estiver vazia
+func getEnvDefault(key, fallback string) string {
+	if value := os.Getenv(key); value != "" {
+		return value
+	}
+	return fallback
+}
+
+// partitionQueue retorna o nome da fila (e routing key) da partição
+func partitionQueue(index int) string {
+	return fmt.Sprintf("%s.%d", queueName, index)
+}
+
+// parsePartitions interpreta WORKER_PARTITIONS ("0,2,4-7"); vazio = todas as
+// partições. Retorna nil sem particionamento (count = 0).
+func parsePartitions(spec string, count int) ([]int, error) {
+	if count <= 0 {
+		return nil, nil
+	}
+	spec = strings.TrimSpace(spec)
+	if spec == "" {
+		all := make([]int, count)
+		for i := range all {
+			all[i] = i
+		}
+		return all, nil
+	}
+
+	seen := make(map[int]bool)
+	var partitions []int
+	for _, part := range strings.Split(spec, ",") {
+		part = strings.TrimSpace(part)
+		first, last := part, part
+		if bounds := strings.SplitN(part, "-", 2); len(bounds) == 2 {
+			first, last = bounds[0], bounds[1]
+		}
+		start, err1 := strconv.Atoi(strings.TrimSpace(first))
+		end, err2 := strconv.Atoi(strings.TrimSpace(last))
+		if err1 != nil || err2 != nil || start > end {
+			return nil, fmt.Errorf("invalid partition range %q", part)
+		}
+		if start < 0 || end >= count {
+			return nil, fmt.Errorf("partition range %q outside 0-%d", part, count-1)
+		}
+		for i := start; i <= end; i++ {
+			if !seen[i] {
+				seen[i] = true
+				partitions = append(partitions, i)
+			}
+		}
+	}
+	return partitions, nil
+}
+
+// topologyChannel reúne as operações de canal usadas por declareTopology
+// (implementadas por *amqp.Channel)
+type topologyChannel interface {
+	ExchangeDeclare(name, kind string, durable, autoDelete, internal, noWait bool, args amqp.Table) error
+	QueueDeclare(name string, durable, autoDelete, exclusive, noWait bool, args amqp.Table) (amqp.Queue, error)
+	QueueBind(name, key, exchange string, noWait bool, args amqp.Table) error
+}
+
+// declareTopology declara as filas de leituras (idempotente, igual ao collector)
+// e retorna as filas que esta instância deve consumir. Sem partições, é a fila
+// durável "weather". Com partições, a exchange direct e as filas weather.N com
+// x-single-active-consumer: vários workers podem assinar a mesma partição, mas
+// só um a consome por vez (ordem por cidade preservada, com failover).
+func declareTopology(ch topologyChannel) ([]string, error) {
+	if partitionCount <= 0 {
+		if _, err := ch.QueueDeclare(queueName, true, false, false, false, nil); err != nil {
+			return nil, err
+		}
+		return []string{queueName}, nil
+	}
+
+	if err := ch.ExchangeDeclare(partitionExchange, "direct", true, false, false, false, nil); err != nil {
+		return nil, err
+	}
+	for i := 0; i < partitionCount; i++ {
+		queue := partitionQueue(i)
+		args := amqp.Table{"x-single-active-consumer": true}
+		if _, err := ch.QueueDeclare(queue, true, false, false, false, args); err != nil {
+			return nil, err
+		}
+		if err := ch.QueueBind(queue, queue, partitionExchange, false, nil); err != nil {
+			return nil, err
+		}
+	}
+
+	queues := make([]string, 0, len(workerPartitions))
+	for _, index := range workerPartitions {
+		queues = append(queues, partitionQueue(index))
+	}
+	return queues, nil
+}
+
+// startConsumer consome uma fila em um canal próprio, uma mensagem por vez,
+// processando-as em ordem em uma goroutine dedicada
+func startConsumer(conn *amqp.Connection, queue string) (*amqp.Channel, error) {
+	ch, err := conn.Channel()
+	if err != nil {
+		return nil, err
+	}
+
+	// Configurar QoS para processar uma mensagem por vez
+	if err := ch.Qos(
+		1,     // prefetch count
+		0,     // prefetch size
+		false, // global
+	); err != nil {
+		ch.Close()
+		return nil, err
+	}
+
+	msgs, err := ch.Consume(
+		queue, // queue
+		"",    // consumer
+		false, // auto-ack (false para ack manual)
+		false, // exclusive
+		false, // no-local
+		false, // no-wait
+		nil,   // args
+	)
+	if err != nil {
+		ch.Close()
+		return nil, err
+	}
+
+	go func() {
+		for d := range msgs {
+			processMessage(ch, queue, d)
+		}
+	}()
+	return ch, nil
+}
+
 // isRunningLocally verifica se está rodando fora do Docker
 func isRunningLocally() bool {
 	// Verificar se o hostname "rabbitmq" pode ser resolvido
@@ -305,62 +470,34 @@ func main() {
 	}
 	defer ch.Close()
 
-	// Declarar fila (durable para persistência)
-	_, err = ch.QueueDeclare(
-		queueName, // name
-		true,      // durable
-		false,     // delete when unused
-		false,     // exclusive
-		false,     // no-wait
-		nil,       // arguments
-	)
+	// Declarar fila(s) (durable para persistência)
+	queues, err := declareTopology(ch)
 	if err != nil {
 		log.Fatalf("[worker] Failed to declare queue: %v", err)
 	}
-	logInfo(fmt.Sprintf("Queue '%s' declared", queueName), map[string]interface{}{
-		"operation": "declare_queue",
-		"queue_name": queueName,
+	logInfo(fmt.Sprintf("Queues declared: %s", strings.Join(queues, ", ")), map[string]interface{}{
+		"operation":  "declare_queue",
+		"queues":     queues,
+		"partitions": partitionCount,
 	})
 
-	// Configurar QoS para processar uma mensagem por vez
-	err = ch.Qos(
-		1,     // prefetch count
-		0,     // prefetch size
-		false, // global
-	)
-	if err != nil {
-		log.Fatalf("[worker] Failed to set QoS: %v", err)
-	}
-
-	// Consumir mensagens
-	msgs, err := ch.Consume(
-		queueName, // queue
-		"",        // consumer
-		false,     // auto-ack (false para ack manual)
-		false,     // exclusive
-		false,     // no-local
-		false,     // no-wait
-		nil,       // args
-	)
-	if err != nil {
-		log.Fatalf("[worker] Failed to register consumer: %v", err)
+	// Consumir mensagens: um canal e uma goroutine por fila (ordem mantida em cada fila)
+	for _, queue := range queues {
+		consumerCh, err := startConsumer(conn, queue)
+		if err != nil {
+			log.Fatalf("[worker] Failed to register consumer for %s: %v", queue, err)
+		}
+		defer consumerCh.Close()
 	}
 	logInfo("Waiting for messages", map[string]interface{}{
 		"operation": "consume_start",
-		"queue_name": queueName,
+		"queues":    queues,
 	})
 
 	// Graceful shutdown
 	sigChan := make(chan os.Signal, 1)
 	signal.Notify(sigChan, os.Interrupt, syscall.SIGTERM)
 
-	// Processar mensagens
-	go func() {
-		for d := range msgs {
-			processMessage(ch, d)
-		}
-	}()
-
 	// Aguardar sinal de shutdown
 	<-sigChan
 	logInfo("Shutting down gracefully", map[string]interface{}{
@@ -368,26 +505,51 @@ func main() {
 	})
 }
 
-// processMessage processa uma mensagem do RabbitMQ
-func processMessage(ch *amqp.Channel, d amqp.Delivery) {
+// processMessage processa uma mensagem do RabbitMQ recebida da fila queue
+func processMessage(ch *amqp.Channel, queue string, d amqp.Delivery) {
 	logInfo("Received message", map[string]interface{}{
 		"operation": "process_message",
 		"message_size": len(d.Body),
 		"delivery_tag": d.DeliveryTag,
+		"content_type": d.ContentType,
+		"content_encoding": d.ContentEncoding,
 	})
 
-	// Validar JSON mínimo
-	if !isValidJSON(d.Body) {
-		logError("Invalid JSON format, rejecting message", nil, map[string]interface{}{
-			"operation": "validate_json",
-		})
-		d.Nack(false, false) // não requeue mensagens inválidas
-		return
+	var success bool
+	if isPlainJSON(d.ContentType, d.ContentEncoding) {
+		// Formato original: um registro JSON, repassado sem re-serializar
+		if !isValidJSON(d.Body) {
+			logError("Invalid JSON format, rejecting message", nil, map[string]interface{}{
+				"operation": "validate_json",
+			})
+			d.Nack(false, false) // não requeue mensagens inválidas
+			return
+		}
+		success = postToBackendWithRetry(d.Body)
+	} else {
+		readings, ok := decodeValidReadings(d)
+		if !ok {
+			d.Nack(false, false) // não requeue mensagens inválidas
+			return
+		}
+		if isBatchContentType(d.ContentType) {
+			republish := func(pending []map[string]interface{}) error {
+				return republishReadings(ch, queue, pending)
+			}
+			success = !processBatch(readings, republish).requeue
+		} else {
+			body, err := json.Marshal(readings[0])
+			if err != nil {
+				logError("Failed to encode reading as JSON", err, map[string]interface{}{
+					"operation": "decode_message",
+				})
+				d.Nack(false, false)
+				return
+			}
+			success = postWithRetry(backendURL, body)
+		}
 	}
 
-	// Tentar postar para o backend com retry
-	success := postToBackendWithRetry(d.Body)
-
 	if success {
 		// Ack se sucesso
 		err := d.Ack(false)
@@ -416,6 +578,192 @@ func processMessage(ch *amqp.Channel, d amqp.Delivery) {
 	}
 }
 
+// decodeValidReadings decodifica uma mensagem MessagePack, comprimida ou em
+// lote e retorna os registros com os campos obrigatórios. Registros inválidos
+// de um lote são descartados (com as posições no log); retorna ok=false se
+// nada puder ser enviado.
+func decodeValidReadings(d amqp.Delivery) ([]map[string]interface{}, bool) {
+	readings, err := decodeReadings(d.Body, d.ContentType, d.ContentEncoding)
+	if err != nil {
+		logError("Failed to decode message, rejecting", err, map[string]interface{}{
+			"operation":        "decode_message",
+			"content_type":     d.ContentType,
+			"content_encoding": d.ContentEncoding,
+		})
+		return nil, false
+	}
+
+	valid := make([]map[string]interface{}, 0, len(readings))
+	var invalid []int
+	for index, reading := range readings {
+		if hasRequiredFields(reading) {
+			valid = append(valid, reading)
+		} else {
+			invalid = append(invalid, index)
+		}
+	}
+	if len(invalid) > 0 {
+		logWarn("Dropping invalid readings from message", map[string]interface{}{
+			"operation": "validate_json",
+			"invalid":   len(invalid),
+			"total":     len(readings),
+			"indices":   invalid,
+		})
+	}
+	return valid, len(valid) > 0
+}
+
+// batchItemResult é o resultado de um item na resposta de /weather/logs/batch
+type batchItemResult struct {
+	Index   int    `json:"index"`
+	Success bool   `json:"success"`
+	Error   string `json:"error"`
+}
+
+// batchOutcome resume o processamento de um lote
+type batchOutcome struct {
+	inserted    int  // registros gravados pelo backend
+	rejected    int  // registros recusados pelo backend (erro permanente, descartados)
+	republished int  // registros republicados na fila após erro temporário
+	requeue     bool // devolver a mensagem inteira à fila
+}
+
+// processBatch envia um lote para /weather/logs/batch e trata o resultado de
+// cada item:
+//   - 2xx: os itens com success=false em results (erros de gravação) são
+//     registrados no log, com as contagens, e descartados
+//   - 4xx: o backend recusou o lote inteiro (ex.: um item reprovado na validação
+//     do DTO); os registros são enviados individualmente para /weather/logs, os
+//     recusados são descartados e os que falharem por erro temporário são
+//     republicados (republish) na fila de origem
+//   - erro temporário: a mensagem inteira volta para a fila (requeue)
+func processBatch(readings []map[string]interface{}, republish func([]map[string]interface{}) error) batchOutcome {
+	body, err := json.Marshal(readings)
+	if err != nil {
+		logError("Failed to encode readings as JSON", err, map[string]interface{}{
+			"operation": "decode_message",
+		})
+		return batchOutcome{rejected: len(readings)}
+	}
+
+	success, status, response := postWithRetryResponse(backendURL+"/batch", body)
+	if success {
+		failed := failedBatchItems(response, len(readings))
+		for _, item := range failed {
+			logWarn("Backend rejected reading from batch", map[string]interface{}{
+				"operation": "post_batch",
+				"index":     item.Index,
+				"city":      readings[item.Index]["city"],
+				"error":     item.Error,
+			})
+		}
+		outcome := batchOutcome{inserted: len(readings) - len(failed), rejected: len(failed)}
+		logBatchOutcome(outcome, len(readings))
+		return outcome
+	}
+	if status < 400 || status >= 500 {
+		return batchOutcome{requeue: true}
+	}
+
+	logWarn("Batch rejected by backend, posting readings individually", map[string]interface{}{
+		"operation":   "post_batch",
+		"status_code": status,
+		"total":       len(readings),
+	})
+	var outcome batchOutcome
+	var pending []map[string]interface{}
+	for index, reading := range readings {
+		single, err := json.Marshal(reading)
+		if err != nil {
+			outcome.rejected++
+			continue
+		}
+		ok, status, _ := postWithRetryResponse(backendURL, single)
+		switch {
+		case ok:
+			outcome.inserted++
+		case status >= 400 && status < 500:
+			outcome.rejected++
+			logWarn("Backend rejected reading", map[string]interface{}{
+				"operation":   "post_batch",
+				"index":       index,
+				"city":        reading["city"],
+				"status_code": status,
+			})
+		default:
+			pending = append(pending, reading)
+		}
+	}
+	if len(pending) > 0 {
+		if err := republish(pending); err != nil {
+			// Sem republicar, a mensagem inteira volta para a fila (itens já gravados podem se repetir)
+			logError("Failed to republish pending readings, requeueing message", err, map[string]interface{}{
+				"operation": "republish",
+				"pending":   len(pending),
+			})
+			return batchOutcome{requeue: true}
+		}
+		outcome.republished = len(pending)
+	}
+	logBatchOutcome(outcome, len(readings))
+	return outcome
+}
+
+// failedBatchItems extrai da resposta de /weather/logs/batch os itens não
+// gravados (índices fora do lote são ignorados). Uma resposta ilegível é
+// tratada como lote aceito por inteiro, como no collector.
+func failedBatchItems(response []byte, total int) []batchItemResult {
+	var parsed struct {
+		Results []batchItemResult `json:"results"`
+	}
+	if err := json.Unmarshal(response, &parsed); err != nil {
+		logWarn("Could not parse batch response, assuming all readings were stored", map[string]interface{}{
+			"operation": "post_batch",
+			"error":     err.Error(),
+		})
+		return nil
+	}
+	var failed []batchItemResult
+	for _, item := range parsed.Results {
+		if !item.Success && item.Index >= 0 && item.Index < total {
+			failed = append(failed, item)
+		}
+	}
+	return failed
+}
+
+// logBatchOutcome registra as contagens do processamento de um lote
+func logBatchOutcome(outcome batchOutcome, total int) {
+	fields := map[string]interface{}{
+		"operation":   "post_batch",
+		"total":       total,
+		"inserted":    outcome.inserted,
+		"rejected":    outcome.rejected,
+		"republished": outcome.republished,
+	}
+	if outcome.rejected > 0 || outcome.republished > 0 {
+		logWarn("Batch processed with failures", fields)
+	} else {
+		logInfo("Batch processed", fields)
+	}
+}
+
+// republishReadings publica registros como um novo lote JSON na fila de origem
+// (exchange padrão, routing key = nome da fila)
+func republishReadings(ch *amqp.Channel, queue string, readings []map[string]interface{}) error {
+	body, err := json.Marshal(readings)
+	if err != nil {
+		return err
+	}
+	ctx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
+	defer cancel()
+	return ch.PublishWithContext(ctx, "", queue, false, false, amqp.Publishing{
+		ContentType:  contentTypeJSONBatch,
+		DeliveryMode: amqp.Persistent,
+		Body:         body,
+	})
+}
+
 // isValidJSON valida se o JSON tem estrutura mínima esperada
 func isValidJSON(data []byte) bool {
 	var payload map[string]interface{}
@@ -425,7 +773,11 @@ func isValidJSON(data []byte) bool {
 		})
 		return false
 	}
+	return hasRequiredFields(payload)
+}
 
+// hasRequiredFields verifica os campos mínimos de um registro
+func hasRequiredFields(payload map[string]interface{}) bool {
 	// Validar campos mínimos esperados (timestamp, temperature, humidity)
 	hasTimestamp := false
 	hasTemperature := false
@@ -469,7 +821,21 @@ func isValidJSON(data []byte) bool {
 // - Backoff exponencial (1s, 2s, 4s) reduz carga no backend durante problemas transitórios
 // - Após maxRetries, a mensagem é rejeitada (Nack com requeue) para processamento posterior
 func postToBackendWithRetry(body []byte) bool {
+	return postWithRetry(backendURL, body)
+}
+
+// postWithRetry aplica a estratégia de retry de postToBackendWithRetry a uma URL específica
+func postWithRetry(url string, body []byte) bool {
+	success, _, _ := postWithRetryResponse(url, body)
+	return success
+}
+
+// postWithRetryResponse é postWithRetry retornando também o status e o corpo
+// da última resposta (status 0 se nenhuma resposta foi recebida)
+func postWithRetryResponse(url string, body []byte) (bool, int, []byte) {
 	backoff := initialBackoff
+	status := 0
+	var response []byte
 
 	for attempt := 1; attempt <= maxRetries; attempt++ {
 		logInfo("Attempting POST to backend", map[string]interface{}{
@@ -478,13 +844,14 @@ func postToBackendWithRetry(body []byte) bool {
 			"max_retries": maxRetries,
 		})
 
-		success, isTemporary := postToBackend(body)
+		success, isTemporary, respStatus, respBody := postToURLResponse(url, body)
+		status, response = respStatus, respBody
 		if success {
 			logInfo("POST successful", map[string]interface{}{
 				"operation": "post_backend",
 				"attempt":   attempt,
 			})
-			return true
+			return true, status, response
 		}
 
 		// Se não é erro temporário, não tentar novamente
@@ -493,7 +860,7 @@ func postToBackendWithRetry(body []byte) bool {
 				"operation": "post_backend",
 				"attempt":   attempt,
 			})
-			return false
+			return false, status, response
 		}
 
 		// Se não é a última tentativa, aguardar antes de retry
@@ -512,11 +879,23 @@ func postToBackendWithRetry(body []byte) bool {
 		"operation": "post_backend",
 		"max_retries": maxRetries,
 	})
-	return false
+	return false, status, response
 }
 
 // postToBackend faz POST para o backend e retorna (success, isTemporaryError)
 func postToBackend(body []byte) (bool, bool) {
+	return postToURL(backendURL, body)
+}
+
+// postToURL faz POST de um corpo JSON e retorna (success, isTemporaryError)
+func postToURL(backendURL string, body []byte) (bool, bool) {
+	success, isTemporary, _, _ := postToURLResponse(backendURL, body)
+	return success, isTemporary
+}
+
+// postToURLResponse é postToURL retornando também o status HTTP (0 sem
+// resposta) e o corpo da resposta (até maxResponseBytes)
+func postToURLResponse(backendURL string, body []byte) (bool, bool, int, []byte) {
 	// Criar request com bytes.NewReader
 	req, err := http.NewRequest("POST", backendURL, bytes.NewReader(body))
 	if err != nil {
@@ -524,7 +903,7 @@ func postToBackend(body []byte) (bool, bool) {
 			"operation": "post_backend",
 			"url":       backendURL,
 		})
-		return false, false // erro não temporário
+		return false, false, 0, nil // erro não temporário
 	}
 
 	req.Header.Set("Content-Type", "application/json")
@@ -543,14 +922,16 @@ func postToBackend(body []byte) (bool, bool) {
 			"operation": "post_backend",
 			"url":       backendURL,
 		})
-		return false, true // erro temporário (rede, timeout, etc)
+		return false, true, 0, nil // erro temporário (rede, timeout, etc)
 	}
 	defer resp.Body.Close()
 
-	// Ler resposta para incluir no log de erro
-	responseBody := make([]byte, 512) // Ler apenas primeiros 512 bytes
-	n, _ := resp.Body.Read(responseBody)
-	responsePreview := string(responseBody[:n])
+	// Ler resposta (o log de erro inclui apenas os primeiros 512 bytes)
+	responseBody, _ := io.ReadAll(io.LimitReader(resp.Body, maxResponseBytes))
+	responsePreview := string(responseBody)
+	if len(responsePreview) > 512 {
+		responsePreview = responsePreview[:512]
+	}
 
 	// Verificar status code
 	if resp.StatusCode >= 200 && resp.StatusCode < 300 {
@@ -559,7 +940,7 @@ func postToBackend(body []byte) (bool, bool) {
 			"status_code": resp.StatusCode,
 			"url":        backendURL,
 		})
-		return true, false
+		return true, false, resp.StatusCode, responseBody
 	}
 
 	// Status 4xx são erros não temporários (bad request, etc)
@@ -581,7 +962,7 @@ func postToBackend(body []byte) (bool, bool) {
 				"hint":          "Check if BACKEND_URL is correct and endpoint exists",
 			})
 		}
-		return false, false
+		return false, false, resp.StatusCode, responseBody
 	}
 
 	// Status 5xx são erros temporários (server error)
@@ -592,7 +973,7 @@ func postToBackend(body []byte) (bool, bool) {
 			"url":           backendURL,
 			"response_body": responsePreview,
 		})
-		return false, true
+		return false, true, resp.StatusCode, responseBody
 	}
 
 	// Outros status codes
@@ -601,5 +982,5 @@ func postToBackend(body []byte) (bool, bool) {
 		"status_code": resp.StatusCode,
 		"url":         backendURL,
 	})
-	return false, true // tratar como temporário por padrão
+	return false, true, resp.StatusCode, responseBody // tratar como temporário por padrão
 }
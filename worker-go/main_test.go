@@ -1,8 +1,16 @@
 package main
 
 import (
+	"encoding/json"
+	"fmt"
+	"io"
+	"net/http"
+	"net/http/httptest"
+	"reflect"
 	"testing"
 	"time"
+
+	amqp "github.com/rabbitmq/amqp091-go"
 )
 
 // TestRetryLogic testa a lógica de retry com backoff exponencial
@@ -56,3 +64,167 @@ func TestExponentialBackoff(t *testing.T) {
 	}
 }
 
+// TestParsePartitions testa a interpretação de WORKER_PARTITIONS
+func TestParsePartitions(t *testing.T) {
+	all, err := parsePartitions("", 4)
+	if err != nil || !reflect.DeepEqual(all, []int{0, 1, 2, 3}) {
+		t.Errorf("Partições padrão incorretas: %v (%v)", all, err)
+	}
+
+	some, err := parsePartitions("5, 0-2,1", 8)
+	if err != nil || !reflect.DeepEqual(some, []int{5, 0, 1, 2}) {
+		t.Errorf("Partições incorretas: %v (%v)", some, err)
+	}
+
+	none, err := parsePartitions("0-3", 0)
+	if err != nil || none != nil {
+		t.Errorf("Sem particionamento não deveria haver partições: %v (%v)", none, err)
+	}
+
+	for _, spec := range []string{"4", "2-1", "a", "-1"} {
+		if _, err := parsePartitions(spec, 4); err == nil {
+			t.Errorf("Esperado erro para %q", spec)
+		}
+	}
+
+	if partitionQueue(3) != "weather.3" {
+		t.Errorf("Nome da fila de partição incorreto: %s", partitionQueue(3))
+	}
+}
+
+// fakeTopologyChannel registra as declarações feitas por declareTopology
+type fakeTopologyChannel struct {
+	calls []string
+}
+
+func (f *fakeTopologyChannel) ExchangeDeclare(name, kind string, durable, autoDelete, internal, noWait bool, args amqp.Table) error {
+	f.calls = append(f.calls, fmt.Sprintf("exchange %s %s durable=%v", name, kind, durable))
+	return nil
+}
+
+func (f *fakeTopologyChannel) QueueDeclare(name string, durable, autoDelete, exclusive, noWait bool, args amqp.Table) (amqp.Queue, error) {
+	f.calls = append(f.calls, fmt.Sprintf("queue %s durable=%v sac=%v", name, durable, args["x-single-active-consumer"]))
+	return amqp.Queue{Name: name}, nil
+}
+
+func (f *fakeTopologyChannel) QueueBind(name, key, exchange string, noWait bool, args amqp.Table) error {
+	f.calls = append(f.calls, fmt.Sprintf("bind %s %s %s", name, key, exchange))
+	return nil
+}
+
+// TestDeclareTopology testa a topologia declarada com e sem partições
+func TestDeclareTopology(t *testing.T) {
+	savedCount, savedExchange, savedPartitions := partitionCount, partitionExchange, workerPartitions
+	defer func() {
+		partitionCount, partitionExchange, workerPartitions = savedCount, savedExchange, savedPartitions
+	}()
+
+	partitionCount, workerPartitions = 0, nil
+	single := &fakeTopologyChannel{}
+	queues, err := declareTopology(single)
+	if err != nil || !reflect.DeepEqual(queues, []string{"weather"}) {
+		t.Errorf("Filas sem particionamento incorretas: %v (%v)", queues, err)
+	}
+	if !reflect.DeepEqual(single.calls, []string{"queue weather durable=true sac=<nil>"}) {
+		t.Errorf("Declarações sem particionamento incorretas: %v", single.calls)
+	}
+
+	partitionCount, partitionExchange, workerPartitions = 2, defaultPartitionExchange, []int{1}
+	partitioned := &fakeTopologyChannel{}
+	queues, err = declareTopology(partitioned)
+	if err != nil || !reflect.DeepEqual(queues, []string{"weather.1"}) {
+		t.Errorf("Filas consumidas incorretas: %v (%v)", queues, err)
+	}
+	expected := []string{
+		"exchange weather.partitioned direct durable=true",
+		"queue weather.0 durable=true sac=true",
+		"bind weather.0 weather.0 weather.partitioned",
+		"queue weather.1 durable=true sac=true",
+		"bind weather.1 weather.1 weather.partitioned",
+	}
+	if !reflect.DeepEqual(partitioned.calls, expected) {
+		t.Errorf("Declarações particionadas incorretas: %v", partitioned.calls)
+	}
+}
+
+// withBackend aponta backendURL para um servidor de teste durante o teste
+func withBackend(t *testing.T, handler http.HandlerFunc) {
+	server := httptest.NewServer(handler)
+	previous := backendURL
+	backendURL = server.URL + "/weather/logs"
+	t.Cleanup(func() {
+		backendURL = previous
+		server.Close()
+	})
+}
+
+func batchReadings(cities ...string) []map[string]interface{} {
+	readings := make([]map[string]interface{}, 0, len(cities))
+	for _, city := range cities {
+		readings = append(readings, map[string]interface{}{
+			"timestamp":   "2025-01-24T10:00:00Z",
+			"temperature": 25.5,
+			"humidity":    70.0,
+			"city":        city,
+		})
+	}
+	return readings
+}
+
+// TestProcessBatchPartialFailure testa um lote aceito com itens recusados em results
+func TestProcessBatchPartialFailure(t *testing.T) {
+	withBackend(t, func(w http.ResponseWriter, r *http.Request) {
+		if r.URL.Path != "/weather/logs/batch" {
+			t.Errorf("Caminho inesperado: %s", r.URL.Path)
+		}
+		w.WriteHeader(http.StatusCreated)
+		fmt.Fprint(w, `{"inserted":2,"failed":1,"results":[`+
+			`{"index":0,"success":true},{"index":1,"success":false,"error":"duplicado"},{"index":2,"success":true}]}`)
+	})
+
+	republished := 0
+	outcome := processBatch(batchReadings("Recife", "Natal", "Manaus"), func(pending []map[string]interface{}) error {
+		republished += len(pending)
+		return nil
+	})
+	if outcome != (batchOutcome{inserted: 2, rejected: 1}) || republished != 0 {
+		t.Errorf("Resultado incorreto: %+v (republicados %d)", outcome, republished)
+	}
+}
+
+// TestProcessBatchFallsBackToSinglePosts testa o envio individual após o backend recusar o lote inteiro
+func TestProcessBatchFallsBackToSinglePosts(t *testing.T) {
+	withBackend(t, func(w http.ResponseWriter, r *http.Request) {
+		if r.URL.Path == "/weather/logs/batch" {
+			w.WriteHeader(http.StatusBadRequest)
+			return
+		}
+		var reading map[string]interface{}
+		body, _ := io.ReadAll(r.Body)
+		if err := json.Unmarshal(body, &reading); err != nil || reading["city"] == "Natal" {
+			w.WriteHeader(http.StatusBadRequest)
+			return
+		}
+		w.WriteHeader(http.StatusCreated)
+	})
+
+	outcome := processBatch(batchReadings("Recife", "Natal", "Manaus"), func(pending []map[string]interface{}) error {
+		t.Errorf("Nada deveria ser republicado: %v", pending)
+		return nil
+	})
+	if outcome != (batchOutcome{inserted: 2, rejected: 1}) {
+		t.Errorf("Resultado incorreto: %+v", outcome)
+	}
+}
+
+// TestFailedBatchItems testa a leitura dos itens não gravados na resposta do lote
+func TestFailedBatchItems(t *testing.T) {
+	response := []byte(`{"results":[{"index":0,"success":false,"error":"x"},{"index":7,"success":false},{"index":1,"success":true}]}`)
+	failed := failedBatchItems(response, 2)
+	if !reflect.DeepEqual(failed, []batchItemResult{{Index: 0, Error: "x"}}) {
+		t.Errorf("Itens com falha incorretos: %+v", failed)
+	}
+	if failedBatchItems([]byte("ok"), 2) != nil {
+		t.Error("Resposta ilegível deveria ser tratada como lote aceito")
+	}
+}
@@ -0,0 +1,245 @@
+package main
+
+import (
+	"bytes"
+	"compress/gzip"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"math"
+	"strings"
+)
+
+// Formatos de mensagem publicados pelo collector, declarados em content_type.
+// Mensagens sem content_type são tratadas como JSON (formato original).
+const (
+	contentTypeJSON         = "application/json"
+	contentTypeMsgpack      = "application/msgpack"
+	contentTypeJSONBatch    = "application/vnd.gdash.weather-batch+json"
+	contentTypeMsgpackBatch = "application/vnd.gdash.weather-batch+msgpack"
+)
+
+// isBatchContentType indica se a mensagem é um envelope com vários registros
+func isBatchContentType(contentType string) bool {
+	ct := mediaType(contentType)
+	return ct == contentTypeJSONBatch || ct == contentTypeMsgpackBatch
+}
+
+// isPlainJSON indica se a mensagem está no formato original (um registro JSON sem compressão)
+func isPlainJSON(contentType, contentEncoding string) bool {
+	ct := mediaType(contentType)
+	return (ct == "" || ct == contentTypeJSON) && (contentEncoding == "" || contentEncoding == "identity")
+}
+
+func mediaType(contentType string) string {
+	ct, _, _ := strings.Cut(contentType, ";")
+	return strings.ToLower(strings.TrimSpace(ct))
+}
+
+// decodeReadings decodifica o corpo de uma mensagem em uma lista de registros,
+// de acordo com content_type (JSON/MessagePack, registro único ou lote) e
+// content_encoding (gzip ou sem compressão).
+func decodeReadings(body []byte, contentType, contentEncoding string) ([]map[string]interface{}, error) {
+	switch strings.ToLower(contentEncoding) {
+	case "", "identity":
+	case "gzip":
+		reader, err := gzip.NewReader(bytes.NewReader(body))
+		if err != nil {
+			return nil, fmt.Errorf("gzip inválido: %w", err)
+		}
+		defer reader.Close()
+		if body, err = io.ReadAll(reader); err != nil {
+			return nil, fmt.Errorf("gzip inválido: %w", err)
+		}
+	default:
+		return nil, fmt.Errorf("content_encoding não suportado: %s", contentEncoding)
+	}
+
+	var value interface{}
+	switch mediaType(contentType) {
+	case "", contentTypeJSON, contentTypeJSONBatch:
+		if err := json.Unmarshal(body, &value); err != nil {
+			return nil, err
+		}
+	case contentTypeMsgpack, contentTypeMsgpackBatch:
+		decoder := &msgpackDecoder{data: body}
+		decoded, err := decoder.decode()
+		if err != nil {
+			return nil, err
+		}
+		if decoder.pos != len(body) {
+			return nil, errors.New("msgpack: bytes extras após o valor")
+		}
+		value = decoded
+	default:
+		return nil, fmt.Errorf("content_type não suportado: %s", contentType)
+	}
+
+	if isBatchContentType(contentType) {
+		items, ok := value.([]interface{})
+		if !ok {
+			return nil, errors.New("lote deve ser um array de registros")
+		}
+		readings := make([]map[string]interface{}, 0, len(items))
+		for _, item := range items {
+			reading, ok := item.(map[string]interface{})
+			if !ok {
+				return nil, errors.New("registro do lote deve ser um objeto")
+			}
+			readings = append(readings, reading)
+		}
+		return readings, nil
+	}
+
+	reading, ok := value.(map[string]interface{})
+	if !ok {
+		return nil, errors.New("registro deve ser um objeto")
+	}
+	return []map[string]interface{}{reading}, nil
+}
+
+// msgpackDecoder decodifica o subconjunto de MessagePack usado nos registros
+// (nil, bool, inteiros, floats, strings, binários, arrays e mapas com chaves
+// string). Números viram float64, como no encoding/json.
+type msgpackDecoder struct {
+	data []byte
+	pos  int
+}
+
+var errMsgpackShort = errors.New("msgpack: dados truncados")
+
+func (d *msgpackDecoder) read(n int) ([]byte, error) {
+	if n < 0 || d.pos+n > len(d.data) {
+		return nil, errMsgpackShort
+	}
+	b := d.data[d.pos : d.pos+n]
+	d.pos += n
+	return b, nil
+}
+
+func (d *msgpackDecoder) readUint(n int) (uint64, error) {
+	b, err := d.read(n)
+	if err != nil {
+		return 0, err
+	}
+	switch n {
+	case 1:
+		return uint64(b[0]), nil
+	case 2:
+		return uint64(binary.BigEndian.Uint16(b)), nil
+	case 4:
+		return uint64(binary.BigEndian.Uint32(b)), nil
+	default:
+		return binary.BigEndian.Uint64(b), nil
+	}
+}
+
+func (d *msgpackDecoder) decode() (interface{}, error) {
+	b, err := d.read(1)
+	if err != nil {
+		return nil, err
+	}
+	tag := b[0]
+
+	switch {
+	case tag <= 0x7f:
+		return float64(tag), nil
+	case tag >= 0xe0:
+		return float64(int8(tag)), nil
+	case tag&0xe0 == 0xa0:
+		return d.str(int(tag & 0x1f))
+	case tag&0xf0 == 0x90:
+		return d.array(int(tag & 0x0f))
+	case tag&0xf0 == 0x80:
+		return d.mapping(int(tag & 0x0f))
+	}
+
+	switch tag {
+	case 0xc0:
+		return nil, nil
+	case 0xc2:
+		return false, nil
+	case 0xc3:
+		return true, nil
+	case 0xca:
+		v, err := d.readUint(4)
+		return float64(math.Float32frombits(uint32(v))), err
+	case 0xcb:
+		v, err := d.readUint(8)
+		return math.Float64frombits(v), err
+	case 0xcc, 0xcd, 0xce, 0xcf:
+		v, err := d.readUint(1 << (tag - 0xcc))
+		return float64(v), err
+	case 0xd0, 0xd1, 0xd2, 0xd3:
+		size := 1 << (tag - 0xd0)
+		v, err := d.readUint(size)
+		shift := uint(64 - 8*size)
+		return float64(int64(v<<shift) >> shift), err
+	case 0xd9, 0xda, 0xdb, 0xc4, 0xc5, 0xc6:
+		sizes := map[byte]int{0xd9: 1, 0xda: 2, 0xdb: 4, 0xc4: 1, 0xc5: 2, 0xc6: 4}
+		n, err := d.readUint(sizes[tag])
+		if err != nil {
+			return nil, err
+		}
+		return d.str(int(n))
+	case 0xdc, 0xdd:
+		n, err := d.readUint(2 << (tag - 0xdc))
+		if err != nil {
+			return nil, err
+		}
+		return d.array(int(n))
+	case 0xde, 0xdf:
+		n, err := d.readUint(2 << (tag - 0xde))
+		if err != nil {
+			return nil, err
+		}
+		return d.mapping(int(n))
+	}
+	return nil, fmt.Errorf("msgpack: tipo 0x%02x não suportado", tag)
+}
+
+func (d *msgpackDecoder) str(n int) (interface{}, error) {
+	b, err := d.read(n)
+	if err != nil {
+		return nil, err
+	}
+	return string(b), nil
+}
+
+func (d *msgpackDecoder) array(n int) (interface{}, error) {
+	if n > len(d.data)-d.pos {
+		return nil, errMsgpackShort
+	}
+	items := make([]interface{}, 0, n)
+	for i := 0; i < n; i++ {
+		item, err := d.decode()
+		if err != nil {
+			return nil, err
+		}
+		items = append(items, item)
+	}
+	return items, nil
+}
+
+func (d *msgpackDecoder) mapping(n int) (interface{}, error) {
+	if n > len(d.data)-d.pos {
+		return nil, errMsgpackShort
+	}
+	result := make(map[string]interface{}, n)
+	for i := 0; i < n; i++ {
+		key, err := d.decode()
+		if err != nil {
+			return nil, err
+		}
+		name, ok := key.(string)
+		if !ok {
+			return nil, errors.New("msgpack: chave de mapa deve ser string")
+		}
+		if result[name], err = d.decode(); err != nil {
+			return nil, err
+		}
+	}
+	return result, nil
+}
@@ -0,0 +1,100 @@
+package main
+
+import (
+	"bytes"
+	"compress/gzip"
+	"encoding/hex"
+	"testing"
+)
+
+// Corpos gerados pelo collector (wire_format.msgpack_dumps)
+const (
+	msgpackReading = "84a974696d657374616d70b4323032352d30312d32345431303a30303a30305aab74656d7065726174757265cb4039800000000000a868756d6964697479cb4051800000000000a463697479a6526563696665"
+	msgpackBatch   = "9284a974696d657374616d70b4323032352d30312d32345431303a30303a30305aab74656d7065726174757265cb4039800000000000a868756d6964697479cb4051800000000000a463697479a652656369666584a974696d657374616d70b4323032352d30312d32345431303a30303a30305aab74656d7065726174757265cbc008000000000000a868756d6964697479cb4051800000000000a463697479aa53c3a36f205061756c6f"
+)
+
+func mustHex(t *testing.T, s string) []byte {
+	t.Helper()
+	b, err := hex.DecodeString(s)
+	if err != nil {
+		t.Fatal(err)
+	}
+	return b
+}
+
+func gzipBytes(t *testing.T, data []byte) []byte {
+	t.Helper()
+	var buf bytes.Buffer
+	w := gzip.NewWriter(&buf)
+	if _, err := w.Write(data); err != nil {
+		t.Fatal(err)
+	}
+	w.Close()
+	return buf.Bytes()
+}
+
+// TestDecodeReadingsJSON testa o formato original e mensagens sem content_type
+func TestDecodeReadingsJSON(t *testing.T) {
+	body := []byte(`{"timestamp":"2025-01-24T10:00:00Z","temperature":25.5,"humidity":70,"city":"Recife"}`)
+	for _, contentType := range []string{"", "application/json", "application/json; charset=utf-8"} {
+		readings, err := decodeReadings(body, contentType, "")
+		if err != nil || len(readings) != 1 || readings[0]["city"] != "Recife" {
+			t.Errorf("content_type %q: readings=%v err=%v", contentType, readings, err)
+		}
+	}
+	if !isPlainJSON("", "") || isPlainJSON(contentTypeJSON, "gzip") || isPlainJSON(contentTypeMsgpack, "") {
+		t.Error("isPlainJSON incorreto")
+	}
+}
+
+// TestDecodeReadingsGzipBatch testa o envelope JSON comprimido com vários registros
+func TestDecodeReadingsGzipBatch(t *testing.T) {
+	body := gzipBytes(t, []byte(`[{"city":"A","temperature":1},{"city":"B","temperature":2}]`))
+	readings, err := decodeReadings(body, contentTypeJSONBatch, "gzip")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(readings) != 2 || readings[1]["city"] != "B" || readings[1]["temperature"] != 2.0 {
+		t.Errorf("lote decodificado incorretamente: %v", readings)
+	}
+}
+
+// TestDecodeReadingsMsgpack testa registro único e lote em MessagePack
+func TestDecodeReadingsMsgpack(t *testing.T) {
+	readings, err := decodeReadings(mustHex(t, msgpackReading), contentTypeMsgpack, "")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if !hasRequiredFields(readings[0]) || readings[0]["temperature"] != 25.5 {
+		t.Errorf("registro msgpack incorreto: %v", readings[0])
+	}
+
+	readings, err = decodeReadings(gzipBytes(t, mustHex(t, msgpackBatch)), contentTypeMsgpackBatch, "gzip")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(readings) != 2 || readings[1]["city"] != "São Paulo" || readings[1]["temperature"] != -3.0 {
+		t.Errorf("lote msgpack incorreto: %v", readings)
+	}
+}
+
+// TestDecodeReadingsRejectsInvalid testa a rejeição de mensagens malformadas
+func TestDecodeReadingsRejectsInvalid(t *testing.T) {
+	cases := []struct {
+		body            []byte
+		contentType     string
+		contentEncoding string
+	}{
+		{mustHex(t, msgpackReading)[:20], contentTypeMsgpack, ""},
+		{[]byte(`{"city":"A"}`), contentTypeJSONBatch, ""},
+		{[]byte(`[1,2]`), contentTypeJSON, ""},
+		{[]byte(`{}`), "text/plain", ""},
+		{[]byte(`{}`), contentTypeJSON, "br"},
+		{[]byte(`{}`), contentTypeJSON, "gzip"},
+	}
+	for _, c := range cases {
+		if _, err := decodeReadings(c.body, c.contentType, c.contentEncoding); err == nil {
+			t.Errorf("esperado erro para %q (%s, %s)", c.body, c.contentType, c.contentEncoding)
+		}
+	}
+}